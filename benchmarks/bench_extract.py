@@ -0,0 +1,84 @@
+"""Benchmark for ``core.extract.parse_html``.
+
+Run from the repository root::
+
+    python benchmarks/bench_extract.py
+
+Compares the previous pipeline (readability ``summary()`` serialised to HTML,
+then re-parsed with BeautifulSoup) with the single-parse lxml extractor on
+synthetic article pages, reporting CPU time per page and how many of the
+pages' video references each one finds.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from readability import Document  # noqa: E402
+
+from core.extract import parse_html  # noqa: E402
+
+PARAGRAPH = (
+    "<p>The techno festival returns to Tel Aviv this week with a sunrise set on the beach, "
+    "three stages and an after party that is already trending on social media.</p>"
+)
+
+
+def make_page(index: int, paragraphs: int) -> tuple[str, set[str]]:
+    og = f"https://cdn.example/og-{index}.mp4"
+    inline = f"https://cdn.example/inline-{index}.mp4"
+    html = (
+        "<html><head><title>Festival</title>"
+        f'<meta property="og:video" content="{og}">'
+        "<script>var tracking = 1;</script><style>p { color: red }</style></head><body>"
+        '<nav><a href="/">Home</a><a href="/news">News</a></nav>'
+        f"<article><h1>Festival #{index}</h1>{PARAGRAPH * paragraphs}"
+        f'<video controls><source src="{inline}" type="video/mp4"></video>'
+        f'<p>Watch the <a href="https://www.tiktok.com/@dj/video/{index}">clip</a>.</p></article>'
+        '<aside class="sidebar">' + '<a href="/related">Related story</a>' * 20 + "</aside>"
+        "</body></html>"
+    )
+    return html, {og, inline}
+
+
+def legacy_parse(html: str):
+    content_html = Document(html).summary()
+    soup = BeautifulSoup(content_html, "lxml")
+    text = soup.get_text(" ", strip=True)
+    videos = set()
+    for video in soup.select("video source, video"):
+        src = video.get("src") or video.get("data-src")
+        if src and src.lower().endswith((".mp4", ".m3u8", ".webm")):
+            videos.add(src)
+    for meta in soup.select('meta[property="og:video"]'):
+        if meta.get("content"):
+            videos.add(meta["content"])
+    links = {a["href"] for a in soup.select("a[href]") if "tiktok.com" in a["href"]}
+    return text, sorted(videos), sorted(links)
+
+
+def run(label, func, pages):
+    found = expected = 0
+    start = time.process_time()
+    for html, videos in pages:
+        _, got, _ = func(html)
+        found += len(videos & set(got))
+        expected += len(videos)
+    elapsed = time.process_time() - start
+    print(f"{label:<8} {elapsed / len(pages) * 1000:7.2f} ms CPU/page   videos {found}/{expected}")
+
+
+def main() -> None:
+    for paragraphs in (5, 40, 200):
+        pages = [make_page(index, paragraphs) for index in range(60)]
+        print(f"-- {paragraphs} paragraphs, {len(pages[0][0]) // 1024} KB/page")
+        run("legacy", legacy_parse, pages)
+        run("single", parse_html, pages)
+
+
+if __name__ == "__main__":
+    main()
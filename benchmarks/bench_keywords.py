@@ -0,0 +1,72 @@
+"""Micro-benchmark for keyword matching in ``core.rank.score_rule_based``.
+
+Run from the repository root::
+
+    python benchmarks/bench_keywords.py
+
+Compares the original one-``in``-test-per-keyword loop with both
+``KeywordMatcher`` strategies on the configured keywords and on synthetic
+keyword lists, and checks that all three agree on every input.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.matcher import KeywordMatcher  # noqa: E402
+from core.rank import load_keywords  # noqa: E402
+
+SAMPLES = {
+    "en": (
+        "Massive techno festival arrives in Tel Aviv this week with Adam Ten, "
+        "a viral after party and tickets on sale now for the headline set. "
+    )
+    * 12,
+    "he": ("הקליפ הויראלי של Adam Ten מתעד לילה מטורף ב-Club de Combat, פסטיבל טכנו בתל אביב השבוע. ") * 12,
+}
+
+
+def naive_counts(categories, text):
+    return {name: sum(1 for kw in words if kw in text) for name, words in categories.items()}
+
+
+def bench(label, categories, texts, number=2000):
+    matchers = {
+        strategy: KeywordMatcher(categories, strategy=strategy) for strategy in ("probe", "scan")
+    }
+    for text in texts.values():
+        expected = naive_counts(categories, text)
+        for matcher in matchers.values():
+            assert matcher.count(text) == expected
+    for name, text in texts.items():
+        text = text.lower()
+        row = [f"{label:<14}", f"{name:<3}", f"{len(text):>5} chars"]
+        timings = {"naive": lambda: naive_counts(categories, text)}
+        timings.update({strategy: (lambda m=m: m.count(text)) for strategy, m in matchers.items()})
+        for strategy, func in timings.items():
+            seconds = timeit.timeit(func, number=number) / number
+            row.append(f"{strategy} {seconds * 1e6:7.1f}us")
+        print("  ".join(row))
+
+
+def synthetic(count, seed=0):
+    rnd = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyz "
+    words = {"".join(rnd.choice(alphabet) for _ in range(rnd.randint(4, 12))) for _ in range(count)}
+    return {"synthetic": words}
+
+
+def main() -> None:
+    configured = load_keywords()
+    total = len(set().union(*configured.values()))
+    bench(f"configured/{total}", configured, SAMPLES)
+    for count in (100, 200, 400, 800):
+        bench(f"synthetic/{count}", synthetic(count), SAMPLES)
+
+
+if __name__ == "__main__":
+    main()
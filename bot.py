@@ -2,23 +2,40 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import logging
 import os
 import time
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Sequence
 
-import requests
 from dotenv import load_dotenv
 
-from core.extract import extract_text_and_videos
-from core.rank import final_score
-from core.utils import hash_id, load_seen, norm_text, save_seen
+from core import http_client
+from core.collect import SourceJob, merge_results, run_source_jobs
+from core.cpu_pool import CPU_MODES, CpuPool
+from core.daemon import PipelineDaemon
+from core.extract import Extraction, extract_many, from_source
+from core.feed_state import DEFAULT_FEED_STATE_PATH, FeedState
+from core.near_dup import DEFAULT_INDEX_PATH as DEFAULT_NEAR_DUP_PATH, NearDuplicateIndex
+from core.rank import final_score_batch, save_score_cache
+from core.scheduler import AdaptiveScheduler
+from core.score_cache import TEXT_PREFIX_CHARS
+from core.urls import canonical_url
+from core.selection import CandidateBatch
+from core.seen_store import SEEN_BACKENDS, SeenStore, open_seen_store
+from core.utils import hash_id, norm_text, save_seen
 from sources.google_news import fetch_search
-from sources.reddit import fetch_subreddit
+from sources.google_news_resolver import resolve_items
+from sources.reddit import BATCH_SIZE as REDDIT_BATCH_SIZE, batch_subreddits, fetch_subreddits
 from sources.rss import fetch_rss
-from sources.tiktok import fetch_hashtag
+from sources.tiktok import RequestBudget, fetch_hashtag
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime: core.relevance pulls in scikit-learn.
+    from core.relevance import RelevanceModel
 
 LOGGER = logging.getLogger("eventscout")
 
@@ -27,6 +44,14 @@ LOGGER = logging.getLogger("eventscout")
 # dry for a while.
 NO_VIDEO_STREAK = 0
 
+# "off" sends every candidate to the LLM; "min-score" skips candidates whose
+# best possible blended score is still below --min-score.
+LLM_GATE_MODES = ("off", "min-score")
+
+# "fixed" reruns the whole cycle every --interval-minutes; "adaptive" polls each
+# source on its own interval and sends a digest once enough candidates pile up.
+SCHEDULE_MODES = ("fixed", "adaptive")
+
 
 @dataclass
 class Candidate:
@@ -36,6 +61,7 @@ class Candidate:
     score: float
     videos: List[str]
     platform_links: List[str]
+    text: str = ""
 
 
 def configure_logging(verbose: bool = False) -> None:
@@ -55,90 +81,179 @@ def send_telegram(token: str, chat_id: str, text: str, *, preview: bool = True)
         "parse_mode": "HTML",
     }
     LOGGER.debug("Sending Telegram message", extra={"length": len(text)})
-    response = requests.post(url, json=payload, timeout=20)
+    response = http_client.post(url, json=payload, timeout=20)
     response.raise_for_status()
     LOGGER.info("Telegram message delivered", extra={"bytes": len(response.content)})
 
 
-def collect_candidates(qconf: Dict, *, max_per_source: int = 10) -> List[dict]:
-    items: List[dict] = []
-    seen_links: set[str] = set()
+def build_source_jobs(
+    qconf: Dict, *, max_per_source: int = 10, feed_state: FeedState | None = None
+) -> List[SourceJob]:
+    """Translate the query configuration into one fetch job per source.
 
+    ``feed_state`` makes Google News and RSS jobs yield only new entries.
+    """
+    jobs: List[SourceJob] = []
     for query in qconf.get("google_news_queries", []):
-        try:
-            results = fetch_search(query, limit=max_per_source)
-            LOGGER.debug("Google News results", extra={"query": query, "count": len(results)})
-            for result in results:
-                if result["link"] not in seen_links:
-                    items.append(result)
-                    seen_links.add(result["link"])
-        except Exception:
-            LOGGER.exception("Failed to fetch Google News", extra={"query": query})
-
+        jobs.append(
+            SourceJob("google_news", query, partial(fetch_search, query, limit=max_per_source, state=feed_state))
+        )
     for url in qconf.get("rss_feeds", []):
-        try:
-            results = fetch_rss(url, limit=max_per_source)
-            LOGGER.debug("RSS results", extra={"url": url, "count": len(results)})
-            for result in results:
-                if result["link"] not in seen_links:
-                    items.append(result)
-                    seen_links.add(result["link"])
-        except Exception:
-            LOGGER.exception("Failed to fetch RSS feed", extra={"url": url})
-
-    for subreddit in qconf.get("subreddits", []):
-        try:
-            results = fetch_subreddit(subreddit, limit=8, t="day")
-            LOGGER.debug("Reddit results", extra={"subreddit": subreddit, "count": len(results)})
-            for result in results:
-                if result["link"] not in seen_links:
-                    items.append(result)
-                    seen_links.add(result["link"])
-        except Exception:
-            LOGGER.exception("Failed to fetch subreddit", extra={"subreddit": subreddit})
-
+        jobs.append(SourceJob("rss", url, partial(fetch_rss, url, limit=max_per_source, state=feed_state)))
+    # Subreddits are fetched through combined r/a+b+c listings, one job per batch.
+    for group in batch_subreddits(
+        qconf.get("subreddits", []), qconf.get("reddit_batch_size", REDDIT_BATCH_SIZE)
+    ):
+        jobs.append(
+            SourceJob("reddit", "+".join(group), partial(fetch_subreddits, group, t="day", per_subreddit=8))
+        )
+    # All hashtag searches draw pages from one TikWM allowance.
+    tiktok_budget = RequestBudget(qconf.get("tiktok_request_budget", 12))
     for hashtag in qconf.get("tiktok_hashtags", []):
-        try:
-            results = fetch_hashtag(hashtag, limit=max_per_source, days=7)
-            LOGGER.debug(
-                "TikTok results",
-                extra={"hashtag": hashtag, "count": len(results)},
+        jobs.append(
+            SourceJob(
+                "tiktok",
+                hashtag,
+                partial(fetch_hashtag, hashtag, limit=max_per_source, days=7, budget=tiktok_budget),
             )
-            for result in results:
-                if result["link"] not in seen_links:
-                    items.append(result)
-                    seen_links.add(result["link"])
-        except Exception:
-            LOGGER.exception("Failed to fetch TikTok hashtag", extra={"hashtag": hashtag})
-
-    LOGGER.info("Collected %s unique raw candidates", len(items))
+        )
+    return jobs
+
+
+def collect_candidates(
+    qconf: Dict, *, max_per_source: int = 10, feed_state: FeedState | None = None
+) -> List[dict]:
+    jobs = build_source_jobs(qconf, max_per_source=max_per_source, feed_state=feed_state)
+    results = run_source_jobs(jobs, concurrency=qconf.get("source_concurrency"))
+    items = resolve_items(merge_results(results))
+    failed = sum(1 for result in results if result.error is not None)
+    LOGGER.info(
+        "Collected %s unique raw candidates",
+        len(items),
+        extra={"sources": len(jobs), "failed_sources": failed},
+    )
     return items
 
 
+def prefilter_candidates(
+    raw_items: Sequence[dict],
+    seen_ids: SeenStore | set[str],
+    near_dups: NearDuplicateIndex | None = None,
+) -> List[dict]:
+    """Drop seen and duplicate links by canonical URL before any HTML fetch.
+
+    Each kept item gets ``canonical_link`` and ``uid`` keys; the uid is derived
+    from the canonical link. Legacy ids hashed from the raw link (or the Google
+    News ``source_link`` it was resolved from) still count as seen so existing
+    ``seen.json`` files keep working. With ``near_dups``, the same story found
+    under different URLs is then collapsed to one representative.
+    """
+
+    kept: List[dict] = []
+    cycle_links: set[str] = set()
+    dropped_seen = 0
+    dropped_duplicates = 0
+    for item in raw_items:
+        canonical = canonical_url(item["link"])
+        uid = hash_id(canonical)
+        legacy_links = (item["link"], item.get("source_link"))
+        if uid in seen_ids or any(link and hash_id(link) in seen_ids for link in legacy_links):
+            dropped_seen += 1
+            continue
+        if canonical in cycle_links:
+            dropped_duplicates += 1
+            continue
+        cycle_links.add(canonical)
+        kept.append({**item, "canonical_link": canonical, "uid": uid})
+
+    LOGGER.info(
+        "Pre-filter saved %s fetches",
+        dropped_seen + dropped_duplicates,
+        extra={"seen": dropped_seen, "duplicates": dropped_duplicates, "kept": len(kept)},
+    )
+    if near_dups is not None:
+        kept = near_dups.collapse(kept)
+    return kept
+
+
 def enrich_candidates(
     raw_items: Sequence[dict],
-    seen_ids: set[str],
+    seen_ids: SeenStore | set[str],
     *,
     use_llm: bool,
     ollama_endpoint: str,
     ollama_model: str,
+    fetch_workers: int = 8,
+    parse_workers: int = 2,
+    llm_concurrency: int = 4,
+    llm_deadline: float = 120.0,
+    llm_gate_threshold: float | None = None,
+    cpu_pool: CpuPool | None = None,
+    relevance_model: RelevanceModel | None = None,
+    model_gate: float | None = None,
 ) -> List[Candidate]:
-    enriched: List[Candidate] = []
+    pending: List[tuple[str, dict]] = []
     for item in raw_items:
-        uid = hash_id(item["link"])
+        uid = item.get("uid") or hash_id(item["link"])
         if uid in seen_ids:
             LOGGER.debug("Skipping already seen candidate", extra={"link": item["link"]})
             continue
-        title = norm_text(item.get("title", ""))
-        try:
-            text, direct_videos, platform_links = extract_text_and_videos(item["link"])
-        except Exception:
-            LOGGER.exception("Failed to extract content", extra={"link": item["link"]})
-            text, direct_videos, platform_links = "", [], []
-        score = round(
-            final_score(title, text, use_llm, ollama_endpoint, ollama_model),
-            2,
+        pending.append((uid, item))
+
+    titles = [norm_text(item.get("title", "")) for _, item in pending]
+    extractions: List[Extraction] = []
+    fetch_indexes: List[int] = []
+    for index, (_, item) in enumerate(pending):
+        supplied = from_source(item)
+        if supplied is None:
+            fetch_indexes.append(index)
+            supplied = ("", [], [])
+        extractions.append(supplied)
+    if len(fetch_indexes) < len(pending):
+        LOGGER.info("Source metadata saved %s fetches", len(pending) - len(fetch_indexes))
+
+    links = [pending[index][1]["link"] for index in fetch_indexes]
+    rule_scores: List[float | None] = [None] * len(pending)
+    if cpu_pool is not None:
+        records = cpu_pool.extract_and_score(
+            links, [titles[index] for index in fetch_indexes], fetch_workers=fetch_workers
+        )
+        fetched = [(record.text, record.videos, record.platform_links) for record in records]
+        for index, record in zip(fetch_indexes, records):
+            rule_scores[index] = record.rule_score
+    else:
+        fetched = extract_many(links, fetch_workers=fetch_workers, parse_workers=parse_workers)
+    for index, (text, videos, platform_links) in zip(fetch_indexes, fetched):
+        item = pending[index][1]
+        # Keep whatever partial media the source did supply alongside the page's.
+        extractions[index] = (
+            text,
+            sorted(set(videos) | set(item.get("videos") or [])),
+            sorted(set(platform_links) | set(item.get("platform_links") or [])),
         )
+
+    pairs = [(title, text) for title, (text, _, _) in zip(titles, extractions)]
+    model_scores = relevance_model.score_batch(pairs).tolist() if relevance_model is not None and pairs else None
+    scores = final_score_batch(
+        pairs,
+        use_llm,
+        ollama_endpoint,
+        ollama_model,
+        concurrency=llm_concurrency,
+        deadline=llm_deadline,
+        gate_threshold=llm_gate_threshold,
+        # Video candidates can still be promoted below --min-score, so always judge them.
+        always_judge=[bool(videos) for _, videos, _ in extractions],
+        rule_scores=rule_scores,
+        model_scores=model_scores,
+        model_gate=model_gate,
+    )
+
+    enriched: List[Candidate] = []
+    for (uid, item), title, raw_score, (text, direct_videos, platform_links) in zip(
+        pending, titles, scores, extractions
+    ):
+        score = round(raw_score, 2)
         LOGGER.debug(
             "Candidate scored",
             extra={"link": item["link"], "score": score, "title": title[:80]},
@@ -151,38 +266,12 @@ def enrich_candidates(
                 score=score,
                 videos=direct_videos,
                 platform_links=platform_links,
+                text=text[:TEXT_PREFIX_CHARS],
             )
         )
     return enriched
 
 
-def _filter_candidates(
-    candidates: Iterable[Candidate], *, min_score: float
-) -> List[Candidate]:
-    filtered = [c for c in candidates if c.score >= min_score]
-    filtered.sort(key=lambda c: c.score, reverse=True)
-    return filtered
-
-
-def _inject_lower_ranked_video(
-    ranked: List[Candidate],
-    *,
-    limit: int,
-) -> tuple[List[Candidate], bool]:
-    if not ranked:
-        return ranked, False
-    for candidate in ranked[limit:]:
-        if candidate.videos:
-            updated = ranked[:limit]
-            if updated:
-                updated = updated[:-1] + [candidate]
-            else:
-                updated = [candidate]
-            updated.sort(key=lambda c: c.score, reverse=True)
-            return updated[:limit], True
-    return ranked[:limit], False
-
-
 def select_top_candidates(
     candidates: Iterable[Candidate],
     *,
@@ -191,25 +280,23 @@ def select_top_candidates(
 ) -> List[Candidate]:
     global NO_VIDEO_STREAK
 
-    ranked = _filter_candidates(candidates, min_score=min_score)
+    batch = CandidateBatch(list(candidates))
     LOGGER.info(
         "Filtered candidates by score",
-        extra={"kept": len(ranked), "min_score": min_score},
+        extra={"kept": batch.count_at(min_score), "min_score": min_score},
     )
 
-    selected = ranked[:limit]
-    if any(c.videos for c in selected):
-        NO_VIDEO_STREAK = 0
-        return selected
-
-    injected, found_video = _inject_lower_ranked_video(ranked, limit=limit)
-    if found_video:
-        LOGGER.info(
-            "Promoted lower-ranked item to satisfy video requirement",
-            extra={"min_score": min_score},
-        )
+    selected = batch.top(min_score, limit)
+    with_video = batch.top_with_video(min_score, limit)
+    if with_video is not None:
+        chosen, promoted = with_video
+        if promoted:
+            LOGGER.info(
+                "Promoted lower-ranked item to satisfy video requirement",
+                extra={"min_score": min_score},
+            )
         NO_VIDEO_STREAK = 0
-        return injected
+        return chosen
 
     # No video even after checking beyond the limit. Start lowering the threshold.
     NO_VIDEO_STREAK += 1
@@ -236,32 +323,20 @@ def select_top_candidates(
             break
 
     for lowered_score in thresholds_to_try:
-        lowered_ranked = _filter_candidates(candidates, min_score=lowered_score)
-        if not lowered_ranked:
+        if not batch.count_at(lowered_score):
             continue
 
-        lowered_selected = lowered_ranked[:limit]
+        lowered_selected = batch.top(lowered_score, limit)
         if len(lowered_selected) > len(best_selection):
             best_selection = lowered_selected
 
-        if any(c.videos for c in lowered_selected):
-            LOGGER.info(
-                "Lowered min score to include a video",
-                extra={
-                    "from": min_score,
-                    "to": lowered_score,
-                    "streak": NO_VIDEO_STREAK,
-                },
-            )
-            NO_VIDEO_STREAK = 0
-            return lowered_selected
-
-        injected, found_video = _inject_lower_ranked_video(
-            lowered_ranked, limit=limit
-        )
-        if found_video:
+        with_video = batch.top_with_video(lowered_score, limit)
+        if with_video is not None:
+            chosen, promoted = with_video
             LOGGER.info(
-                "Lowered min score and promoted a video candidate",
+                "Lowered min score and promoted a video candidate"
+                if promoted
+                else "Lowered min score to include a video",
                 extra={
                     "from": min_score,
                     "to": lowered_score,
@@ -269,7 +344,7 @@ def select_top_candidates(
                 },
             )
             NO_VIDEO_STREAK = 0
-            return injected
+            return chosen
 
     LOGGER.warning(
         "Unable to locate any video candidates even after lowering threshold",
@@ -300,34 +375,169 @@ def run_cycle(
     token: str,
     chat_id: str,
     qconf: Dict,
-    seen_ids: set[str],
+    seen_ids: SeenStore | set[str],
     max_per_source: int,
     limit: int,
     min_score: float,
     use_llm: bool,
     ollama_endpoint: str,
     ollama_model: str,
+    fetch_workers: int = 8,
+    parse_workers: int = 2,
+    llm_concurrency: int = 4,
+    llm_deadline: float = 120.0,
+    llm_gate: str = "off",
+    cpu_pool: CpuPool | None = None,
+    feed_state: FeedState | None = None,
+    near_dups: NearDuplicateIndex | None = None,
+    relevance_model: RelevanceModel | None = None,
+    model_gate: float | None = None,
+    history_path: str | None = None,
 ) -> None:
     LOGGER.info("Starting collection cycle")
-    raw_items = collect_candidates(qconf, max_per_source=max_per_source)
+    raw_items = collect_candidates(qconf, max_per_source=max_per_source, feed_state=feed_state)
+    raw_items = prefilter_candidates(raw_items, seen_ids, near_dups)
     candidates = enrich_candidates(
         raw_items,
         seen_ids,
         use_llm=use_llm,
         ollama_endpoint=ollama_endpoint,
         ollama_model=ollama_model,
+        fetch_workers=fetch_workers,
+        parse_workers=parse_workers,
+        llm_concurrency=llm_concurrency,
+        llm_deadline=llm_deadline,
+        llm_gate_threshold=min_score if llm_gate == "min-score" else None,
+        cpu_pool=cpu_pool,
+        relevance_model=relevance_model,
+        model_gate=model_gate,
     )
+    if use_llm:
+        save_score_cache()
+    deliver_digest(
+        candidates,
+        token=token,
+        chat_id=chat_id,
+        seen_ids=seen_ids,
+        limit=limit,
+        min_score=min_score,
+        feed_state=feed_state,
+        near_dups=near_dups,
+        history_path=history_path,
+    )
+
+
+def deliver_digest(
+    candidates: Sequence[Candidate],
+    *,
+    token: str,
+    chat_id: str,
+    seen_ids: SeenStore | set[str],
+    limit: int,
+    min_score: float,
+    feed_state: FeedState | None = None,
+    near_dups: NearDuplicateIndex | None = None,
+    history_path: str | None = None,
+) -> List[Candidate]:
+    """Select, persist and send the digest for ``candidates``; return what was sent.
+
+    With ``history_path``, every candidate is appended there labelled sent or
+    skipped, which is what :mod:`core.relevance` trains on.
+    """
     top_candidates = select_top_candidates(candidates, limit=limit, min_score=min_score)
     for candidate in top_candidates:
         seen_ids.add(candidate.uid)
-    save_seen(seen_ids)
+    if isinstance(seen_ids, SeenStore):
+        seen_ids.flush()
+    else:
+        save_seen(seen_ids)
+    if feed_state is not None:
+        feed_state.save()
+    if near_dups is not None:
+        near_dups.record_sent(candidate.uid for candidate in top_candidates)
+        near_dups.save()
+    if history_path:
+        from core.relevance import record_history
+
+        record_history(history_path, candidates, (candidate.uid for candidate in top_candidates))
+    http_client.log_metrics()
 
     if not top_candidates:
         LOGGER.info("No candidates exceeded threshold", extra={"min_score": min_score})
-        return
+        return top_candidates
 
     message = format_digest(top_candidates)
     send_telegram(token, chat_id, message, preview=True)
+    return top_candidates
+
+
+def run_scheduled(
+    scheduler: AdaptiveScheduler,
+    *,
+    enrich: Callable[[List[dict]], List[Candidate]],
+    token: str,
+    chat_id: str,
+    qconf: Dict,
+    seen_ids: SeenStore | set[str],
+    limit: int,
+    min_score: float,
+    feed_state: FeedState | None = None,
+    near_dups: NearDuplicateIndex | None = None,
+    history_path: str | None = None,
+    max_digests: int = 0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """Poll sources as they fall due and send a digest when the scheduler says so.
+
+    ``enrich`` turns prefiltered raw items into scored candidates (normally a
+    partial of :func:`enrich_candidates`). Candidates wait in memory until the
+    next digest; ids and feed state are only persisted when a digest goes out.
+    """
+
+    pending: Dict[str, Candidate] = {}
+    digests = 0
+    while True:
+        jobs = scheduler.due()
+        if jobs:
+            results = run_source_jobs(jobs, concurrency=qconf.get("source_concurrency"))
+            new_links = sum(scheduler.record(result) for result in results)
+            raw_items = [
+                item
+                for item in prefilter_candidates(resolve_items(merge_results(results)), seen_ids, near_dups)
+                if item["uid"] not in pending
+            ]
+            for candidate in enrich(raw_items):
+                pending[candidate.uid] = candidate
+            LOGGER.info(
+                "Polled %s sources",
+                len(jobs),
+                extra={"new_links": new_links, "pending": len(pending)},
+            )
+
+        ready = sum(1 for candidate in pending.values() if candidate.score >= min_score)
+        if scheduler.digest_due(ready, pending=len(pending)):
+            deliver_digest(
+                list(pending.values()),
+                token=token,
+                chat_id=chat_id,
+                seen_ids=seen_ids,
+                limit=limit,
+                min_score=min_score,
+                feed_state=feed_state,
+                near_dups=near_dups,
+                history_path=history_path,
+            )
+            pending.clear()
+            scheduler.digest_sent()
+            digests += 1
+            if max_digests and digests >= max_digests:
+                LOGGER.info("Reached max cycles", extra={"max_cycles": max_digests})
+                return
+
+        wakeup = scheduler.next_wakeup()
+        if pending:
+            wakeup = min(wakeup, scheduler.last_digest + scheduler.max_digest_interval)
+        sleep(max(1.0, wakeup - scheduler.clock()))
 
 
 def load_config(path: str = "queries.json") -> Dict:
@@ -340,20 +550,112 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--limit", type=int, default=6, help="Maximum number of events to send per cycle")
     parser.add_argument("--max-per-source", type=int, default=8, help="Maximum raw items per source")
     parser.add_argument("--min-score", type=float, default=4.0, help="Minimum score required to send an event")
+    parser.add_argument("--fetch-workers", type=int, default=8, help="Concurrent article downloads during enrichment")
+    parser.add_argument("--parse-workers", type=int, default=2, help="Concurrent article parsers during enrichment")
+    parser.add_argument(
+        "--cpu-mode",
+        choices=CPU_MODES,
+        default="thread",
+        help="Run page parsing and rule scoring on threads or on a pre-warmed process pool",
+    )
+    parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        default=0,
+        help="Worker processes for --cpu-mode process (default: one per core)",
+    )
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="Concurrent LLM judge requests per batch")
+    parser.add_argument(
+        "--llm-deadline",
+        type=float,
+        default=120.0,
+        help="Seconds to wait for a batch of LLM scores before falling back to rule-based scores",
+    )
+    parser.add_argument(
+        "--llm-gate",
+        choices=LLM_GATE_MODES,
+        default="off",
+        help="Skip LLM calls for candidates that cannot reach --min-score even with a perfect LLM score",
+    )
     parser.add_argument(
         "--interval-minutes",
         type=int,
         default=0,
         help="If > 0, run continuously with this interval between cycles",
     )
+    parser.add_argument(
+        "--schedule",
+        choices=SCHEDULE_MODES,
+        default="fixed",
+        help="adaptive: poll each source on its own interval (starting at --interval-minutes, default 15)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run as a long-lived asyncio pipeline; collection rounds start every --interval-minutes (default 15)",
+    )
+    parser.add_argument(
+        "--digest-threshold",
+        type=int,
+        default=0,
+        help="adaptive schedule: send a digest once this many candidates reach --min-score (default --limit)",
+    )
     parser.add_argument(
         "--max-cycles",
         type=int,
         default=0,
         help="For testing: maximum number of cycles to run when interval is set",
     )
+    parser.add_argument(
+        "--seen-backend",
+        choices=SEEN_BACKENDS,
+        default="json",
+        help="Where sent ids are stored; sqlite imports an existing seen.json on first run",
+    )
+    parser.add_argument("--seen-path", default=None, help="Path of the seen store (default seen.json / seen.db)")
+    parser.add_argument(
+        "--seen-ttl-days",
+        type=float,
+        default=0,
+        help="Forget sent ids after this many days (sqlite backend only, 0 keeps them forever)",
+    )
+    parser.add_argument(
+        "--incremental-feeds",
+        action="store_true",
+        help="Only hand new Google News / RSS entries downstream, tracked per feed in --feed-state-path",
+    )
+    parser.add_argument("--feed-state-path", default=DEFAULT_FEED_STATE_PATH, help="Where per-feed polling state is kept")
+    parser.add_argument(
+        "--no-near-dups",
+        action="store_true",
+        help="Do not collapse the same story found under different URLs",
+    )
+    parser.add_argument(
+        "--near-dups-path",
+        default=DEFAULT_NEAR_DUP_PATH,
+        help="Where signatures of sent stories are kept between cycles",
+    )
+    parser.add_argument(
+        "--relevance-model",
+        default=None,
+        help="Model trained with 'python -m core.relevance' to score candidates between the rules and the LLM",
+    )
+    parser.add_argument(
+        "--model-gate",
+        type=float,
+        default=None,
+        help="Skip the LLM for candidates the relevance model scores below this (0-10)",
+    )
+    parser.add_argument(
+        "--history-path",
+        default=None,
+        help="Append every scored candidate here, labelled sent or skipped, as training data for core.relevance",
+    )
     parser.add_argument("--verbose", action="store_true", help="Enable debug logging")
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.daemon and args.schedule != "fixed":
+        parser.error("--daemon runs collection rounds on --interval-minutes; it cannot be combined with --schedule adaptive")
+    return args
 
 
 def main() -> None:
@@ -370,13 +672,21 @@ def main() -> None:
         raise SystemExit("Missing TELEGRAM_BOT_TOKEN / TELEGRAM_CHAT_ID")
 
     qconf = load_config()
-    seen_ids = load_seen()
+    seen_ids = open_seen_store(args.seen_backend, args.seen_path, ttl_days=args.seen_ttl_days)
     LOGGER.info("Loaded %s seen ids", len(seen_ids))
 
     use_llm = bool(ollama_model and ollama_endpoint)
     LOGGER.info("LLM scoring enabled: %s", use_llm)
+    cpu_pool = CpuPool(args.cpu_workers or None) if args.cpu_mode == "process" else None
+    feed_state = FeedState(args.feed_state_path) if args.incremental_feeds else None
+    near_dups = None if args.no_near_dups else NearDuplicateIndex(args.near_dups_path)
+    relevance_model = None
+    if args.relevance_model:
+        from core.relevance import RelevanceModel
+
+        relevance_model = RelevanceModel.load(args.relevance_model)
 
-    run_cycle(
+    cycle_kwargs = dict(
         token=token,
         chat_id=chat_id,
         qconf=qconf,
@@ -387,32 +697,111 @@ def main() -> None:
         use_llm=use_llm,
         ollama_endpoint=ollama_endpoint,
         ollama_model=ollama_model,
+        fetch_workers=args.fetch_workers,
+        parse_workers=args.parse_workers,
+        llm_concurrency=args.llm_concurrency,
+        llm_deadline=args.llm_deadline,
+        llm_gate=args.llm_gate,
+        cpu_pool=cpu_pool,
+        feed_state=feed_state,
+        near_dups=near_dups,
+        relevance_model=relevance_model,
+        model_gate=args.model_gate,
+        history_path=args.history_path,
     )
 
-    if args.interval_minutes > 0:
-        cycles_run = 1
-        while True:
-            if args.max_cycles and cycles_run >= args.max_cycles:
-                LOGGER.info("Reached max cycles", extra={"max_cycles": args.max_cycles})
-                break
-            LOGGER.info(
-                "Sleeping before next cycle",
-                extra={"minutes": args.interval_minutes},
+    def enrich(raw_items: List[dict]) -> List[Candidate]:
+        candidates = enrich_candidates(
+            raw_items,
+            seen_ids,
+            use_llm=use_llm,
+            ollama_endpoint=ollama_endpoint,
+            ollama_model=ollama_model,
+            fetch_workers=args.fetch_workers,
+            parse_workers=args.parse_workers,
+            llm_concurrency=args.llm_concurrency,
+            llm_deadline=args.llm_deadline,
+            llm_gate_threshold=args.min_score if args.llm_gate == "min-score" else None,
+            cpu_pool=cpu_pool,
+            relevance_model=relevance_model,
+            model_gate=args.model_gate,
+        )
+        if use_llm:
+            save_score_cache()
+        return candidates
+
+    try:
+        if args.daemon:
+            daemon = PipelineDaemon(
+                collect=lambda: prefilter_candidates(
+                    collect_candidates(qconf, max_per_source=args.max_per_source, feed_state=feed_state),
+                    seen_ids,
+                    near_dups,
+                ),
+                enrich=enrich,
+                deliver=partial(
+                    deliver_digest,
+                    token=token,
+                    chat_id=chat_id,
+                    seen_ids=seen_ids,
+                    limit=args.limit,
+                    min_score=args.min_score,
+                    near_dups=near_dups,
+                    history_path=args.history_path,
+                ),
+                interval=(args.interval_minutes or 15) * 60,
+                max_rounds=args.max_cycles,
+                # Feed marks are saved per round, once that round is delivered.
+                checkpoint=feed_state.checkpoint if feed_state is not None else None,
+                commit=feed_state.commit if feed_state is not None else None,
+                rollback=feed_state.rollback if feed_state is not None else None,
+            )
+            asyncio.run(daemon.run())
+            return
+
+        if args.schedule == "adaptive":
+            base_interval = (args.interval_minutes or 15) * 60
+            scheduler = AdaptiveScheduler(
+                build_source_jobs(qconf, max_per_source=args.max_per_source, feed_state=feed_state),
+                base_interval=base_interval,
+                min_interval=min(base_interval, 5 * 60),
+                digest_threshold=args.digest_threshold or args.limit,
             )
-            time.sleep(args.interval_minutes * 60)
-            run_cycle(
+            run_scheduled(
+                scheduler,
+                enrich=enrich,
                 token=token,
                 chat_id=chat_id,
                 qconf=qconf,
                 seen_ids=seen_ids,
-                max_per_source=args.max_per_source,
                 limit=args.limit,
                 min_score=args.min_score,
-                use_llm=use_llm,
-                ollama_endpoint=ollama_endpoint,
-                ollama_model=ollama_model,
+                feed_state=feed_state,
+                near_dups=near_dups,
+                history_path=args.history_path,
+                max_digests=args.max_cycles,
             )
-            cycles_run += 1
+            return
+
+        run_cycle(**cycle_kwargs)
+
+        if args.interval_minutes > 0:
+            cycles_run = 1
+            while True:
+                if args.max_cycles and cycles_run >= args.max_cycles:
+                    LOGGER.info("Reached max cycles", extra={"max_cycles": args.max_cycles})
+                    break
+                LOGGER.info(
+                    "Sleeping before next cycle",
+                    extra={"minutes": args.interval_minutes},
+                )
+                time.sleep(args.interval_minutes * 60)
+                run_cycle(**cycle_kwargs)
+                cycles_run += 1
+    finally:
+        if cpu_pool is not None:
+            cpu_pool.close()
+        seen_ids.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+"""Optional process pool for the CPU-bound extract-and-score stage."""
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from typing import List, NamedTuple, Sequence
+
+from core.extract import HtmlFetch, fetch_many, parse_fetched, parse_html
+from core.rank import load_keyword_matcher, score_rule_based
+from core.score_cache import TEXT_PREFIX_CHARS
+
+LOGGER = logging.getLogger(__name__)
+
+CPU_MODES = ("thread", "process")
+_WARMUP_HTML = "<html><head><title>warmup</title></head><body><p>warmup</p></body></html>"
+
+
+class PageRecord(NamedTuple):
+    """What a worker sends back for one page.
+
+    ``text`` is cut to the prefix the LLM judges and the score cache look at;
+    the rule-based score is computed in the worker over the full text.
+    """
+
+    text: str
+    videos: List[str]
+    platform_links: List[str]
+    rule_score: float
+
+
+def _init_worker() -> None:
+    # Load the keyword config and exercise the parser once so the first real
+    # page does not pay for imports, regex compilation and trie construction.
+    load_keyword_matcher()
+    parse_html(_WARMUP_HTML)
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def process_page(fetched: HtmlFetch, title: str) -> PageRecord:
+    text, videos, platform_links = parse_fetched(fetched)
+    return PageRecord(text[:TEXT_PREFIX_CHARS], videos, platform_links, score_rule_based(title, text))
+
+
+class CpuPool:
+    """Pre-warmed process pool that parses and rule-scores downloaded pages.
+
+    Downloads stay on threads in the parent; each finished page is shipped to a
+    worker process, so readability, text normalisation and keyword matching run
+    in parallel across cores instead of contending for the GIL.
+    """
+
+    def __init__(self, workers: int | None = None) -> None:
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self._warm()
+
+    def _warm(self) -> None:
+        futures = [self._executor.submit(_ready) for _ in range(self.workers)]
+        wait(futures)
+        pids = {future.result() for future in futures}
+        LOGGER.info("CPU pool ready", extra={"workers": self.workers, "processes": len(pids)})
+
+    def extract_and_score(
+        self,
+        urls: Sequence[str],
+        titles: Sequence[str],
+        *,
+        fetch_workers: int = 8,
+    ) -> List[PageRecord]:
+        """Fetch ``urls`` and return one record per URL, in input order.
+
+        Pages that fail to download or parse get an empty record scored on the
+        title alone, matching the thread-mode behaviour.
+        """
+
+        records: List[PageRecord | None] = [None] * len(urls)
+        parses = {
+            self._executor.submit(process_page, fetched, titles[index]): index
+            for index, fetched in fetch_many(urls, fetch_workers=fetch_workers)
+        }
+        for future in as_completed(parses):
+            index = parses[future]
+            try:
+                records[index] = future.result()
+            except Exception:
+                LOGGER.exception("Failed to extract content", extra={"link": urls[index]})
+        return [
+            record if record is not None else PageRecord("", [], [], score_rule_based(title, ""))
+            for record, title in zip(records, titles)
+        ]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "CpuPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = ["CPU_MODES", "CpuPool", "PageRecord", "process_page"]
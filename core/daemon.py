@@ -0,0 +1,168 @@
+"""Long-running asyncio pipeline: collect -> enrich -> deliver."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+from typing import Any, Callable, List, Sequence
+
+LOGGER = logging.getLogger(__name__)
+
+# Marks the end of the stream on a stage queue.
+_DONE = object()
+
+
+class PipelineDaemon:
+    """Run collection, enrichment and delivery as overlapping stages.
+
+    Each stage is a blocking callable executed on a worker thread; stages are
+    connected by bounded queues, so collection of the next round can run while
+    the previous round is still being enriched or sent, and a slow stage
+    applies back-pressure instead of letting batches pile up. Items carrying a
+    ``uid`` that is still travelling through the pipeline are dropped from new
+    rounds, so overlapping rounds never send the same link twice.
+
+    :meth:`stop` (wired to SIGINT/SIGTERM by :meth:`run`) stops collection and
+    lets every batch already in the pipeline finish, so seen ids and other
+    state are persisted by the delivery stage as usual.
+
+    ``checkpoint`` runs on the collector thread right after each round is
+    collected; its result travels with the round and is passed to ``commit``
+    once that round has been delivered, or to ``rollback`` if collection,
+    enrichment or delivery of that round fails. Use it for state the collector
+    advances (e.g. feed marks) that must not be persisted ahead of delivery.
+    """
+
+    def __init__(
+        self,
+        *,
+        collect: Callable[[], List[dict]],
+        enrich: Callable[[List[dict]], Sequence[Any]],
+        deliver: Callable[[Sequence[Any]], Any],
+        interval: float,
+        queue_size: int = 2,
+        max_rounds: int = 0,
+        checkpoint: Callable[[], Any] | None = None,
+        commit: Callable[[Any], Any] | None = None,
+        rollback: Callable[[Any], Any] | None = None,
+    ) -> None:
+        self.collect = collect
+        self.enrich = enrich
+        self.deliver = deliver
+        self.interval = interval
+        self.queue_size = max(1, queue_size)
+        self.max_rounds = max_rounds
+        self.checkpoint = checkpoint
+        self.commit = commit
+        self.rollback = rollback
+        self.rounds = 0
+        self.delivered = 0
+        self._in_flight: set[str] = set()
+        self._stop: asyncio.Event | None = None
+
+    def stop(self) -> None:
+        if self._stop is not None and not self._stop.is_set():
+            LOGGER.info("Shutdown requested, draining pipeline")
+            self._stop.set()
+
+    def _collect_round(self) -> tuple[List[dict], Any]:
+        try:
+            items = self.collect()
+        except Exception:
+            self._rollback(self.checkpoint() if self.checkpoint is not None else None)
+            raise
+        return items, self.checkpoint() if self.checkpoint is not None else None
+
+    def _rollback(self, token: Any) -> None:
+        if self.rollback is None or token is None:
+            return
+        try:
+            self.rollback(token)
+        except Exception:
+            LOGGER.exception("Rolling back round state failed")
+
+    async def _collector(self, out: asyncio.Queue) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    items, token = await asyncio.to_thread(self._collect_round)
+                except Exception:
+                    LOGGER.exception("Collection round failed")
+                    items, token = [], None
+                items = [item for item in items if item.get("uid") not in self._in_flight]
+                self._in_flight.update(item["uid"] for item in items if item.get("uid"))
+                self.rounds += 1
+                await out.put((items, token))
+                if self.max_rounds and self.rounds >= self.max_rounds:
+                    break
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=self.interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await out.put(_DONE)
+
+    async def _enricher(self, inbox: asyncio.Queue, out: asyncio.Queue) -> None:
+        try:
+            while True:
+                batch = await inbox.get()
+                if batch is _DONE:
+                    break
+                items, token = batch
+                try:
+                    candidates = await asyncio.to_thread(self.enrich, items)
+                except Exception:
+                    LOGGER.exception("Enrichment failed", extra={"items": len(items)})
+                    await asyncio.to_thread(self._rollback, token)
+                    candidates, token = [], None
+                await out.put((items, candidates, token))
+        finally:
+            await out.put(_DONE)
+
+    async def _deliverer(self, inbox: asyncio.Queue) -> None:
+        while True:
+            batch = await inbox.get()
+            if batch is _DONE:
+                break
+            items, candidates, token = batch
+            try:
+                await asyncio.to_thread(self.deliver, candidates)
+            except Exception:
+                LOGGER.exception("Delivery failed", extra={"candidates": len(candidates)})
+                await asyncio.to_thread(self._rollback, token)
+            else:
+                self.delivered += 1
+                if self.commit is not None and token is not None:
+                    try:
+                        await asyncio.to_thread(self.commit, token)
+                    except Exception:
+                        LOGGER.exception("Committing round state failed")
+            finally:
+                self._in_flight.difference_update(item.get("uid") for item in items)
+
+    async def run(self) -> None:
+        self._stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        handled = []
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+                handled.append(signum)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+        raw: asyncio.Queue = asyncio.Queue(self.queue_size)
+        scored: asyncio.Queue = asyncio.Queue(self.queue_size)
+        LOGGER.info("Daemon started", extra={"interval": self.interval, "queue_size": self.queue_size})
+        try:
+            await asyncio.gather(
+                self._collector(raw),
+                self._enricher(raw, scored),
+                self._deliverer(scored),
+            )
+        finally:
+            for signum in handled:
+                loop.remove_signal_handler(signum)
+        LOGGER.info("Daemon stopped", extra={"rounds": self.rounds, "delivered": self.delivered})
+
+
+__all__ = ["PipelineDaemon"]
@@ -1,52 +1,303 @@
 """HTML extraction helpers for EventScout."""
 from __future__ import annotations
 
+import codecs
+import copy
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Iterator, List, Mapping, Sequence, Tuple
 
-import requests
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml.html.clean import Cleaner
 from readability import Document
 
+from core import http_client
+from core.http_cache import get_cache
+
 HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; EventScout/1.0)"}
 LOGGER = logging.getLogger(__name__)
 
+Extraction = Tuple[str, List[str], List[str]]
 
-def fetch_html(url: str, timeout: int = 15) -> str:
-    LOGGER.debug("Fetching HTML", extra={"url": url, "timeout": timeout})
-    response = requests.get(url, headers=HEADERS, timeout=timeout)
+# Source-supplied text at least this long is enough to score without a fetch.
+SOURCE_TEXT_MIN_CHARS = 280
+
+# Pages larger than this are cut off; article text lives near the top anyway.
+MAX_HTML_BYTES = 2 * 1024 * 1024
+CHUNK_SIZE = 16 * 1024
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml"}
+OG_VIDEO_PROPERTIES = {"og:video", "og:video:url", "og:video:secure_url"}
+VIDEO_EXTENSIONS = (".mp4", ".m3u8", ".webm")
+PLATFORM_HOSTS = ("tiktok.com", "instagram.com", "facebook.com/reel", "fb.watch", "v.redd.it")
+
+_UTF8_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+# Same settings readability applies before scoring, run once on our own tree.
+_CLEANER = Cleaner(
+    scripts=True,
+    javascript=True,
+    comments=True,
+    style=True,
+    links=True,
+    meta=False,
+    add_nofollow=False,
+    page_structure=False,
+    processing_instructions=True,
+    embedded=False,
+    frames=False,
+    forms=False,
+    annoying_tags=False,
+    remove_tags=None,
+    remove_unknown_tags=False,
+    safe_attrs_only=False,
+)
+
+_HEAD_END_RE = re.compile(rb"</head\s*>|<body[\s>]", re.I)
+# Bytes of the previous chunks searched again with each new chunk, so a
+# ``</head>`` split across chunks is still found without rescanning the body.
+_HEAD_END_OVERLAP = 32
+_META_TAG_RE = re.compile(rb"<meta\b[^>]*>", re.I)
+_ATTR_RE = re.compile(rb"""([a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([-a-zA-Z0-9_]+)""", re.I)
+
+
+class UnsupportedContentError(ValueError):
+    """Raised when a URL does not serve HTML according to its headers."""
+
+
+@dataclass
+class HtmlFetch:
+    """Result of a streamed page download."""
+
+    url: str
+    html: str
+    head_videos: List[str] = field(default_factory=list)
+    truncated: bool = False
+    complete: bool = True
+
+
+def _content_type(headers: Mapping[str, str]) -> str:
+    return (headers.get("Content-Type") or headers.get("content-type") or "").split(";")[0].strip().lower()
+
+
+def _header_charset(headers: Mapping[str, str]) -> str | None:
+    value = headers.get("Content-Type") or headers.get("content-type") or ""
+    match = re.search(r"charset=([-\w]+)", value, re.I)
+    return match.group(1) if match else None
+
+
+def _resolve_encoding(headers: Mapping[str, str], head: bytes) -> str:
+    candidates = [_header_charset(headers)]
+    match = _META_CHARSET_RE.search(head)
+    if match:
+        candidates.append(match.group(1).decode("ascii", "ignore"))
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+def sniff_head_videos(head: bytes) -> List[str]:
+    """Return ``og:video`` URLs declared in raw ``<head>`` markup."""
+    videos: List[str] = []
+    for tag in _META_TAG_RE.findall(head):
+        attrs = {}
+        for name, double, single, bare in _ATTR_RE.findall(tag):
+            attrs[name.decode("ascii").lower()] = (double or single or bare).decode("utf-8", "replace")
+        key = (attrs.get("property") or attrs.get("name") or "").lower()
+        content = attrs.get("content")
+        if key in OG_VIDEO_PROPERTIES and content and content not in videos:
+            videos.append(content)
+    return videos
+
+
+def fetch_html_stream(
+    url: str,
+    *,
+    timeout: int = 15,
+    max_bytes: int = MAX_HTML_BYTES,
+    head_only: bool = False,
+) -> HtmlFetch:
+    """Download a page incrementally with a byte budget.
+
+    Non-HTML responses are rejected from their headers before any body is
+    read. ``og:video`` tags are sniffed as soon as ``</head>`` arrives; with
+    ``head_only`` the download stops there. Complete (or budget-truncated)
+    bodies are stored in the HTTP cache, and fresh cache entries are served
+    without touching the network.
+    """
+
+    cache = get_cache()
+    meta = cache.lookup(url)
+    cached = cache.fresh(url, "html", meta=meta)
+    request_headers = dict(HEADERS)
+    if cached is None:
+        request_headers.update(cache.conditional_headers(meta))
+        LOGGER.debug("Fetching HTML", extra={"url": url, "timeout": timeout})
+        response = http_client.get(url, headers=request_headers, timeout=timeout, stream=True)
+        try:
+            if response.status_code == 304 and meta:
+                cached = cache.not_modified(url, meta, response.headers)
+            if cached is None:
+                return _read_stream(url, response, cache, max_bytes=max_bytes, head_only=head_only)
+        finally:
+            response.close()
+
+    match = _HEAD_END_RE.search(cached.content)
+    head = cached.content[: match.start()] if match else cached.content
+    LOGGER.info("Fetched HTML", extra={"url": url, "bytes": len(cached.content), "from_cache": True})
+    return HtmlFetch(url=url, html=cached.text, head_videos=sniff_head_videos(head))
+
+
+def _read_stream(url, response, cache, *, max_bytes: int, head_only: bool) -> HtmlFetch:
     response.raise_for_status()
-    LOGGER.info("Fetched HTML", extra={"url": url, "bytes": len(response.content)})
-    return response.text
+    content_type = _content_type(response.headers)
+    if content_type and content_type not in HTML_CONTENT_TYPES:
+        raise UnsupportedContentError(f"{url} serves {content_type}")
+
+    body = bytearray()
+    head_end: int | None = None
+    truncated = False
+    complete = True
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        scan_from = max(0, len(body) - _HEAD_END_OVERLAP)
+        body.extend(chunk)
+        if head_end is None:
+            match = _HEAD_END_RE.search(body, scan_from)
+            if match:
+                head_end = match.start()
+                if head_only:
+                    complete = False
+                    break
+        if len(body) >= max_bytes:
+            del body[max_bytes:]
+            truncated = True
+            break
+
+    content = bytes(body)
+    head = content[:head_end] if head_end is not None else content
+    encoding = _resolve_encoding(response.headers, head)
+    if complete:
+        cache.store(url, status=response.status_code, content=content, headers=response.headers, encoding=encoding)
+    LOGGER.info(
+        "Fetched HTML",
+        extra={"url": url, "bytes": len(content), "truncated": truncated, "from_cache": False},
+    )
+    return HtmlFetch(
+        url=url,
+        html=content.decode(encoding, errors="replace"),
+        head_videos=sniff_head_videos(head),
+        truncated=truncated,
+        complete=complete,
+    )
+
+
+def fetch_html(url: str, timeout: int = 15) -> str:
+    return fetch_html_stream(url, timeout=timeout).html
+
+
+def extract_text_and_videos(url: str, *, metadata_only: bool = False) -> Extraction:
+    """Return (text, direct_videos, platform_links) from a web page.
 
+    With ``metadata_only`` the download stops after ``<head>`` and only the
+    ``og:video`` references found there are returned.
+    """
+    fetched = fetch_html_stream(url, head_only=metadata_only)
+    if metadata_only:
+        return "", fetched.head_videos, []
+    return parse_fetched(fetched)
 
-def extract_text_and_videos(url: str):
-    """Return (text, direct_videos, platform_links) from a web page."""
-    html = fetch_html(url)
-    doc = Document(html)
-    content_html = doc.summary()
-    soup = BeautifulSoup(content_html, "lxml")
-    text = soup.get_text(" ", strip=True)
+
+def parse_fetched(fetched: HtmlFetch) -> Extraction:
+    """Parse a streamed page, adding videos sniffed from its ``<head>``."""
+    text, videos, platform_links = parse_html(fetched.html, fetched.url)
+    if fetched.head_videos:
+        videos = sorted(set(videos) | set(fetched.head_videos))
+    return text, videos, platform_links
+
+
+class _TreeDocument(Document):
+    """Readability over an already-parsed tree.
+
+    ``summary()`` normally re-parses the input string, up to twice when it
+    retries without ruthless pruning. Here each pass works on a copy of the
+    shared tree instead. That overrides readability's private ``_parse``, so
+    ``readability-lxml`` is pinned in ``requirements.txt`` and
+    ``tests/test_extract.py`` checks the hook still exists.
+
+    ``summary()`` still returns the article HTML, so ``retry_length`` keeps
+    comparing HTML length as in stock readability; the winning element is kept
+    on :attr:`article` for callers that want its text.
+    """
+
+    def __init__(self, tree, **kwargs) -> None:
+        super().__init__(tree, **kwargs)
+        self._tree = tree
+        self.article = None
+
+    def _parse(self, input):
+        doc = copy.deepcopy(self._tree)
+        doc.resolve_base_href(handle_failures=self.handle_failures)
+        return doc
+
+    def get_clean_html(self):
+        # Documented by readability as the hook for subclasses.
+        self.article = self.html
+        return super().get_clean_html()
+
+
+def _element_text(element) -> str:
+    return " ".join(part.strip() for part in element.itertext() if part.strip())
+
+
+def parse_tree(html: str):
+    """Parse ``html`` once into a cleaned lxml tree, or ``None`` if it is empty."""
+    if not html or not html.strip():
+        return None
+    tree = lxml.html.document_fromstring(html.encode("utf-8", "replace"), parser=_UTF8_PARSER)
+    _CLEANER(tree)
+    return tree
+
+
+def parse_html(html: str, url: str = "") -> Extraction:
+    """Extract article text and media references from one parse of ``html``.
+
+    ``og:video`` meta tags are read from the full document head and ``<video>``
+    sources from the whole page; readability only decides the article text and
+    the region searched for platform links.
+    """
+    tree = parse_tree(html)
+    if tree is None:
+        return "", [], []
 
     video_links = set()
-    for video in soup.select("video source, video"):
+    for meta in tree.iter("meta"):
+        key = (meta.get("property") or meta.get("name") or "").lower()
+        content = meta.get("content")
+        if key in OG_VIDEO_PROPERTIES and content:
+            video_links.add(content)
+
+    for video in tree.iter("video", "source"):
+        if video.tag == "source" and video.getparent() is not None and video.getparent().tag != "video":
+            continue
         src = video.get("src") or video.get("data-src")
-        if src and any(src.lower().endswith(ext) for ext in [".mp4", ".m3u8", ".webm"]):
+        if src and src.lower().endswith(VIDEO_EXTENSIONS):
             video_links.add(src)
 
-    for meta in soup.select(
-        'meta[property="og:video"], meta[property="og:video:url"], meta[property="og:video:secure_url"]'
-    ):
-        content = meta.get("content")
-        if content:
-            video_links.add(content)
+    doc = _TreeDocument(tree)
+    doc.summary()
+    article = doc.article if doc.article is not None else tree
+    text = _element_text(article)
 
     platform_links = set()
-    for anchor in soup.select("a[href]"):
-        href = anchor["href"]
-        if any(
-            platform in href
-            for platform in ["tiktok.com", "instagram.com", "facebook.com/reel", "fb.watch", "v.redd.it"]
-        ):
+    for anchor in article.iter("a"):
+        href = anchor.get("href")
+        if href and any(platform in href for platform in PLATFORM_HOSTS):
             platform_links.add(href)
 
     LOGGER.debug(
@@ -60,3 +311,78 @@ def extract_text_and_videos(url: str):
     )
 
     return text, sorted(video_links), sorted(platform_links)
+
+
+def from_source(item: Mapping[str, object]) -> Extraction | None:
+    """Return the extraction a source already supplied for ``item``, if sufficient.
+
+    Sources may attach ``text``, ``videos`` and ``platform_links`` to their
+    items. When that includes a direct video or at least
+    :data:`SOURCE_TEXT_MIN_CHARS` of text, fetching the page would add
+    nothing the scorer needs.
+    """
+
+    text = str(item.get("text") or "")
+    videos = list(item.get("videos") or [])
+    if not videos and len(text) < SOURCE_TEXT_MIN_CHARS:
+        return None
+    return text, videos, list(item.get("platform_links") or [])
+
+
+def fetch_many(urls: Sequence[str], *, fetch_workers: int = 8) -> Iterator[Tuple[int, HtmlFetch]]:
+    """Download ``urls`` concurrently, yielding ``(index, fetch)`` as each completes.
+
+    Failed and non-HTML downloads are logged and skipped.
+    """
+
+    if not urls:
+        return
+    with ThreadPoolExecutor(
+        max_workers=max(1, fetch_workers), thread_name_prefix="eventscout-fetch"
+    ) as fetch_pool:
+        fetches = {fetch_pool.submit(fetch_html_stream, url): index for index, url in enumerate(urls)}
+        for future in as_completed(fetches):
+            index = fetches[future]
+            try:
+                fetched = future.result()
+            except UnsupportedContentError as exc:
+                LOGGER.info("Skipping non-HTML content", extra={"link": urls[index], "reason": str(exc)})
+                continue
+            except Exception:
+                LOGGER.exception("Failed to extract content", extra={"link": urls[index]})
+                continue
+            yield index, fetched
+
+
+def extract_many(
+    urls: Sequence[str],
+    *,
+    fetch_workers: int = 8,
+    parse_workers: int = 2,
+) -> List[Extraction]:
+    """Extract many pages with separate pools for network and parsing work.
+
+    Downloads run on ``fetch_workers`` threads; each finished download is handed
+    to a ``parse_workers`` pool straight away, so parsing overlaps with the
+    remaining fetches. Results follow the order of ``urls``; a failure for one
+    URL is logged and yields an empty extraction without affecting the rest.
+    """
+
+    results: List[Extraction] = [("", [], []) for _ in urls]
+    if not urls:
+        return results
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, parse_workers), thread_name_prefix="eventscout-parse"
+    ) as parse_pool:
+        parses = {
+            parse_pool.submit(parse_fetched, fetched): index
+            for index, fetched in fetch_many(urls, fetch_workers=fetch_workers)
+        }
+        for future in as_completed(parses):
+            index = parses[future]
+            try:
+                results[index] = future.result()
+            except Exception:
+                LOGGER.exception("Failed to extract content", extra={"link": urls[index]})
+    return results
@@ -0,0 +1,190 @@
+"""Per-feed polling state for incremental RSS / Google News fetches."""
+from __future__ import annotations
+
+import calendar
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Mapping
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_FEED_STATE_PATH = "feed_state.json"
+# Must comfortably exceed the number of entries a feed returns, otherwise
+# entries that fall out of the ring would be yielded again.
+DEFAULT_MAX_GUIDS = 500
+
+
+def entry_guid(entry: Mapping[str, Any]) -> str:
+    return entry.get("id") or entry.get("guid") or entry.get("link") or ""
+
+
+def body_digest(content: bytes, *, limit: int) -> str:
+    """Fingerprint of a feed body read with ``limit``, to tell whether it was already consumed."""
+    return f"{limit}:{hashlib.sha1(content).hexdigest()}"
+
+
+def entry_timestamp(entry: Mapping[str, Any]) -> float | None:
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if not parsed:
+        return None
+    try:
+        return float(calendar.timegm(parsed))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class FeedState:
+    """Remembers, per feed, the GUIDs already yielded.
+
+    An entry is new when its GUID has not been yielded before. Only the
+    ``max_guids`` most recent GUIDs are kept; the newest publication time among
+    GUIDs dropped from that ring becomes the feed's horizon, and dated entries
+    at or before it are treated as already yielded. The horizon therefore only
+    moves past entries that really were handed downstream. Undated entries are
+    judged by GUID alone.
+
+    The digest of the last body consumed is stored next to the GUIDs, so an
+    unchanged feed can be skipped without parsing it.
+
+    :meth:`mark` only stages entries: they are excluded from later
+    :meth:`new_entries` calls but not persisted. :meth:`save` folds everything
+    staged into the saved state and writes it. Pipelined callers instead close
+    a round with :meth:`checkpoint` after collecting it, then :meth:`commit`
+    that round once it is delivered or :meth:`rollback` it if delivery fails,
+    so its entries are yielded again. A cycle that crashes before saving sees
+    the same entries on the next run, even if the HTTP cache already answers
+    ``304`` for the feed.
+    """
+
+    def __init__(self, path: str | None = DEFAULT_FEED_STATE_PATH, *, max_guids: int = DEFAULT_MAX_GUIDS) -> None:
+        self.path = path
+        self.max_guids = max_guids
+        self._feeds: Dict[str, Dict[str, Any]] = {}
+        # Marks not yet committed: closed rounds in order, then the open one.
+        # Each round maps a feed to its staged ``{"guids": [[guid, ts]], "digest"}``.
+        self._rounds: List[Dict[str, Dict[str, Any]]] = []
+        self._open: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+        except (OSError, ValueError):
+            LOGGER.warning("Ignoring unreadable feed state", extra={"path": self.path})
+            return
+        for feed, state in raw.items():
+            # Older files stored bare GUIDs and a high-water mark; keep the GUIDs.
+            self._feeds[feed] = {
+                "guids": [guid if isinstance(guid, list) else [guid, None] for guid in state.get("guids", [])],
+                "horizon": state.get("horizon"),
+                "digest": state.get("digest"),
+            }
+
+    def _staged(self, feed: str) -> List[Dict[str, Any]]:
+        return [round_[feed] for round_ in (*self._rounds, self._open) if feed in round_]
+
+    def unchanged(self, feed: str, digest: str) -> bool:
+        """True if the body with ``digest`` was already consumed for ``feed``."""
+        with self._lock:
+            staged = self._staged(feed)
+            if staged:
+                return staged[-1]["digest"] == digest
+            state = self._feeds.get(feed)
+            return state is not None and state.get("digest") == digest
+
+    def new_entries(self, feed: str, entries: Iterable[Mapping[str, Any]]) -> List[Mapping[str, Any]]:
+        """Return the entries of ``feed`` that were not yielded before."""
+        with self._lock:
+            state = self._feeds.get(feed)
+            horizon = state["horizon"] if state is not None else None
+            guids = {guid for guid, _ in state["guids"]} if state is not None else set()
+            for staged in self._staged(feed):
+                guids.update(guid for guid, _ in staged["guids"])
+        fresh = []
+        for entry in entries:
+            if entry_guid(entry) in guids:
+                continue
+            published = entry_timestamp(entry)
+            if published is not None and horizon is not None and published <= horizon:
+                continue
+            fresh.append(entry)
+        return fresh
+
+    def mark(self, feed: str, entries: Iterable[Mapping[str, Any]], *, digest: str | None = None) -> None:
+        """Stage ``entries`` as yielded in the open round.
+
+        Only pass the entries actually handed downstream; ``digest`` is the
+        body they came from.
+        """
+        with self._lock:
+            staged = self._open.setdefault(feed, {"guids": [], "digest": None})
+            staged["digest"] = digest
+            staged["guids"].extend(
+                [guid, entry_timestamp(entry)] for entry in entries if (guid := entry_guid(entry))
+            )
+
+    def _apply(self, round_: Dict[str, Dict[str, Any]]) -> None:
+        for feed, staged in round_.items():
+            state = self._feeds.setdefault(feed, {"guids": [], "horizon": None, "digest": None})
+            state["digest"] = staged["digest"]
+            guids: List[list] = state["guids"]
+            known = {guid for guid, _ in guids}
+            for guid, published in staged["guids"]:
+                if guid not in known:
+                    guids.append([guid, published])
+                    known.add(guid)
+            overflow = max(0, len(guids) - self.max_guids)
+            for _, published in guids[:overflow]:
+                if published is not None and (state["horizon"] is None or published > state["horizon"]):
+                    state["horizon"] = published
+            del guids[:overflow]
+
+    def checkpoint(self) -> Dict[str, Dict[str, Any]]:
+        """Close the open round and return it, to be passed to :meth:`commit` or :meth:`rollback`."""
+        with self._lock:
+            round_, self._open = self._open, {}
+            self._rounds.append(round_)
+            return round_
+
+    def commit(self, round_: Dict[str, Dict[str, Any]]) -> None:
+        """Fold one :meth:`checkpoint` round into the saved state and persist it.
+
+        Marks of other rounds, earlier or later, are left staged.
+        """
+        with self._lock:
+            self._rounds = [other for other in self._rounds if other is not round_]
+            self._apply(round_)
+            payload = json.dumps(self._feeds) if round_ else None
+        self._write(payload)
+
+    def rollback(self, round_: Dict[str, Dict[str, Any]]) -> None:
+        """Drop the marks of an undelivered round, so its entries are yielded again."""
+        with self._lock:
+            self._rounds = [other for other in self._rounds if other is not round_]
+
+    def save(self) -> None:
+        """Fold every staged mark into the saved state and persist it."""
+        with self._lock:
+            staged = [*self._rounds, self._open]
+            self._rounds, self._open = [], {}
+            for round_ in staged:
+                self._apply(round_)
+            payload = json.dumps(self._feeds) if any(staged) else None
+        self._write(payload)
+
+    def _write(self, payload: str | None) -> None:
+        if not self.path or payload is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+        os.replace(tmp_path, self.path)
+
+__all__ = ["DEFAULT_FEED_STATE_PATH", "FeedState", "body_digest", "entry_guid", "entry_timestamp"]
@@ -0,0 +1,371 @@
+"""Persistent HTTP cache with TTLs and conditional revalidation."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping
+
+from core import http_client
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "http")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Seconds a cached response is served without contacting the origin at all.
+# Once stale, the entry is revalidated with If-None-Match/If-Modified-Since.
+DEFAULT_TTLS: Dict[str, int] = {
+    "google_news": 10 * 60,
+    "rss": 15 * 60,
+    "html": 6 * 60 * 60,
+}
+
+
+@dataclass
+class CachedResponse:
+    """Body and metadata for a URL, served from the network or the cache."""
+
+    url: str
+    status: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    encoding: str | None = None
+    from_cache: bool = False
+    not_modified: bool = False
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HttpCache:
+    """Size-bounded on-disk cache keyed by URL.
+
+    Each entry is a ``<sha1>.body`` file plus a ``<sha1>.json`` metadata file
+    holding validators, the fetch time and optional *derived* values (for
+    example feed entries already parsed from the body). Derived values are
+    dropped whenever the body changes, so callers can skip re-parsing when the
+    origin answers ``304 Not Modified``.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Mapping[str, int] | None = None,
+        enabled: bool = True,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # Running size of the cache directory; None until the first full scan.
+        self._size: int | None = None
+
+    # -- storage helpers -------------------------------------------------
+    def _paths(self, url: str) -> tuple[str, str]:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, digest[:2], digest)
+        return f"{base}.body", f"{base}.json"
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+
+    def _read_meta(self, url: str) -> Dict[str, Any] | None:
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or not os.path.exists(body_path):
+            return None
+        return meta
+
+    def _write_meta(self, url: str, meta: Dict[str, Any]) -> None:
+        _, meta_path = self._paths(url)
+        self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+    def _read_body(self, url: str) -> bytes | None:
+        body_path, _ = self._paths(url)
+        try:
+            with open(body_path, "rb") as handle:
+                return handle.read()
+        except OSError:
+            return None
+
+    def _touch(self, url: str) -> None:
+        # Eviction orders entries by metadata mtime, so hits keep entries warm.
+        _, meta_path = self._paths(url)
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+
+    # -- public API ------------------------------------------------------
+    def lookup(self, url: str) -> Dict[str, Any] | None:
+        """Return the metadata stored for ``url`` or ``None``."""
+        if not self.enabled:
+            return None
+        return self._read_meta(url)
+
+    def is_fresh(self, meta: Mapping[str, Any], kind: str) -> bool:
+        ttl = self.ttls.get(kind, 0)
+        return ttl > 0 and time.time() - float(meta.get("fetched_at", 0)) < ttl
+
+    @staticmethod
+    def conditional_headers(meta: Mapping[str, Any] | None) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if not meta:
+            return headers
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def store(
+        self,
+        url: str,
+        *,
+        status: int,
+        content: bytes,
+        headers: Mapping[str, str],
+        encoding: str | None,
+    ) -> None:
+        if not self.enabled:
+            return
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() == "content-type"},
+            "encoding": encoding,
+            "etag": headers.get("ETag") or headers.get("etag"),
+            "last_modified": headers.get("Last-Modified") or headers.get("last-modified"),
+            "fetched_at": time.time(),
+            "derived": {},
+        }
+        body_path, meta_path = self._paths(url)
+        with self._lock:
+            previous = self._entry_size(body_path, meta_path)
+            self._write_atomic(body_path, content)
+            self._write_meta(url, meta)
+            over_budget = self._account(body_path, meta_path, previous)
+        if over_budget:
+            self.evict()
+
+    def revalidated(self, url: str, meta: Dict[str, Any], headers: Mapping[str, str]) -> None:
+        """Refresh the fetch time of an entry after a ``304`` answer."""
+        meta = dict(meta)
+        meta["fetched_at"] = time.time()
+        meta["etag"] = headers.get("ETag") or headers.get("etag") or meta.get("etag")
+        meta["last_modified"] = (
+            headers.get("Last-Modified") or headers.get("last-modified") or meta.get("last_modified")
+        )
+        body_path, meta_path = self._paths(url)
+        with self._lock:
+            previous = self._entry_size(body_path, meta_path)
+            self._write_meta(url, meta)
+            over_budget = self._account(body_path, meta_path, previous)
+        if over_budget:
+            self.evict()
+
+    def load_derived(self, url: str, name: str) -> Any:
+        meta = self.lookup(url)
+        if not meta:
+            return None
+        return meta.get("derived", {}).get(name)
+
+    def store_derived(self, url: str, name: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        body_path, meta_path = self._paths(url)
+        with self._lock:
+            meta = self._read_meta(url)
+            if meta is None:
+                return
+            meta.setdefault("derived", {})[name] = value
+            previous = self._entry_size(body_path, meta_path)
+            self._write_meta(url, meta)
+            over_budget = self._account(body_path, meta_path, previous)
+        if over_budget:
+            self.evict()
+
+    @staticmethod
+    def _entry_size(body_path: str, meta_path: str) -> int:
+        size = 0
+        for path in (body_path, meta_path):
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    def _account(self, body_path: str, meta_path: str, previous: int) -> bool:
+        """Apply an entry's size change to the running total; call with the lock held.
+
+        Returns True when the cache needs an :meth:`evict` pass.
+        """
+        if self._size is not None:
+            self._size += self._entry_size(body_path, meta_path) - previous
+        return self._size is None or self._size > self.max_bytes
+
+    def evict(self) -> int:
+        """Remove least recently used entries until under ``max_bytes``.
+
+        This scans the whole cache directory, so writes only call it when the
+        running size total says the budget is exceeded.
+        """
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                meta_path = os.path.join(root, name)
+                body_path = meta_path[: -len(".json")] + ".body"
+                try:
+                    size = os.path.getsize(meta_path) + os.path.getsize(body_path)
+                    mtime = os.path.getmtime(meta_path)
+                except OSError:
+                    continue
+                entries.append((mtime, size, meta_path, body_path))
+                total += size
+        if total <= self.max_bytes:
+            with self._lock:
+                self._size = total
+            return 0
+
+        removed = 0
+        entries.sort()
+        with self._lock:
+            for _, size, meta_path, body_path in entries:
+                if total <= self.max_bytes:
+                    break
+                for path in (meta_path, body_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+                removed += 1
+            self._size = total
+        LOGGER.debug("Evicted HTTP cache entries", extra={"removed": removed, "bytes": total})
+        return removed
+
+    def _cached_response(
+        self, url: str, meta: Mapping[str, Any], *, not_modified: bool = False
+    ) -> CachedResponse | None:
+        content = self._read_body(url)
+        if content is None:
+            return None
+        return CachedResponse(
+            url=url,
+            status=int(meta.get("status", 200)),
+            content=content,
+            headers=dict(meta.get("headers", {})),
+            encoding=meta.get("encoding"),
+            from_cache=True,
+            not_modified=not_modified,
+        )
+
+    def fresh(
+        self, url: str, kind: str, *, meta: Mapping[str, Any] | None = None
+    ) -> CachedResponse | None:
+        """Return the cached response for ``url`` if it is still within its TTL."""
+        meta = meta if meta is not None else self.lookup(url)
+        if not meta or not self.is_fresh(meta, kind):
+            return None
+        cached = self._cached_response(url, meta)
+        if cached is not None:
+            self._touch(url)
+            LOGGER.debug("HTTP cache hit", extra={"url": url, "kind": kind})
+        return cached
+
+    def not_modified(
+        self, url: str, meta: Dict[str, Any], headers: Mapping[str, str]
+    ) -> CachedResponse | None:
+        """Handle a ``304`` answer: refresh the entry and return its body."""
+        cached = self._cached_response(url, meta, not_modified=True)
+        if cached is not None:
+            self.revalidated(url, meta, headers)
+            LOGGER.debug("HTTP cache revalidated", extra={"url": url})
+        return cached
+
+    def get(
+        self,
+        url: str,
+        *,
+        kind: str = "html",
+        headers: Mapping[str, str] | None = None,
+        timeout: int = 15,
+    ) -> CachedResponse:
+        """Fetch ``url`` through the cache, revalidating stale entries."""
+        meta = self.lookup(url)
+        fresh = self.fresh(url, kind, meta=meta)
+        if fresh is not None:
+            return fresh
+
+        request_headers = dict(headers or {})
+        request_headers.update(self.conditional_headers(meta))
+        response = http_client.get(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and meta:
+            cached = self.not_modified(url, meta, response.headers)
+            if cached is not None:
+                return cached
+
+        response.raise_for_status()
+        encoding = response.encoding or response.apparent_encoding
+        self.store(
+            url,
+            status=response.status_code,
+            content=response.content,
+            headers=response.headers,
+            encoding=encoding,
+        )
+        return CachedResponse(
+            url=url,
+            status=response.status_code,
+            content=response.content,
+            headers=dict(response.headers),
+            encoding=encoding,
+        )
+
+
+_DEFAULT_CACHE: HttpCache | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_cache() -> HttpCache:
+    """Return the process-wide cache configured from the environment.
+
+    ``EVENTSCOUT_HTTP_CACHE_DIR`` overrides the location and
+    ``EVENTSCOUT_HTTP_CACHE=0`` disables caching (requests still go out, but
+    nothing is stored).
+    """
+
+    global _DEFAULT_CACHE
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = HttpCache(
+                os.getenv("EVENTSCOUT_HTTP_CACHE_DIR") or DEFAULT_CACHE_DIR,
+                enabled=os.getenv("EVENTSCOUT_HTTP_CACHE", "1") not in {"0", "false", "off"},
+            )
+        return _DEFAULT_CACHE
+
+
+__all__ = ["CachedResponse", "DEFAULT_TTLS", "HttpCache", "get_cache"]
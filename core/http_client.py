@@ -0,0 +1,318 @@
+"""Shared pooled HTTP client used by every EventScout fetcher."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import urllib.parse
+from dataclasses import asdict, dataclass
+from typing import Dict, Mapping, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; EventScout/1.0)"}
+# Number of distinct hosts whose connection pools are kept alive, and the
+# number of keep-alive connections held per host.
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 8
+
+# Token-bucket pacing (requests per second, burst) for hosts that rate limit
+# anonymous clients. Other hosts are not paced.
+HOST_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "www.reddit.com": (0.5, 4),
+    "tikwm.com": (1.0, 1),
+    "www.tikwm.com": (1.0, 1),
+    # Feeds plus the resolver's redirect lookups for opaque article ids.
+    "news.google.com": (5.0, 10),
+}
+# Consecutive failures (connection errors, 429, 5xx) that open a host's circuit.
+CIRCUIT_FAILURES = 3
+CIRCUIT_COOLDOWN = 60.0
+# A request that would have to wait longer than this for its host fails fast.
+MAX_THROTTLE_WAIT = 20.0
+
+
+@dataclass
+class HostMetrics:
+    """Per-host request counters collected by :func:`request`."""
+
+    requests: int = 0
+    errors: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    last_status: int | None = None
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host that is known to be failing."""
+
+    def __init__(self, host: str, retry_after: float) -> None:
+        super().__init__(f"{host} unavailable for another {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class HostLimiter:
+    """Token bucket plus circuit breaker for a single host.
+
+    Tokens refill at ``rate`` per second up to ``burst``. Server hints narrow
+    that further: ``Retry-After`` and an exhausted ``x-ratelimit-remaining``
+    block the host until the advertised reset, and a non-zero remaining budget
+    is spread evenly over ``x-ratelimit-reset``. After
+    :data:`CIRCUIT_FAILURES` consecutive failures, or any ``429``, the circuit
+    opens and requests fail immediately with :class:`CircuitOpenError` until the
+    cooldown (or the server's reset time) has passed. The circuit is then
+    half-open: one request is let through as a probe while every other caller
+    keeps failing fast, until :meth:`observe` sees the probe's outcome and
+    closes the circuit or opens it again. A probe that is never observed stops
+    blocking other callers after :data:`CIRCUIT_COOLDOWN`.
+    """
+
+    def __init__(self, host: str, rate: float, burst: int, *, clock=time.monotonic) -> None:
+        self.host = host
+        self.rate = rate
+        self.base_rate = rate
+        self.burst = max(1, burst)
+        self.clock = clock
+        self.tokens = float(self.burst)
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self.failures = 0
+        # Start time of the half-open probe in flight, if any.
+        self.probe_started: float | None = None
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must sleep before sending."""
+        with self._lock:
+            now = self.clock()
+            tripped = self.failures >= CIRCUIT_FAILURES
+            if tripped and self.blocked_until > now:
+                raise CircuitOpenError(self.host, self.blocked_until - now)
+            if tripped and self.probe_started is not None and now - self.probe_started < CIRCUIT_COOLDOWN:
+                raise CircuitOpenError(self.host, self.probe_started + CIRCUIT_COOLDOWN - now)
+            self._refill(now)
+            wait = max(0.0, self.blocked_until - now)
+            if self.tokens < 1:
+                wait = max(wait, (1 - self.tokens) / self.rate)
+            if wait > MAX_THROTTLE_WAIT:
+                raise CircuitOpenError(self.host, wait)
+            self.tokens -= 1
+            if tripped:
+                self.probe_started = now
+            return wait
+
+    def observe(self, response: requests.Response | None) -> None:
+        """Update pacing and circuit state from the outcome of a request."""
+        with self._lock:
+            now = self.clock()
+            self.probe_started = None
+            if response is None or response.status_code == 429 or response.status_code >= 500:
+                self.failures += 1
+                cooldown = retry_after(response) if response is not None else None
+                if response is not None and response.status_code == 429:
+                    self.failures = max(self.failures, CIRCUIT_FAILURES)
+                if self.failures >= CIRCUIT_FAILURES:
+                    self.blocked_until = max(self.blocked_until, now + (cooldown or CIRCUIT_COOLDOWN))
+                elif cooldown:
+                    self.blocked_until = max(self.blocked_until, now + cooldown)
+            else:
+                self.failures = 0
+            if response is not None:
+                self._apply_rate_headers(response.headers, now)
+
+    def _apply_rate_headers(self, headers: Mapping[str, str], now: float) -> None:
+        remaining = _float_header(headers, "x-ratelimit-remaining")
+        reset = _float_header(headers, "x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        if remaining < 1:
+            self.blocked_until = max(self.blocked_until, now + reset)
+            return
+        self.rate = min(self.base_rate, remaining / max(reset, 1.0))
+
+
+def _float_header(headers: Mapping[str, str], name: str) -> float | None:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+_METRICS: Dict[str, HostMetrics] = {}
+_METRICS_LOCK = threading.Lock()
+_LIMITERS: Dict[str, HostLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def _build_retry() -> Retry:
+    # Only idempotent requests are retried; LLM and Telegram POSTs are not.
+    return Retry(
+        total=2,
+        connect=2,
+        read=1,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def build_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=_build_retry(),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Paced hosts are not retried by urllib3: every attempt must take a token
+    # from the host's limiter and be observed by its circuit breaker.
+    paced = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+    for host in HOST_RATE_LIMITS:
+        session.mount(f"https://{host}/", paced)
+        session.mount(f"http://{host}/", paced)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session, creating it on first use."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = build_session()
+        return _SESSION
+
+
+def _record(host: str, *, started: float, response: requests.Response | None) -> None:
+    with _METRICS_LOCK:
+        metrics = _METRICS.setdefault(host, HostMetrics())
+        metrics.requests += 1
+        metrics.seconds += time.monotonic() - started
+        if response is None:
+            metrics.errors += 1
+            return
+        metrics.last_status = response.status_code
+        if response.status_code >= 400:
+            metrics.errors += 1
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit():
+            metrics.bytes += int(length)
+
+
+def get_limiter(host: str) -> HostLimiter | None:
+    """Return the limiter for ``host`` if it has a configured rate limit."""
+    limit = HOST_RATE_LIMITS.get(host)
+    if limit is None:
+        return None
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(host)
+        if limiter is None:
+            limiter = _LIMITERS[host] = HostLimiter(host, *limit)
+        return limiter
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the shared session and record host metrics.
+
+    Requests to hosts in :data:`HOST_RATE_LIMITS` are paced by their
+    :class:`HostLimiter` and raise :class:`CircuitOpenError` without touching
+    the network while that host's circuit is open.
+    """
+    host = urllib.parse.urlsplit(url).netloc.lower()
+    limiter = get_limiter(host)
+    if limiter is not None:
+        wait = limiter.reserve()
+        if wait:
+            time.sleep(wait)
+    started = time.monotonic()
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except requests.RequestException:
+        _record(host, started=started, response=None)
+        if limiter is not None:
+            limiter.observe(None)
+        raise
+    _record(host, started=started, response=response)
+    if limiter is not None:
+        limiter.observe(response)
+    return response
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def retry_after(response: requests.Response | None) -> float | None:
+    """Seconds requested by a ``Retry-After`` header, if it has a numeric value."""
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """Whether ``exc`` wraps an HTTP 429 answer or a short-circuited request."""
+    if isinstance(exc, CircuitOpenError):
+        return True
+    response = getattr(exc, "response", None)
+    return response is not None and response.status_code == 429
+
+
+def host_metrics() -> Dict[str, dict]:
+    """Return a snapshot of the per-host counters."""
+    with _METRICS_LOCK:
+        return {host: asdict(metrics) for host, metrics in _METRICS.items()}
+
+
+def log_metrics() -> None:
+    snapshot = host_metrics()
+    for host, metrics in sorted(snapshot.items()):
+        LOGGER.debug("HTTP host metrics", extra={"host": host, **metrics})
+    LOGGER.info(
+        "HTTP requests this process: %s across %s hosts",
+        sum(m["requests"] for m in snapshot.values()),
+        len(snapshot),
+        extra={"errors": sum(m["errors"] for m in snapshot.values())},
+    )
+
+
+__all__ = [
+    "CircuitOpenError",
+    "HostLimiter",
+    "HostMetrics",
+    "get",
+    "get_limiter",
+    "get_session",
+    "host_metrics",
+    "is_rate_limited",
+    "log_metrics",
+    "post",
+    "request",
+    "retry_after",
+]
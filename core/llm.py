@@ -1,4 +1,6 @@
-import os, json, requests
+import os, json
+
+from core import http_client
 
 def openrouter_chat(messages, model=None, endpoint=None, api_key=None, site_url=None, app_title=None, timeout=30):
     model = model or os.getenv("OPENROUTER_MODEL", "google/gemma-2-9b-it:free")
@@ -22,7 +24,7 @@ def openrouter_chat(messages, model=None, endpoint=None, api_key=None, site_url=
         "temperature": 0.2,
         "max_tokens": 300
     }
-    r = requests.post(endpoint, headers=headers, json=payload, timeout=timeout)
+    r = http_client.post(endpoint, headers=headers, json=payload, timeout=timeout)
     r.raise_for_status()
     data = r.json()
     try:
@@ -0,0 +1,209 @@
+"""Single-pass multi-keyword matching for the rule-based scorer."""
+from __future__ import annotations
+
+import bisect
+import re
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+# Joins the texts of a batch. Keywords never contain it, so no match spans two
+# texts, and it is a non-word character, so ``\b`` behaves as at a string end.
+BATCH_SEPARATOR = "\x00"
+
+
+def join_batch(texts: Sequence[str]) -> Tuple[str, List[int]]:
+    """Join ``texts`` with :data:`BATCH_SEPARATOR`; return the text and each text's start offset."""
+    starts: List[int] = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + 1
+    return BATCH_SEPARATOR.join(texts), starts
+
+
+def batch_rows(starts: Sequence[int], positions: Sequence[int]) -> np.ndarray:
+    """Index of the text each offset of a :func:`join_batch` string falls in."""
+    return np.searchsorted(np.asarray(starts), np.asarray(positions, dtype=np.int64), side="right") - 1
+
+
+def pattern_rows(pattern: re.Pattern, joined: str, starts: Sequence[int]) -> np.ndarray:
+    """Boolean column: which texts of a :func:`join_batch` string ``pattern`` matches."""
+    flags = np.zeros(len(starts), dtype=bool)
+    positions = [match.start() for match in pattern.finditer(joined)]
+    if positions:
+        flags[batch_rows(starts, positions)] = True
+    return flags
+
+
+def _trie_pattern(node: dict) -> str:
+    """Render a trie as a regex whose greedy match is the longest keyword."""
+    terminal = "" in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if terminal:
+        # Prefer the longer continuation but fall back to the keyword ending here.
+        return "(?:" + body + ")?"
+    return body
+
+
+# Below this many distinct keywords CPython's C-level substring search beats a
+# per-character regex scan; see benchmarks/bench_keywords.py.
+SCAN_THRESHOLD = 128
+
+
+class KeywordMatcher:
+    """Count substring hits for several keyword categories at once.
+
+    Built once per keyword configuration, the matcher answers the same question
+    as one ``kw in text`` test per keyword and category, but shares work:
+
+    * ``scan`` compiles every keyword into one trie-shaped regex wrapped in a
+      lookahead, so a single ``finditer`` pass reports the longest keyword
+      starting at each position. Any shorter keyword starting there is a prefix
+      of that match, so expanding matches with their keyword prefixes recovers
+      exactly the set of keywords contained in the text.
+    * ``probe`` tests each distinct keyword once (shortest first), skipping
+      non-ASCII keywords for ASCII-only text and every keyword containing one
+      that was already found absent.
+
+    ``auto`` picks ``scan`` once the configuration has ``SCAN_THRESHOLD`` or
+    more distinct keywords and ``probe`` otherwise.
+
+    :meth:`count_batch` runs the chosen strategy once over a whole batch of
+    texts joined by :func:`join_batch` and returns one count column per
+    category.
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]], *, strategy: str = "auto") -> None:
+        if strategy not in {"auto", "scan", "probe"}:
+            raise ValueError(f"Unknown matcher strategy: {strategy}")
+        self.categories = {name: frozenset(words) for name, words in categories.items()}
+        keywords = set().union(*self.categories.values()) if self.categories else set()
+        # An empty keyword is "in" every string; track it outside both strategies.
+        self._always = {""} & keywords
+        keywords.discard("")
+
+        if strategy == "auto":
+            strategy = "scan" if len(keywords) >= SCAN_THRESHOLD else "probe"
+        self.strategy = strategy
+
+        self._membership: Dict[str, tuple[str, ...]] = {
+            keyword: tuple(name for name, words in self.categories.items() if keyword in words)
+            for keyword in keywords | self._always
+        }
+
+        self._pattern = None
+        self._prefixes: Dict[str, frozenset[str]] = {}
+        if strategy == "scan" and keywords:
+            trie: dict = {}
+            for keyword in keywords:
+                node = trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                node[""] = {}
+            self._pattern = re.compile("(?=(" + _trie_pattern(trie) + "))")
+            self._prefixes = {
+                keyword: frozenset(other for other in keywords if keyword.startswith(other))
+                for keyword in keywords
+            }
+
+        self._ordered = sorted(keywords, key=lambda keyword: (len(keyword), keyword))
+        self._index = {keyword: row for row, keyword in enumerate(self._ordered)}
+        # Category x keyword membership, to turn a keyword x text hit matrix
+        # into per-category counts with one product.
+        self._category_matrix = np.array(
+            [[keyword in words for keyword in self._ordered] for words in self.categories.values()],
+            dtype=np.int64,
+        ).reshape(len(self.categories), len(self._ordered))
+        self._ascii_ordered = [keyword for keyword in self._ordered if keyword.isascii()]
+        self._supersets: Dict[str, frozenset[str]] = {
+            keyword: frozenset(other for other in keywords if other != keyword and keyword in other)
+            for keyword in keywords
+        }
+
+    def _scan(self, text: str) -> set[str]:
+        found: set[str] = set()
+        if self._pattern is None:
+            return found
+        for keyword in {match.group(1) for match in self._pattern.finditer(text)}:
+            found |= self._prefixes[keyword]
+        return found
+
+    def _probe(self, text: str) -> set[str]:
+        found: set[str] = set()
+        absent: set[str] = set()
+        for keyword in self._ascii_ordered if text.isascii() else self._ordered:
+            if keyword in absent:
+                continue
+            if keyword in text:
+                found.add(keyword)
+            else:
+                absent |= self._supersets[keyword]
+        return found
+
+    def _scan_batch(self, joined: str, starts: Sequence[int], hits: np.ndarray) -> None:
+        if self._pattern is None:
+            return
+        positions: List[int] = []
+        keywords: List[str] = []
+        for match in self._pattern.finditer(joined):
+            positions.append(match.start())
+            keywords.append(match.group(1))
+        if not positions:
+            return
+        for row, keyword in set(zip(batch_rows(starts, positions).tolist(), keywords)):
+            for prefix in self._prefixes[keyword]:
+                hits[self._index[prefix], row] = True
+
+    def _probe_batch(self, joined: str, starts: Sequence[int], hits: np.ndarray) -> None:
+        absent: set[str] = set()
+        for keyword in self._ascii_ordered if joined.isascii() else self._ordered:
+            if keyword in absent:
+                continue
+            position = joined.find(keyword)
+            if position < 0:
+                absent |= self._supersets[keyword]
+                continue
+            keyword_row = hits[self._index[keyword]]
+            while position >= 0:
+                row = bisect.bisect_right(starts, position) - 1
+                keyword_row[row] = True
+                if row + 1 >= len(starts):
+                    break
+                # The keyword is known to be in this text; continue with the next.
+                position = joined.find(keyword, starts[row + 1])
+
+    def count_batch(self, texts: Sequence[str], *, joined: Tuple[str, List[int]] | None = None) -> Dict[str, np.ndarray]:
+        """Per-category counts for every text, as :meth:`count` would give them.
+
+        ``joined`` may pass a :func:`join_batch` result the caller already built.
+        """
+        joined_text, starts = joined if joined is not None else join_batch(texts)
+        hits = np.zeros((len(self._ordered), len(starts)), dtype=np.int64)
+        if starts:
+            if self.strategy == "scan":
+                self._scan_batch(joined_text, starts, hits)
+            else:
+                self._probe_batch(joined_text, starts, hits)
+        counts = self._category_matrix @ hits
+        always = np.array([len(self._always & words) for words in self.categories.values()], dtype=np.int64)
+        return {name: counts[row] + always[row] for row, name in enumerate(self.categories)}
+
+    def matched(self, text: str) -> set[str]:
+        """Return every keyword that occurs in ``text``."""
+        found = self._scan(text) if self.strategy == "scan" else self._probe(text)
+        return found | self._always
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Return the number of distinct keywords found per category."""
+        counts = {name: 0 for name in self.categories}
+        for keyword in self.matched(text):
+            for name in self._membership[keyword]:
+                counts[name] += 1
+        return counts
+
+
+__all__ = ["BATCH_SEPARATOR", "KeywordMatcher", "SCAN_THRESHOLD", "batch_rows", "join_batch", "pattern_rows"]
@@ -0,0 +1,228 @@
+"""SimHash near-duplicate detection for candidates from different sources."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from core.utils import norm_text
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = "near_dups.json"
+DEFAULT_TTL_DAYS = 14
+# Signatures are 64 bits split into BANDS bands; two signatures within
+# MAX_DISTANCE bits always agree on at least one band (pigeonhole), so band
+# buckets find every near-duplicate without comparing all pairs.
+SIGNATURE_BITS = 64
+BANDS = 8
+MAX_DISTANCE = 7
+# Only the start of any source-supplied text is used; it is what sources share.
+EARLY_TEXT_CHARS = 300
+# Texts with fewer words ("[TikTok] TikTok video", emoji-only captions) say
+# nothing about the story, so such items are never fingerprinted or merged.
+MIN_TOKENS = 4
+# Signatures of kept items wait here until delivered; bounded for long runs.
+MAX_PENDING = 5000
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Google News appends " - Publisher" to titles.
+_PUBLISHER_SUFFIX_RE = re.compile(r"\s+[-–|]\s+[^-–|]{1,40}$")
+_BAND_BITS = SIGNATURE_BITS // BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+def _features(text: str) -> List[str]:
+    words = _WORD_RE.findall(text)
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word unigrams and bigrams of ``text``."""
+    weights = [0] * SIGNATURE_BITS
+    for feature in _features(text):
+        value = _feature_hash(feature)
+        for bit in range(SIGNATURE_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    signature = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            signature |= 1 << bit
+    return signature
+
+
+def item_text(item: dict) -> str:
+    """Normalised title plus early text used to fingerprint a raw item."""
+    title = _PUBLISHER_SUFFIX_RE.sub("", norm_text(item.get("title", "")))
+    title = re.sub(r"^\[[^\]]+\]\s*", "", title)
+    early = norm_text(str(item.get("text") or "")[:EARLY_TEXT_CHARS])
+    return f"{title} {early}".lower().strip()
+
+
+def hamming(first: int, second: int) -> int:
+    return bin(first ^ second).count("1")
+
+
+def _bands(signature: int) -> Iterable[Tuple[int, int]]:
+    for band in range(BANDS):
+        yield band, signature >> (band * _BAND_BITS) & _BAND_MASK
+
+
+def _representative_rank(item: dict) -> tuple:
+    # Prefer items that can skip extraction or carry media, then richer text.
+    return (
+        bool(item.get("videos")),
+        bool(item.get("platform_links")),
+        len(str(item.get("text") or "")),
+        len(item.get("title", "")),
+    )
+
+
+class NearDuplicateIndex:
+    """Collapses near-duplicate raw items and remembers stories already sent.
+
+    :meth:`collapse` groups a batch by SimHash distance, keeps the best item of
+    each group and drops groups that match a story sent in an earlier cycle.
+    :meth:`record_sent` adds the signatures of delivered candidates to the
+    persisted index, which forgets entries after ``ttl_days``.
+    """
+
+    def __init__(
+        self,
+        path: str | None = DEFAULT_INDEX_PATH,
+        *,
+        max_distance: int = MAX_DISTANCE,
+        ttl_days: float = DEFAULT_TTL_DAYS,
+    ) -> None:
+        self.path = path
+        self.max_distance = min(max_distance, MAX_DISTANCE)
+        self.ttl = ttl_days * 24 * 60 * 60
+        self._sent: Dict[int, float] = {}
+        self._buckets: Dict[Tuple[int, int], set[int]] = defaultdict(set)
+        self._signatures: Dict[str, int] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+        except (OSError, ValueError):
+            LOGGER.warning("Ignoring unreadable near-duplicate index", extra={"path": self.path})
+            return
+        now = time.time()
+        for signature, sent_at in raw:
+            if now - sent_at < self.ttl:
+                self._add_sent(int(signature, 16), float(sent_at))
+
+    def _add_sent(self, signature: int, sent_at: float) -> None:
+        self._sent[signature] = sent_at
+        for band in _bands(signature):
+            self._buckets[band].add(signature)
+
+    def _matches_sent(self, signature: int) -> bool:
+        candidates = set()
+        for band in _bands(signature):
+            candidates |= self._buckets.get(band, set())
+        return any(hamming(signature, other) <= self.max_distance for other in candidates)
+
+    def collapse(self, items: Sequence[dict]) -> List[dict]:
+        """Return one representative per near-duplicate group, in input order.
+
+        Representatives get ``duplicate_links`` listing the other members'
+        links. Items need a ``uid`` (as set by ``prefilter_candidates``).
+        Items whose text has fewer than ``MIN_TOKENS`` words pass through
+        untouched.
+        """
+
+        texts = [item_text(item) for item in items]
+        fingerprinted = [index for index, text in enumerate(texts) if len(_WORD_RE.findall(text)) >= MIN_TOKENS]
+        signatures = {index: simhash(texts[index]) for index in fingerprinted}
+        parent = list(range(len(items)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for index in fingerprinted:
+            signature = signatures[index]
+            for band in _bands(signature):
+                for other in buckets[band]:
+                    if find(other) != find(index) and hamming(signature, signatures[other]) <= self.max_distance:
+                        parent[find(index)] = find(other)
+                buckets[band].append(index)
+
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for index in range(len(items)):
+            groups[find(index)].append(index)
+
+        kept: List[Tuple[int, dict]] = []
+        dropped_sent = 0
+        with self._lock:
+            for members in groups.values():
+                if members[0] not in signatures:
+                    kept.append((members[0], items[members[0]]))
+                    continue
+                if any(self._matches_sent(signatures[index]) for index in members):
+                    dropped_sent += len(members)
+                    continue
+                best = max(members, key=lambda index: (_representative_rank(items[index]), -index))
+                representative = dict(items[best])
+                others = [items[index]["link"] for index in members if index != best]
+                if others:
+                    representative["duplicate_links"] = others
+                self._signatures.pop(representative["uid"], None)
+                self._signatures[representative["uid"]] = signatures[best]
+                kept.append((min(members), representative))
+            while len(self._signatures) > MAX_PENDING:
+                self._signatures.pop(next(iter(self._signatures)))
+        kept.sort(key=lambda entry: entry[0])
+
+        LOGGER.info(
+            "Near-duplicate stage saved %s extractions",
+            len(items) - len(kept),
+            extra={"clusters_merged": len(items) - len(kept) - dropped_sent, "already_sent": dropped_sent},
+        )
+        return [item for _, item in kept]
+
+    def record_sent(self, uids: Iterable[str]) -> None:
+        now = time.time()
+        with self._lock:
+            for uid in uids:
+                signature = self._signatures.pop(uid, None)
+                if signature is not None:
+                    self._add_sent(signature, now)
+                    self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            payload = json.dumps([[f"{signature:016x}", sent_at] for signature, sent_at in self._sent.items()])
+            self._dirty = False
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self._sent)
+
+
+__all__ = ["NearDuplicateIndex", "hamming", "item_text", "simhash"]
@@ -5,12 +5,48 @@ import json
 import logging
 import os
 import re
-from typing import Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Sequence, Tuple
 
-import requests
+import numpy as np
+
+from core import http_client
+from core.matcher import KeywordMatcher, join_batch, pattern_rows
+from core.score_cache import DEFAULT_SCORE_CACHE_PATH, ScoreCache
 
 LOGGER = logging.getLogger(__name__)
 KEYWORDS_CACHE: Dict[str, set[str]] | None = None
+MATCHER_CACHE: KeywordMatcher | None = None
+SCORE_CACHE: ScoreCache | None = None
+JUDGE_EXECUTOR: ThreadPoolExecutor | None = None
+JUDGE_WORKERS = 0
+_JUDGE_LOCK = threading.Lock()
+
+# Final scores blend the rule-based score with the LLM's 0-10 judgement.
+RULE_WEIGHT = 0.6
+LLM_WEIGHT = 0.4
+LLM_SCORE_MAX = 10.0
+# Per-request timeout of a single Ollama judgement.
+JUDGE_TIMEOUT = 25.0
+# Judgements queued or running at once across all batches; candidates beyond
+# this are left unjudged, like deadline misses.
+MAX_PENDING_JUDGEMENTS = 256
+_JUDGE_SLOTS = threading.BoundedSemaphore(MAX_PENDING_JUDGEMENTS)
+
+# Rule-based weights, shared by the scalar and batch scorers.
+KEYWORD_WEIGHTS: Dict[str, float] = {"he": 2.0, "en": 1.4, "cities": 1.2, "artists": 2.5, "viral": 1.5}
+NO_KEYWORD_PENALTY = 3.0
+TIME_HINT_BONUS = 1.8
+SHORT_TEXT_CHARS = 120
+SHORT_TEXT_PENALTY = 0.8
+TICKETS_BONUS = 0.8
+OFF_TOPIC_PENALTY = 1.0
+
+TIME_HINT_RE = re.compile(r"\b(today|tonight|this week|tomorrow|היום|הלילה|השבוע|מחר)\b")
+TICKETS_RE = re.compile(r"\b(pre\s?sale|tickets? on sale)\b")
+OFF_TOPIC_RE = re.compile(r"\b(news|politics|finance)\b")
 
 
 def load_keywords(path: str = "queries.json") -> Dict[str, set[str]]:
@@ -29,55 +65,91 @@ def load_keywords(path: str = "queries.json") -> Dict[str, set[str]]:
     return KEYWORDS_CACHE
 
 
-def score_rule_based(title: str, text: str) -> float:
-    keywords = load_keywords()
-    combined = f"{title} {text}".lower()
-    score = 0.0
-
-    hits_he = sum(1 for kw in keywords["he"] if kw in combined)
-    hits_en = sum(1 for kw in keywords["en"] if kw in combined)
-    hits_city = sum(1 for city in keywords["cities"] if city in combined)
-    hits_artist = sum(1 for artist in keywords["artists"] if artist in combined)
-    hits_viral = sum(1 for clue in keywords["viral"] if clue in combined)
+def load_keyword_matcher(path: str = "queries.json") -> KeywordMatcher:
+    """Return the matcher compiled from :func:`load_keywords`, built once."""
+    global MATCHER_CACHE
+    if MATCHER_CACHE is None:
+        MATCHER_CACHE = KeywordMatcher(load_keywords(path))
+        LOGGER.debug("Compiled keyword matcher", extra={"strategy": MATCHER_CACHE.strategy})
+    return MATCHER_CACHE
 
-    if hits_he == 0 and hits_en == 0:
-        score -= 3.0
-    else:
-        score += hits_he * 2.0
-        score += hits_en * 1.4
 
-    score += hits_city * 1.2
-    score += hits_artist * 2.5
-    score += hits_viral * 1.5
+def _rule_columns(items: Sequence[Tuple[str, str]]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Rule-based scores and per-category keyword hits for a whole batch.
 
-    if re.search(r"\b(today|tonight|this week|tomorrow|היום|הלילה|השבוע|מחר)\b", combined):
-        score += 1.8
+    The lower-cased texts are joined once; the keyword matcher and each rule
+    regex make a single pass over the joined text, and the weights are then
+    applied to whole columns.
+    """
 
-    if len(text) < 120:
-        score -= 0.8
+    documents = [f"{title} {text}".lower() for title, text in items]
+    joined = join_batch(documents)
+    hits = load_keyword_matcher().count_batch(documents, joined=joined)
+    short = np.fromiter((len(text) < SHORT_TEXT_CHARS for _, text in items), dtype=bool, count=len(items))
 
-    if re.search(r"\b(pre\s?sale|tickets? on sale)\b", combined):
-        score += 0.8
+    no_keywords = (hits["he"] == 0) & (hits["en"] == 0)
+    scores = np.where(no_keywords, -NO_KEYWORD_PENALTY, 0.0)
+    for group in ("he", "en"):
+        scores += np.where(no_keywords, 0.0, hits[group] * KEYWORD_WEIGHTS[group])
+    for group in ("cities", "artists", "viral"):
+        scores += hits[group] * KEYWORD_WEIGHTS[group]
+    scores += np.where(pattern_rows(TIME_HINT_RE, *joined), TIME_HINT_BONUS, 0.0)
+    scores -= np.where(short, SHORT_TEXT_PENALTY, 0.0)
+    scores += np.where(pattern_rows(TICKETS_RE, *joined), TICKETS_BONUS, 0.0)
+    scores -= np.where(pattern_rows(OFF_TOPIC_RE, *joined), OFF_TOPIC_PENALTY, 0.0)
+    return scores, hits
 
-    if re.search(r"\b(news|politics|finance)\b", combined):
-        score -= 1.0
 
+def score_rule_based(title: str, text: str) -> float:
+    scores, hits = _rule_columns([(title, text)])
+    score = float(scores[0])
     LOGGER.debug(
         "Rule-based score computed",
         extra={
             "title": title[:80],
             "score": score,
-            "hits_he": hits_he,
-            "hits_en": hits_en,
-            "hits_city": hits_city,
-            "hits_artist": hits_artist,
-            "hits_viral": hits_viral,
+            "hits_he": int(hits["he"][0]),
+            "hits_en": int(hits["en"][0]),
+            "hits_city": int(hits["cities"][0]),
+            "hits_artist": int(hits["artists"][0]),
+            "hits_viral": int(hits["viral"][0]),
         },
     )
     return score
 
 
-def ollama_judge(title: str, text: str, ollama_endpoint: str, model: str) -> float:
+def score_rule_based_batch(items: Sequence[Tuple[str, str]]) -> np.ndarray:
+    """Score ``(title, text)`` pairs as :func:`score_rule_based` would, in one pass."""
+
+    scores, _ = _rule_columns(items)
+    LOGGER.debug("Rule-based batch scored", extra={"total": len(items)})
+    return scores
+
+
+def get_score_cache() -> ScoreCache:
+    """Return the shared judge score cache (path from ``EVENTSCOUT_SCORE_CACHE``)."""
+    global SCORE_CACHE
+    if SCORE_CACHE is None:
+        path = os.getenv("EVENTSCOUT_SCORE_CACHE", DEFAULT_SCORE_CACHE_PATH)
+        SCORE_CACHE = ScoreCache(path or None)
+    return SCORE_CACHE
+
+
+def save_score_cache() -> None:
+    cache = get_score_cache()
+    cache.save()
+    LOGGER.info("LLM score cache", extra=cache.stats())
+
+
+def ollama_judge(
+    title: str, text: str, ollama_endpoint: str, model: str, *, timeout: float = JUDGE_TIMEOUT
+) -> float:
+    cache = get_score_cache()
+    cache_key = cache.key(model, title, text)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     prompt = f"""
 Evaluate if this announcement is a high-value post for Israeli party/festival followers.
 Return a JSON object with: score (0-10) and reasons (short, English).
@@ -85,10 +157,10 @@ Title: {title}
 Text: {text[:1200]}
 """
     try:
-        response = requests.post(
+        response = http_client.post(
             f"{ollama_endpoint}/api/generate",
             json={"model": model, "prompt": prompt, "stream": False},
-            timeout=25,
+            timeout=timeout,
         )
         response.raise_for_status()
         payload = response.json().get("response", "")
@@ -98,7 +170,9 @@ Text: {text[:1200]}
         match = _re.search(r"\{.*\}", payload, _re.S)
         if match:
             parsed = _json.loads(match.group(0))
-            return float(parsed.get("score", 0))
+            score = float(parsed.get("score", 0))
+            cache.put(cache_key, score)
+            return score
     except Exception:
         LOGGER.exception("Ollama judge failed", extra={"model": model})
         return 0.0
@@ -108,6 +182,13 @@ Text: {text[:1200]}
 def openrouter_judge(title: str, text: str) -> float:
     from .llm import openrouter_chat
 
+    model = os.getenv("OPENROUTER_MODEL", "google/gemma-2-9b-it:free")
+    cache = get_score_cache()
+    cache_key = cache.key(f"openrouter/{model}", title, text)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     site_url = os.getenv("OPENROUTER_SITE_URL", "")
     app_title = os.getenv("OPENROUTER_APP_TITLE", "EventScout AI")
     prompt = f"""
@@ -121,7 +202,7 @@ Text: {text[:1600]}
         {"role": "user", "content": prompt},
     ]
     try:
-        output = openrouter_chat(message, site_url=site_url, app_title=app_title)
+        output = openrouter_chat(message, model=model, site_url=site_url, app_title=app_title)
         import json as _json
 
         parsed = _json.loads(output.strip())
@@ -130,6 +211,7 @@ Text: {text[:1600]}
             score = 0.0
         if score > 10:
             score = 10.0
+        cache.put(cache_key, score)
         return score
     except Exception:
         LOGGER.exception("OpenRouter judge failed")
@@ -140,7 +222,7 @@ def final_score(title: str, text: str, use_llm: bool, ollama_endpoint: str, mode
     rule_based = score_rule_based(title, text)
     if use_llm:
         llm_score = ollama_judge(title, text, ollama_endpoint, model)
-        final = 0.6 * rule_based + 0.4 * llm_score
+        final = RULE_WEIGHT * rule_based + LLM_WEIGHT * llm_score
         LOGGER.debug(
             "Combined score",
             extra={"rule_based": rule_based, "llm": llm_score, "final": final},
@@ -148,3 +230,171 @@ def final_score(title: str, text: str, use_llm: bool, ollama_endpoint: str, mode
         return final
     LOGGER.debug("Rule-based only score", extra={"score": rule_based})
     return rule_based
+
+
+def get_judge_executor(concurrency: int) -> ThreadPoolExecutor:
+    """Return the shared judge pool, rebuilt only if ``concurrency`` changes.
+
+    One pool serves every batch, so requests abandoned at a batch deadline
+    keep occupying its workers instead of piling up in fresh pools.
+    """
+    global JUDGE_EXECUTOR, JUDGE_WORKERS
+    workers = max(1, concurrency)
+    with _JUDGE_LOCK:
+        if JUDGE_EXECUTOR is None or JUDGE_WORKERS != workers:
+            if JUDGE_EXECUTOR is not None:
+                JUDGE_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+            JUDGE_EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eventscout-llm")
+            JUDGE_WORKERS = workers
+        return JUDGE_EXECUTOR
+
+
+def _judge_until(deadline_at: float, title: str, text: str, ollama_endpoint: str, model: str) -> float | None:
+    remaining = deadline_at - time.monotonic()
+    if remaining <= 0:
+        return None
+    return ollama_judge(title, text, ollama_endpoint, model, timeout=min(JUDGE_TIMEOUT, remaining))
+
+
+def ollama_judge_batch(
+    items: Sequence[Tuple[str, str]],
+    ollama_endpoint: str,
+    model: str,
+    *,
+    concurrency: int = 4,
+    deadline: float = 120.0,
+) -> List[float | None]:
+    """Judge many ``(title, text)`` pairs with bounded concurrency.
+
+    Scores come back in input order. Pairs still pending when ``deadline``
+    seconds have passed are reported as ``None``. Their queued requests are
+    cancelled, and running ones time out by the deadline on their own. Pairs
+    that find :data:`MAX_PENDING_JUDGEMENTS` already in flight are reported as
+    ``None`` straight away.
+    """
+
+    if not items:
+        return []
+    executor = get_judge_executor(concurrency)
+    deadline_at = time.monotonic() + deadline
+    futures = []
+    for title, text in items:
+        if not _JUDGE_SLOTS.acquire(blocking=False):
+            futures.append(None)
+            continue
+        future = executor.submit(_judge_until, deadline_at, title, text, ollama_endpoint, model)
+        future.add_done_callback(lambda _: _JUDGE_SLOTS.release())
+        futures.append(future)
+    submitted = [future for future in futures if future is not None]
+    done, pending = wait(submitted, timeout=deadline)
+    for future in pending:
+        future.cancel()
+    skipped = len(futures) - len(submitted)
+    if pending or skipped:
+        LOGGER.warning(
+            "LLM batch deadline reached",
+            extra={"deadline": deadline, "pending": len(pending), "skipped": skipped, "total": len(items)},
+        )
+    return [future.result() if future in done else None for future in futures]
+
+
+def max_reachable_score(rule_based: float) -> float:
+    """Return the best final score a candidate could get from a perfect LLM verdict."""
+    return RULE_WEIGHT * rule_based + LLM_WEIGHT * LLM_SCORE_MAX
+
+
+def final_score_batch(
+    items: Sequence[Tuple[str, str]],
+    use_llm: bool,
+    ollama_endpoint: str,
+    model: str,
+    *,
+    concurrency: int = 4,
+    deadline: float = 120.0,
+    gate_threshold: float | None = None,
+    always_judge: Sequence[bool] | None = None,
+    rule_scores: Sequence[float] | None = None,
+    model_scores: Sequence[float] | None = None,
+    model_gate: float | None = None,
+) -> List[float]:
+    """Batch variant of :func:`final_score`.
+
+    Candidates the LLM did not judge before the deadline keep their rule-based
+    score, exactly as if LLM scoring were disabled for them. With
+    ``gate_threshold`` set, candidates whose :func:`max_reachable_score` is
+    below it are not sent to the LLM at all (unless flagged in
+    ``always_judge``) and are blended as if the LLM had answered 0, so their
+    scores stay comparable with judged ones. ``rule_scores``
+    supplies rule-based scores already computed elsewhere (e.g. in worker
+    processes over the full article text); ``None`` entries are computed here.
+
+    ``model_scores`` (0-10, from :class:`core.relevance.RelevanceModel`) are a
+    middle tier: candidates left without an LLM verdict blend the model score
+    in its place, and with ``model_gate`` set, candidates the model scores
+    below it are not sent to the LLM (unless flagged in ``always_judge``).
+    """
+
+    if rule_scores is None:
+        rule_scores = [None] * len(items)
+    missing = [index for index, score in enumerate(rule_scores) if score is None]
+    rule_scores = list(rule_scores)
+    if missing:
+        for index, score in zip(missing, score_rule_based_batch([items[index] for index in missing])):
+            rule_scores[index] = float(score)
+    if model_scores is None:
+        model_scores = [None] * len(items)
+    if not use_llm:
+        return [
+            rule_based if model_score is None else RULE_WEIGHT * rule_based + LLM_WEIGHT * model_score
+            for rule_based, model_score in zip(rule_scores, model_scores)
+        ]
+
+    judged_indexes = [
+        index
+        for index, (rule_based, model_score) in enumerate(zip(rule_scores, model_scores))
+        if (always_judge is not None and always_judge[index])
+        or (
+            (gate_threshold is None or max_reachable_score(rule_based) >= gate_threshold)
+            and (model_gate is None or model_score is None or model_score >= model_gate)
+        )
+    ]
+    if gate_threshold is not None or model_gate is not None:
+        LOGGER.info(
+            "LLM pre-gate skipped %s of %s calls",
+            len(items) - len(judged_indexes),
+            len(items),
+            extra={"gate_threshold": gate_threshold, "model_gate": model_gate},
+        )
+
+    batch_scores = ollama_judge_batch(
+        [items[index] for index in judged_indexes],
+        ollama_endpoint,
+        model,
+        concurrency=concurrency,
+        deadline=deadline,
+    )
+    llm_scores: List[float | None] = [None] * len(items)
+    for index, llm_score in zip(judged_indexes, batch_scores):
+        llm_scores[index] = llm_score
+
+    # Gated candidates get a blended score with a 0 verdict so they share the
+    # judged candidates' scale; only deadline misses fall back to the rule score.
+    judged = set(judged_indexes)
+    second = np.full(len(items), np.nan)
+    for index, (llm_score, model_score) in enumerate(zip(llm_scores, model_scores)):
+        if llm_score is not None:
+            second[index] = llm_score
+        elif model_score is not None:
+            second[index] = model_score
+        elif index not in judged:
+            second[index] = 0.0
+    rules = np.asarray(rule_scores, dtype=np.float64)
+    finals = np.where(np.isnan(second), rules, RULE_WEIGHT * rules + LLM_WEIGHT * second).tolist()
+    LOGGER.debug(
+        "Batch scores combined",
+        extra={
+            "total": len(items),
+            "llm_scored": sum(1 for score in llm_scores if score is not None),
+        },
+    )
+    return finals
@@ -0,0 +1,187 @@
+"""Learned relevance scorer trained from the history of sent and skipped candidates."""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import time
+from typing import Iterable, List, Sequence, Tuple
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from core.score_cache import TEXT_PREFIX_CHARS
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = "history.jsonl"
+DEFAULT_MODEL_PATH = "relevance_model.joblib"
+MODEL_VERSION = 1
+MIN_EXAMPLES = 20
+# The history is rotated to ``<path>.1`` past this size, so at most two files exist.
+MAX_HISTORY_BYTES = 16 * 1024 * 1024
+# Model scores use the LLM's 0-10 scale so they can stand in for its verdict.
+MODEL_SCORE_MAX = 10.0
+
+
+def _document(title: str, text: str) -> str:
+    return f"{title}\n{text[:TEXT_PREFIX_CHARS]}"
+
+
+def _rotate(path: str) -> None:
+    try:
+        if os.path.getsize(path) < MAX_HISTORY_BYTES:
+            return
+    except OSError:
+        return
+    os.replace(path, f"{path}.1")
+
+
+def record_history(path: str, candidates: Iterable, sent_uids: Iterable[str]) -> int:
+    """Append one labelled line per scored candidate to ``path``; return the count."""
+    sent = set(sent_uids)
+    now = time.time()
+    lines = [
+        json.dumps(
+            {
+                "uid": candidate.uid,
+                "title": candidate.title,
+                "text": candidate.text[:TEXT_PREFIX_CHARS],
+                "score": candidate.score,
+                "sent": candidate.uid in sent,
+                "ts": round(now),
+            },
+            ensure_ascii=False,
+        )
+        for candidate in candidates
+    ]
+    if lines:
+        _rotate(path)
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write("\n".join(lines) + "\n")
+    return len(lines)
+
+
+def load_history(path: str) -> List[Tuple[str, bool]]:
+    """Return ``(document, sent)`` pairs, one per uid; a uid ever sent counts as sent.
+
+    The rotated ``<path>.1`` is read too, when present.
+    """
+    examples: dict[str, Tuple[str, bool]] = {}
+    rotated = f"{path}.1"
+    for source in ([rotated] if os.path.exists(rotated) else []) + [path]:
+        with open(source, "r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                uid = record.get("uid")
+                if not uid:
+                    continue
+                previous = examples.get(uid)
+                sent = bool(record.get("sent")) or (previous is not None and previous[1])
+                examples[uid] = (_document(record.get("title", ""), record.get("text", "")), sent)
+    return list(examples.values())
+
+
+class RelevanceModel:
+    """Hashed TF-IDF features plus logistic regression over title and text.
+
+    Hashing keeps the model free of a stored vocabulary, so the serialized file
+    stays small and unseen words never break scoring. :meth:`score_batch`
+    vectorizes a whole batch in one call and returns scores on the 0-10 scale.
+    """
+
+    def __init__(self, pipeline: Pipeline, *, examples: int = 0, trained_at: float = 0.0) -> None:
+        self.pipeline = pipeline
+        self.examples = examples
+        self.trained_at = trained_at
+
+    @classmethod
+    def train(cls, examples: Sequence[Tuple[str, bool]]) -> "RelevanceModel":
+        labels = [sent for _, sent in examples]
+        if len(examples) < MIN_EXAMPLES or len(set(labels)) < 2:
+            raise ValueError(
+                f"Need at least {MIN_EXAMPLES} examples with both sent and skipped candidates, got {len(examples)}"
+            )
+        pipeline = Pipeline(
+            [
+                ("hash", HashingVectorizer(n_features=2**18, ngram_range=(1, 2), alternate_sign=False, norm=None)),
+                ("tfidf", TfidfTransformer(sublinear_tf=True)),
+                ("clf", LogisticRegression(class_weight="balanced", max_iter=1000)),
+            ]
+        )
+        pipeline.fit([document for document, _ in examples], labels)
+        return cls(pipeline, examples=len(examples), trained_at=time.time())
+
+    def score_batch(self, items: Sequence[Tuple[str, str]]) -> np.ndarray:
+        """Score ``(title, text)`` pairs; higher means more like what was sent."""
+        if not items:
+            return np.zeros(0)
+        documents = [_document(title, text) for title, text in items]
+        return self.pipeline.predict_proba(documents)[:, 1] * MODEL_SCORE_MAX
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        joblib.dump(
+            {
+                "version": MODEL_VERSION,
+                "pipeline": self.pipeline,
+                "examples": self.examples,
+                "trained_at": self.trained_at,
+            },
+            tmp_path,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "RelevanceModel | None":
+        """Load a model written by :meth:`save`, or return ``None`` if unusable.
+
+        The file is unpickled, so only load models this bot trained itself.
+        """
+        if not os.path.exists(path):
+            LOGGER.warning("Relevance model not found", extra={"path": path})
+            return None
+        try:
+            payload = joblib.load(path)
+        except Exception:
+            LOGGER.exception("Ignoring unreadable relevance model", extra={"path": path})
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != MODEL_VERSION:
+            LOGGER.warning("Ignoring relevance model with unknown version", extra={"path": path})
+            return None
+        model = cls(payload["pipeline"], examples=payload["examples"], trained_at=payload["trained_at"])
+        LOGGER.info("Loaded relevance model", extra={"path": path, "examples": model.examples})
+        return model
+
+
+def train_from_history(history_path: str = DEFAULT_HISTORY_PATH, model_path: str = DEFAULT_MODEL_PATH) -> RelevanceModel:
+    model = RelevanceModel.train(load_history(history_path))
+    model.save(model_path)
+    LOGGER.info("Trained relevance model", extra={"examples": model.examples, "path": model_path})
+    return model
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train the relevance model from the candidate history")
+    parser.add_argument("--history", default=DEFAULT_HISTORY_PATH, help="History written by the bot")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Where to write the trained model")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    try:
+        train_from_history(args.history, args.model)
+    except (OSError, ValueError) as exc:
+        raise SystemExit(str(exc))
+
+
+__all__ = ["RelevanceModel", "load_history", "record_history", "train_from_history"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Adaptive per-source polling schedule for long-running EventScout loops."""
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterable, List, Sequence
+
+from core import http_client
+from core.collect import SourceJob, SourceResult
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BASE_INTERVAL = 15 * 60.0
+DEFAULT_MIN_INTERVAL = 5 * 60.0
+DEFAULT_MAX_INTERVAL = 6 * 60 * 60.0
+# A productive poll shortens the interval, an empty one stretches it.
+SPEEDUP = 0.7
+SLOWDOWN = 1.5
+ERROR_BACKOFF = 2.0
+RATE_LIMIT_BACKOFF = 4.0
+# How many recently yielded links are remembered per source to tell new items
+# from ones the source keeps returning.
+RECENT_LINKS = 500
+
+
+@dataclass
+class SourceSchedule:
+    """Polling state of one source."""
+
+    job: SourceJob
+    interval: float
+    next_due: float
+    failures: int = 0
+    polls: int = 0
+    new_items: int = 0
+    _recent: Deque[str] = field(default_factory=lambda: deque(maxlen=RECENT_LINKS))
+    _recent_set: set[str] = field(default_factory=set)
+
+    def count_new(self, links: Iterable[str]) -> int:
+        new = 0
+        for link in links:
+            if link in self._recent_set:
+                continue
+            new += 1
+            if len(self._recent) == self._recent.maxlen:
+                self._recent_set.discard(self._recent[0])
+            self._recent.append(link)
+            self._recent_set.add(link)
+        return new
+
+
+class AdaptiveScheduler:
+    """Decide which sources to poll next and when a digest should go out.
+
+    Every source starts at ``base_interval``. After each poll the interval is
+    multiplied by :data:`SPEEDUP` if the source produced links it had not
+    returned before and by :data:`SLOWDOWN` otherwise, within
+    ``[min_interval, max_interval]``. Failures back off exponentially, and a
+    ``429`` backs off harder and honours ``Retry-After``.
+
+    A digest is due once ``digest_threshold`` candidates are ready to send, or
+    when anything is pending and ``max_digest_interval`` has passed since the
+    previous digest.
+    """
+
+    def __init__(
+        self,
+        jobs: Sequence[SourceJob],
+        *,
+        base_interval: float = DEFAULT_BASE_INTERVAL,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        digest_threshold: int = 6,
+        max_digest_interval: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.base_interval = self._clamp(base_interval)
+        self.digest_threshold = max(1, digest_threshold)
+        self.max_digest_interval = max_digest_interval if max_digest_interval is not None else 4 * base_interval
+        self.clock = clock
+        now = clock()
+        self.last_digest = now
+        self.sources: Dict[str, SourceSchedule] = {}
+        for job in jobs:
+            # Everything is due immediately on start-up.
+            self.sources[f"{job.kind}:{job.key}"] = SourceSchedule(job=job, interval=self.base_interval, next_due=now)
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def due(self, now: float | None = None) -> List[SourceJob]:
+        now = self.clock() if now is None else now
+        return [schedule.job for schedule in self.sources.values() if schedule.next_due <= now]
+
+    def next_wakeup(self) -> float:
+        """Clock time at which the next source becomes due."""
+        return min((schedule.next_due for schedule in self.sources.values()), default=self.clock())
+
+    def record(self, result: SourceResult, *, now: float | None = None) -> int:
+        """Update the schedule of ``result.job``; return how many links were new."""
+        now = self.clock() if now is None else now
+        schedule = self.sources[f"{result.job.kind}:{result.job.key}"]
+        schedule.polls += 1
+        new = 0
+        if result.error is not None:
+            schedule.failures += 1
+            if http_client.is_rate_limited(result.error):
+                delay = schedule.interval * RATE_LIMIT_BACKOFF
+                requested = getattr(result.error, "retry_after", None)
+                if requested is None:
+                    requested = http_client.retry_after(getattr(result.error, "response", None))
+                if requested is not None:
+                    delay = max(delay, requested)
+            else:
+                delay = schedule.interval * ERROR_BACKOFF ** schedule.failures
+            # Back off without changing the learned interval, so one bad poll
+            # does not permanently slow the source down.
+            delay = min(self.max_interval, delay)
+        else:
+            schedule.failures = 0
+            new = schedule.count_new(item.get("link", "") for item in result.items)
+            schedule.new_items += new
+            schedule.interval = self._clamp(schedule.interval * (SPEEDUP if new else SLOWDOWN))
+            delay = schedule.interval
+        schedule.next_due = now + delay
+        LOGGER.debug(
+            "Source rescheduled",
+            extra={
+                "kind": result.job.kind,
+                "key": result.job.key,
+                "new_items": new,
+                "failures": schedule.failures,
+                "next_poll_in": round(delay, 1),
+            },
+        )
+        return new
+
+    def digest_due(self, ready: int, *, pending: int | None = None, now: float | None = None) -> bool:
+        """``ready`` candidates count towards the threshold; any ``pending`` ones
+        are flushed once ``max_digest_interval`` has passed."""
+        pending = ready if pending is None else pending
+        if pending <= 0:
+            return False
+        now = self.clock() if now is None else now
+        return ready >= self.digest_threshold or now - self.last_digest >= self.max_digest_interval
+
+    def digest_sent(self, *, now: float | None = None) -> None:
+        self.last_digest = self.clock() if now is None else now
+
+
+__all__ = ["AdaptiveScheduler", "SourceSchedule"]
@@ -0,0 +1,125 @@
+"""Persistent cache of LLM judge scores keyed by model and content."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from core.utils import norm_text
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SCORE_CACHE_PATH = "llm_scores.json"
+DEFAULT_TTL_SECONDS = 14 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+# Judges only ever see the start of the article, so hashing more is wasted work.
+TEXT_PREFIX_CHARS = 2000
+
+
+class ScoreCache:
+    """LRU + TTL cache of judge scores persisted as a JSON file.
+
+    Keys combine the model name with a hash of the normalised title and text,
+    so the same article reached through a different feed or redirect URL hits
+    the cache. Entries are kept in least-recently-used order; :meth:`save`
+    writes them atomically.
+    """
+
+    def __init__(
+        self,
+        path: str | None = DEFAULT_SCORE_CACHE_PATH,
+        *,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def key(model: str, title: str, text: str) -> str:
+        content = f"{norm_text(title).lower()}\n{norm_text(text[:TEXT_PREFIX_CHARS]).lower()}"
+        digest = hashlib.sha1(content.encode("utf-8")).hexdigest()[:20]
+        return f"{model}:{digest}"
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+        except (OSError, ValueError):
+            LOGGER.warning("Ignoring unreadable score cache", extra={"path": self.path})
+            return
+        if isinstance(raw, dict):
+            raw = list(raw.items())
+        if not isinstance(raw, list):
+            LOGGER.warning("Ignoring unreadable score cache", extra={"path": self.path})
+            return
+        now = time.time()
+        skipped = 0
+        for row in raw:
+            try:
+                key, (score, stored_at) = row
+                entry = (float(score), float(stored_at))
+            except (TypeError, ValueError):
+                skipped += 1
+                continue
+            if isinstance(key, str) and now - entry[1] < self.ttl:
+                self._entries[key] = entry
+        if skipped:
+            LOGGER.warning("Skipped malformed score cache rows", extra={"path": self.path, "rows": skipped})
+
+    def get(self, key: str) -> float | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] >= self.ttl:
+                del self._entries[key]
+                self._dirty = True
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, score: float) -> None:
+        with self._lock:
+            self._entries[key] = (float(score), time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            payload = [[key, list(entry)] for key, entry in self._entries.items()]
+            self._dirty = False
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ["ScoreCache", "DEFAULT_SCORE_CACHE_PATH"]
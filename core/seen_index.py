@@ -0,0 +1,215 @@
+"""Compact in-memory index of seen ids with a Bloom filter in front."""
+from __future__ import annotations
+
+import math
+import threading
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from core.utils import hash_id
+
+DEFAULT_CAPACITY = 1 << 16
+DEFAULT_ERROR_RATE = 0.001
+# New ids are buffered in a small set and folded into the sorted array in bulk.
+MERGE_THRESHOLD = 4096
+
+
+def is_digest_id(uid: str) -> bool:
+    """True for ids in :func:`core.utils.hash_id` form (16 lower-case hex chars)."""
+    if len(uid) != 16:
+        return False
+    try:
+        return f"{int(uid, 16):016x}" == uid
+    except ValueError:
+        return False
+
+
+def _split(uids: Iterable[str]) -> tuple[np.ndarray, set[str]]:
+    digests: list[int] = []
+    raw: set[str] = set()
+    for uid in uids:
+        if is_digest_id(uid):
+            digests.append(int(uid, 16))
+        else:
+            raw.add(uid)
+    return np.unique(np.array(digests, dtype=np.uint64)), raw
+
+
+class BloomFilter:
+    """Bit-array Bloom filter over 64-bit digests using double hashing."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE) -> None:
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        bits = math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = max(64, bits)
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        # A bytearray keeps single-bit probes cheap; the numpy view is used for
+        # vectorised bulk inserts over the same memory.
+        self._bits = bytearray((self.size + 7) // 8)
+        self._view = np.frombuffer(self._bits, dtype=np.uint8)
+
+    def _positions(self, digest: int) -> Iterator[int]:
+        # The digests are already uniformly distributed SHA-1 prefixes, so the
+        # two halves serve directly as the double-hashing seeds.
+        first = digest & 0xFFFFFFFF
+        step = (digest >> 32) | 1
+        for index in range(self.hashes):
+            yield (first + index * step) % self.size
+
+    def add(self, digest: int) -> None:
+        bits = self._bits
+        for position in self._positions(digest):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def add_many(self, digests: np.ndarray) -> None:
+        if not len(digests):
+            return
+        first = (digests & np.uint64(0xFFFFFFFF)).astype(np.uint64)
+        step = (digests >> np.uint64(32)) | np.uint64(1)
+        size = np.uint64(self.size)
+        for index in range(self.hashes):
+            positions = (first + np.uint64(index) * step) % size
+            np.bitwise_or.at(
+                self._view,
+                (positions >> np.uint64(3)).astype(np.intp),
+                (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)),
+            )
+
+    def __contains__(self, digest: int) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class CompactSeenIndex:
+    """Set-like container of ``hash_id`` strings stored as packed digests.
+
+    Ids live in a sorted ``uint64`` array (8 bytes each) plus a small buffer
+    of recent additions. A Bloom filter answers most negative lookups without
+    touching the array; positives are confirmed by binary search. The filter
+    doubles its capacity whenever the index outgrows it. Ids not in
+    ``hash_id`` form (legacy or hand-written entries) are kept verbatim in a
+    side set so they read back unchanged.
+
+    All methods take an internal lock, so a collector thread can query the
+    index while a delivery thread adds to it.
+    """
+
+    def __init__(
+        self,
+        uids: Iterable[str] = (),
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ) -> None:
+        self.error_rate = error_rate
+        self._sorted = np.empty(0, dtype=np.uint64)
+        self._recent: set[int] = set()
+        self._raw: set[str] = set()
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._lock = threading.RLock()
+        self.update(uids)
+
+    def _in_sorted(self, digest: int) -> bool:
+        index = int(np.searchsorted(self._sorted, np.uint64(digest)))
+        return index < len(self._sorted) and int(self._sorted[index]) == digest
+
+    def _contains_digest(self, digest: int) -> bool:
+        if digest not in self._bloom:
+            return False
+        return digest in self._recent or self._in_sorted(digest)
+
+    def __contains__(self, uid: object) -> bool:
+        if not isinstance(uid, str):
+            return False
+        if not is_digest_id(uid):
+            return uid in self._raw
+        with self._lock:
+            return self._contains_digest(int(uid, 16))
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._recent) + len(self._raw)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            digests = self._sorted.tolist() + list(self._recent)
+            raw = list(self._raw)
+        for digest in digests:
+            yield f"{digest:016x}"
+        yield from raw
+
+    def _ensure_capacity(self, extra: int) -> None:
+        needed = len(self._sorted) + len(self._recent) + extra
+        if needed <= self._bloom.capacity:
+            return
+        capacity = self._bloom.capacity
+        while capacity < needed:
+            capacity *= 2
+        self._bloom = BloomFilter(capacity, self.error_rate)
+        self._bloom.add_many(self._sorted)
+        self._bloom.add_many(np.fromiter(self._recent, dtype=np.uint64, count=len(self._recent)))
+
+    def _insert_sorted(self, digests: np.ndarray) -> None:
+        # ``digests`` must be sorted and disjoint from the array; a positional
+        # insert is a single O(n) copy instead of a full re-sort or hash pass.
+        if len(digests):
+            self._sorted = np.insert(self._sorted, np.searchsorted(self._sorted, digests), digests)
+
+    def _merge_recent(self) -> None:
+        if not self._recent:
+            return
+        recent = np.sort(np.fromiter(self._recent, dtype=np.uint64, count=len(self._recent)))
+        self._insert_sorted(recent)
+        self._recent.clear()
+
+    def add(self, uid: str) -> None:
+        if not is_digest_id(uid):
+            with self._lock:
+                self._raw.add(uid)
+            return
+        digest = int(uid, 16)
+        with self._lock:
+            if self._contains_digest(digest):
+                return
+            self._ensure_capacity(1)
+            self._recent.add(digest)
+            self._bloom.add(digest)
+            if len(self._recent) >= MERGE_THRESHOLD:
+                self._merge_recent()
+
+    def update(self, uids: Iterable[str]) -> None:
+        digests, raw = _split(uids)
+        with self._lock:
+            self._raw |= raw
+            if not len(digests):
+                return
+            self._merge_recent()
+            new = np.setdiff1d(digests, self._sorted, assume_unique=True)
+            self._ensure_capacity(len(new))
+            self._bloom.add_many(new)
+            self._insert_sorted(new)
+
+    def difference_update(self, uids: Iterable[str]) -> None:
+        """Remove ``uids``; the Bloom filter is rebuilt since bits cannot be cleared."""
+        digests, raw = _split(uids)
+        with self._lock:
+            self._raw -= raw
+            if not len(digests):
+                return
+            self._merge_recent()
+            self._sorted = np.setdiff1d(self._sorted, digests, assume_unique=True)
+            self._bloom = BloomFilter(max(self._bloom.capacity, len(self._sorted)), self.error_rate)
+            self._bloom.add_many(self._sorted)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the array and the Bloom filter."""
+        return int(self._sorted.nbytes) + self._bloom.nbytes + 8 * len(self._recent) + sum(map(len, self._raw))
+
+
+__all__ = ["BloomFilter", "CompactSeenIndex", "is_digest_id"]
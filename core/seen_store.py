@@ -0,0 +1,210 @@
+"""Pluggable storage for the ids of candidates that were already sent."""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
+
+from core.seen_index import CompactSeenIndex
+from core.utils import load_seen, save_seen
+
+LOGGER = logging.getLogger(__name__)
+
+SEEN_BACKENDS = ("json", "sqlite")
+DEFAULT_JSON_PATH = "seen.json"
+DEFAULT_SQLITE_PATH = "seen.db"
+
+
+class SeenStore(ABC):
+    """Set-like container of seen ids with explicit persistence.
+
+    ``enrich_candidates`` and ``prefilter_candidates`` only rely on ``in`` and
+    ``add``; :meth:`flush` persists additions made since the last flush. Ids are
+    held in memory by a :class:`~core.seen_index.CompactSeenIndex`.
+    """
+
+    @abstractmethod
+    def __contains__(self, uid: object) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, uid: str) -> None:
+        raise NotImplementedError
+
+    def update(self, uids: Iterable[str]) -> None:
+        for uid in uids:
+            self.add(uid)
+
+    @abstractmethod
+    def flush(self) -> None:
+        raise NotImplementedError
+
+    def expire(self) -> int:
+        """Drop ids older than the configured TTL; return how many were removed."""
+        return 0
+
+    def close(self) -> None:
+        self.flush()
+
+
+class JsonSeenStore(SeenStore):
+    """The original ``seen.json`` format: a sorted list rewritten on flush.
+
+    Safe to share between threads (the daemon's collector reads while its
+    delivery stage adds and flushes).
+    """
+
+    def __init__(self, path: str = DEFAULT_JSON_PATH) -> None:
+        self.path = path
+        self._ids = CompactSeenIndex(load_seen(path))
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __contains__(self, uid: object) -> bool:
+        return uid in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def add(self, uid: str) -> None:
+        with self._lock:
+            if uid not in self._ids:
+                self._ids.add(uid)
+                self._dirty = True
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                save_seen(self._ids, self.path)
+                self._dirty = False
+
+
+class SqliteSeenStore(SeenStore):
+    """SQLite-backed store with incremental inserts and TTL expiry.
+
+    Ids are inserted in a single transaction per :meth:`flush`, so a crash never
+    leaves a half-written file behind. On first open an existing ``seen.json``
+    is imported once and recorded in the ``migrations`` table.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_SQLITE_PATH,
+        *,
+        ttl_days: float = 0,
+        legacy_json_path: str | None = DEFAULT_JSON_PATH,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_days * 24 * 60 * 60
+        self._lock = threading.Lock()
+        self._pending: dict[str, float] = {}
+        self._ids = CompactSeenIndex()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen (uid TEXT PRIMARY KEY, added_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS seen_added_at ON seen (added_at)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY, applied_at REAL)")
+        if legacy_json_path:
+            self._migrate_json(legacy_json_path)
+        self.expire()
+        self._ids.update(row[0] for row in self._conn.execute("SELECT uid FROM seen"))
+
+    def _migrate_json(self, json_path: str) -> None:
+        name = f"import:{os.path.abspath(json_path)}"
+        applied = self._conn.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone()
+        if applied or not os.path.exists(json_path):
+            return
+        legacy_ids = load_seen(json_path)
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen (uid, added_at) VALUES (?, ?)",
+                ((uid, now) for uid in legacy_ids),
+            )
+            self._conn.execute("INSERT INTO migrations (name, applied_at) VALUES (?, ?)", (name, now))
+        LOGGER.info("Imported %s seen ids from %s", len(legacy_ids), json_path)
+
+    def __contains__(self, uid: object) -> bool:
+        return uid in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def add(self, uid: str) -> None:
+        with self._lock:
+            if uid in self._ids:
+                return
+            self._ids.add(uid)
+            self._pending[uid] = time.time()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending = list(self._pending.items())
+            self._pending.clear()
+            if pending:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO seen (uid, added_at) VALUES (?, ?)", pending
+                    )
+        self.expire()
+
+    def expire(self) -> int:
+        if self.ttl_seconds <= 0:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock, self._conn:
+            expired = [row[0] for row in self._conn.execute("SELECT uid FROM seen WHERE added_at < ?", (cutoff,))]
+            if not expired:
+                return 0
+            self._conn.execute("DELETE FROM seen WHERE added_at < ?", (cutoff,))
+        self._ids.difference_update(expired)
+        LOGGER.info("Expired %s seen ids", len(expired))
+        return len(expired)
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+
+def open_seen_store(
+    backend: str = "json",
+    path: str | None = None,
+    *,
+    ttl_days: float = 0,
+) -> SeenStore:
+    """Open the configured seen-id backend."""
+    if backend == "json":
+        return JsonSeenStore(path or DEFAULT_JSON_PATH)
+    if backend == "sqlite":
+        return SqliteSeenStore(path or DEFAULT_SQLITE_PATH, ttl_days=ttl_days)
+    raise ValueError(f"Unknown seen store backend: {backend}")
+
+
+__all__ = [
+    "JsonSeenStore",
+    "SEEN_BACKENDS",
+    "SeenStore",
+    "SqliteSeenStore",
+    "open_seen_store",
+]
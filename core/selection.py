@@ -0,0 +1,81 @@
+"""Columnar view of scored candidates for threshold-based selection."""
+from __future__ import annotations
+
+from typing import Generic, List, Protocol, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+
+class _Scored(Protocol):
+    uid: str
+    score: float
+    videos: List[str]
+
+
+T = TypeVar("T", bound=_Scored)
+
+
+class CandidateBatch(Generic[T]):
+    """Candidates held as score / has-video / uid columns, sorted once.
+
+    Rows are ordered by descending score, ties keeping input order (the same
+    order as a stable ``sort(key=score, reverse=True)``). The number of
+    candidates at or above any threshold is a binary search over that order,
+    so answering "top-N at threshold t" for many thresholds never re-filters
+    or re-sorts the candidate list.
+    """
+
+    def __init__(self, candidates: Sequence[T]) -> None:
+        self.candidates = list(candidates)
+        scores = np.fromiter((c.score for c in self.candidates), dtype=np.float64, count=len(self.candidates))
+        self.order = np.argsort(-scores, kind="stable")
+        self.scores = scores[self.order]
+        self.has_video = np.fromiter(
+            (bool(self.candidates[index].videos) for index in self.order), dtype=bool, count=len(self.candidates)
+        )
+        self.uids = np.array([self.candidates[index].uid for index in self.order], dtype=object)
+        # Ascending copy of the negated scores for searchsorted.
+        self._keys = -self.scores
+        self._video_ranks = np.flatnonzero(self.has_video)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def count_at(self, threshold: float) -> int:
+        """Number of candidates scoring at least ``threshold``."""
+        return int(np.searchsorted(self._keys, -threshold, side="right"))
+
+    def first_video_rank(self, start: int, stop: int) -> int | None:
+        """Rank of the best video candidate within ``[start, stop)``, if any."""
+        position = int(np.searchsorted(self._video_ranks, start))
+        if position < len(self._video_ranks) and self._video_ranks[position] < stop:
+            return int(self._video_ranks[position])
+        return None
+
+    def rows(self, ranks: Sequence[int] | np.ndarray) -> List[T]:
+        return [self.candidates[self.order[rank]] for rank in ranks]
+
+    def top(self, threshold: float, limit: int) -> List[T]:
+        """Best ``limit`` candidates scoring at least ``threshold``."""
+        return self.rows(range(min(self.count_at(threshold), max(limit, 0))))
+
+    def top_with_video(self, threshold: float, limit: int) -> Tuple[List[T], bool] | None:
+        """Top-``limit`` at ``threshold`` including a video, or ``None``.
+
+        If the plain top-N has no video, the best video candidate below the
+        cut replaces the lowest-ranked pick, as long as it still clears
+        ``threshold``; the flag tells whether that promotion happened.
+        """
+        count = self.count_at(threshold)
+        cut = min(count, max(limit, 0))
+        if self.first_video_rank(0, cut) is not None:
+            return self.rows(range(cut)), False
+        video = self.first_video_rank(cut, count)
+        if video is None:
+            return None
+        if limit <= 0:
+            return [], True
+        return self.rows([*range(cut - 1), video]), True
+
+
+__all__ = ["CandidateBatch"]
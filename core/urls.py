@@ -0,0 +1,169 @@
+"""URL canonicalisation used to deduplicate candidates before extraction."""
+from __future__ import annotations
+
+import base64
+import binascii
+import logging
+import urllib.parse
+
+LOGGER = logging.getLogger(__name__)
+
+# Query parameters that only carry campaign/referral tracking information.
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "ref_src",
+    "ref_url",
+    "oc",
+    "si",
+    "spm",
+    "cmpid",
+    "ocid",
+    "_ga",
+}
+TRACKING_PREFIXES = ("utm_", "at_", "pk_")
+GOOGLE_REDIRECT_HOSTS = {"google.com", "www.google.com"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+_ARTICLE_PATH_PREFIXES = ("/rss/articles/", "/articles/", "/read/")
+# Protobuf framing around the URL in legacy article ids.
+_ID_PREFIX = b"\x08\x13\x22"
+_ID_SUFFIX = b"\xd2\x01\x00"
+# Newer ids wrap an opaque token instead of the URL; they need an online lookup.
+_OPAQUE_TOKEN_PREFIX = b"AU_yqL"
+
+
+def _is_tracking_param(name: str) -> bool:
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def article_id(link: str) -> str | None:
+    """Return the Google News article id in ``link``, if it has one."""
+    parsed = urllib.parse.urlparse(link)
+    if not parsed.netloc.endswith("news.google.com"):
+        return None
+    for prefix in _ARTICLE_PATH_PREFIXES:
+        if parsed.path.startswith(prefix):
+            return parsed.path[len(prefix):].split("/", 1)[0] or None
+    return None
+
+
+def decode_article_id(value: str) -> str | None:
+    """Decode the destination URL embedded in a ``CBM...`` article id offline.
+
+    Returns ``None`` for ids that only carry an opaque token.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    if raw.startswith(_ID_PREFIX):
+        raw = raw[len(_ID_PREFIX):]
+    if raw.endswith(_ID_SUFFIX):
+        raw = raw[: -len(_ID_SUFFIX)]
+    # The URL is a length-prefixed (varint) protobuf string.
+    length = shift = offset = 0
+    while offset < len(raw):
+        byte = raw[offset]
+        offset += 1
+        length |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            break
+    payload = raw[offset : offset + length]
+    if payload.startswith(_OPAQUE_TOKEN_PREFIX):
+        return None
+    try:
+        url = payload.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    return url if url.startswith(("http://", "https://")) else None
+
+
+def unwrap_google_news(entry_link: str) -> str:
+    """Return the destination of a Google News link, or the link unchanged."""
+    if not entry_link:
+        return entry_link
+    parsed = urllib.parse.urlparse(entry_link)
+    if parsed.netloc.endswith("news.google.com"):
+        qs = urllib.parse.parse_qs(parsed.query)
+        if "url" in qs and qs["url"]:
+            return qs["url"][0]
+        if "url=" in entry_link:
+            try:
+                fragment = entry_link.split("url=", 1)[1]
+                fragment = fragment.split("&", 1)[0]
+                return urllib.parse.unquote(fragment)
+            except Exception:
+                LOGGER.debug("Failed to parse inline url parameter", extra={"link": entry_link})
+        if parsed.path.startswith("/rss/articles/"):
+            # Some links use `url` in the fragment portion.
+            fragment_qs = urllib.parse.parse_qs(parsed.fragment)
+            if "url" in fragment_qs and fragment_qs["url"]:
+                return fragment_qs["url"][0]
+        encoded = article_id(entry_link)
+        decoded = decode_article_id(encoded) if encoded else None
+        if decoded:
+            return decoded
+    return entry_link
+
+
+def _unwrap_redirect(url: str) -> str:
+    parsed = urllib.parse.urlsplit(url)
+    host = parsed.netloc.lower()
+    if host.endswith("news.google.com"):
+        return unwrap_google_news(url)
+    if host in GOOGLE_REDIRECT_HOSTS and parsed.path == "/url":
+        qs = urllib.parse.parse_qs(parsed.query)
+        for key in ("q", "url"):
+            if qs.get(key):
+                return qs[key][0]
+    return url
+
+
+def canonical_url(url: str) -> str:
+    """Return a normalised form of ``url`` suitable for deduplication.
+
+    Google redirect wrappers are unwrapped, the scheme is folded to ``https``,
+    the host is lower-cased without ``www.`` or a default port, tracking query
+    parameters and fragments are dropped, and the remaining parameters are
+    sorted. Values that do not look like absolute HTTP URLs are returned as-is.
+    """
+
+    if not url:
+        return url
+    url = _unwrap_redirect(url.strip())
+    parsed = urllib.parse.urlsplit(url)
+    scheme = parsed.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parsed.hostname:
+        return url
+
+    host = parsed.hostname.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = parsed.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    params = [
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ]
+    query = urllib.parse.urlencode(sorted(params))
+    return urllib.parse.urlunsplit(("https", host, path, query, ""))
+
+
+__all__ = ["TRACKING_PARAMS", "article_id", "canonical_url", "decode_article_id", "unwrap_google_news"]
@@ -16,8 +16,10 @@ def load_seen(path="seen.json"):
     return set()
 
 def save_seen(ids, path="seen.json"):
-    with open(path, "w", encoding="utf-8") as f:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(sorted(list(ids)), f, ensure_ascii=False)
+    os.replace(tmp, path)
 
 def now_iso():
     return datetime.datetime.utcnow().replace(microsecond=0).isoformat("T")+"Z"
@@ -8,6 +8,10 @@ from typing import Iterable, List
 
 import feedparser
 
+from core.feed_state import FeedState, body_digest
+from core.http_cache import get_cache
+from core.urls import article_id, decode_article_id, unwrap_google_news as _extract_direct_link
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -27,30 +31,6 @@ def _build_search_url(query: str, language: str = "en", country: str = "IL") ->
     )
 
 
-def _extract_direct_link(entry_link: str) -> str:
-    """Return the destination article, stripping Google redirect parameters."""
-    if not entry_link:
-        return entry_link
-    parsed = urllib.parse.urlparse(entry_link)
-    if parsed.netloc.endswith("news.google.com"):
-        qs = urllib.parse.parse_qs(parsed.query)
-        if "url" in qs and qs["url"]:
-            return qs["url"][0]
-        if "url=" in entry_link:
-            try:
-                fragment = entry_link.split("url=", 1)[1]
-                fragment = fragment.split("&", 1)[0]
-                return urllib.parse.unquote(fragment)
-            except Exception:
-                _LOGGER.debug("Failed to parse inline url parameter", extra={"link": entry_link})
-        if parsed.path.startswith("/rss/articles/"):
-            # Some links use `url` in the fragment portion.
-            fragment_qs = urllib.parse.parse_qs(parsed.fragment)
-            if "url" in fragment_qs and fragment_qs["url"]:
-                return fragment_qs["url"][0]
-    return entry_link
-
-
 def _coerce_items(entries: Iterable[feedparser.FeedParserDict]) -> List[NewsItem]:
     items: List[NewsItem] = []
     seen_links: set[str] = set()
@@ -66,16 +46,47 @@ def _coerce_items(entries: Iterable[feedparser.FeedParserDict]) -> List[NewsItem
     return items
 
 
-def fetch_search(query: str, *, limit: int = 10, language: str = "en", country: str = "IL") -> List[dict]:
-    """Fetch Google News search results and return normalized dictionaries."""
+def fetch_search(
+    query: str,
+    *,
+    limit: int = 10,
+    language: str = "en",
+    country: str = "IL",
+    state: FeedState | None = None,
+) -> List[dict]:
+    """Fetch Google News search results and return normalized dictionaries.
+
+    With ``state`` only results not yielded by an earlier poll are returned.
+    """
     url = _build_search_url(query, language=language, country=country)
     _LOGGER.debug("Fetching Google News feed", extra={"query": query, "url": url})
-    feed = feedparser.parse(url)
+    cache = get_cache()
+    response = cache.get(url, kind="google_news")
+    derived_key = f"google_news:{limit}"
+    digest = body_digest(response.content, limit=limit) if state is not None else None
+    if state is not None and state.unchanged(url, digest):
+        _LOGGER.info("Google News feed unchanged, no new items", extra={"query": query})
+        return []
+    if response.from_cache and state is None:
+        cached_items = cache.load_derived(url, derived_key)
+        if cached_items is not None:
+            _LOGGER.info("Google News feed unchanged, reusing %s cached items", len(cached_items), extra={"query": query})
+            return cached_items
+
+    feed = feedparser.parse(response.content, response_headers=response.headers)
     if feed.bozo:
         _LOGGER.warning("Google News feed had parsing issues", extra={"query": query, "bozo_exception": str(feed.bozo_exception)})
-    items = _coerce_items(feed.entries[:limit])
+    # Apply the limit first so only entries actually yielded get marked.
+    entries = feed.entries[:limit]
+    if state is not None:
+        entries = state.new_entries(url, entries)
+    items = [item.__dict__ for item in _coerce_items(entries)]
+    if state is None:
+        cache.store_derived(url, derived_key, items)
+    else:
+        state.mark(url, entries, digest=digest)
     _LOGGER.info("Fetched %s Google News items", len(items), extra={"query": query})
-    return [item.__dict__ for item in items]
+    return items
 
 
-__all__ = ["fetch_search", "NewsItem", "_extract_direct_link"]
+__all__ = ["article_id", "decode_article_id", "fetch_search", "NewsItem", "_extract_direct_link"]
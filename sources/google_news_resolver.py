@@ -0,0 +1,198 @@
+"""Bulk resolution of Google News article links to publisher URLs."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Sequence
+
+import requests
+
+from core import http_client
+from core.urls import article_id, decode_article_id
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAPPING_PATH = "google_news_links.json"
+DEFAULT_MAX_ENTRIES = 20000
+RESOLVE_TIMEOUT = 10
+# Ids that could not be resolved are not retried for this long.
+FAILURE_TTL = 6 * 60 * 60
+
+_RESOLVER: "GoogleNewsResolver | None" = None
+
+
+def _is_google_news(url: str) -> bool:
+    return urllib.parse.urlsplit(url).netloc.lower().endswith("news.google.com")
+
+
+def _is_google(url: str) -> bool:
+    host = (urllib.parse.urlsplit(url).hostname or "").lower()
+    return host == "google.com" or host.endswith(".google.com")
+
+
+class GoogleNewsResolver:
+    """Map Google News article ids to publisher URLs, persisted on disk.
+
+    Ids are decoded offline when they embed the URL. The rest are followed
+    with ``HEAD`` requests (falling back to a streamed ``GET`` whose body is
+    never read) on a small thread pool. Only a successful response that ends
+    outside ``*.google.com`` (not a consent or sign-in page) counts as the
+    publisher URL. Every answer is kept in a JSON mapping so each article is
+    resolved at most once; ids that fail are retried after ``FAILURE_TTL``.
+    """
+
+    def __init__(
+        self,
+        path: str | None = DEFAULT_MAPPING_PATH,
+        *,
+        workers: int = 8,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.path = path
+        self.workers = max(1, workers)
+        self.max_entries = max_entries
+        self._mapping: Dict[str, str] = {}
+        self._failures: Dict[str, float] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+        except (OSError, ValueError):
+            _LOGGER.warning("Ignoring unreadable Google News link map", extra={"path": self.path})
+            return
+        if isinstance(raw, list):
+            # Files written before failures were tracked hold only the links.
+            raw = {"links": raw}
+        self._mapping = dict(raw.get("links", []))
+        now = time.time()
+        self._failures = {key: failed_at for key, failed_at in raw.get("failures", []) if now - failed_at < FAILURE_TTL}
+
+    def _remember(self, key: str, url: str) -> None:
+        with self._lock:
+            self._mapping.pop(key, None)
+            self._mapping[key] = url
+            while len(self._mapping) > self.max_entries:
+                self._mapping.pop(next(iter(self._mapping)))
+            self._dirty = True
+
+    def _remember_failure(self, key: str) -> None:
+        with self._lock:
+            self._failures[key] = time.time()
+            self._dirty = True
+
+    def lookup(self, link: str) -> str | None:
+        """Resolve ``link`` without network access, or return ``None``."""
+        key = article_id(link)
+        if key is None:
+            return None
+        with self._lock:
+            cached = self._mapping.get(key)
+        if cached:
+            return cached
+        decoded = decode_article_id(key)
+        if decoded:
+            self._remember(key, decoded)
+        return decoded
+
+    def _failed_recently(self, key: str) -> bool:
+        with self._lock:
+            failed_at = self._failures.get(key)
+        return failed_at is not None and time.time() - failed_at < FAILURE_TTL
+
+    def _follow(self, link: str) -> str | None:
+        for method, kwargs in (("HEAD", {}), ("GET", {"stream": True})):
+            try:
+                response = http_client.request(
+                    method, link, allow_redirects=True, timeout=RESOLVE_TIMEOUT, **kwargs
+                )
+            except requests.RequestException as exc:
+                _LOGGER.debug("Google News redirect failed", extra={"link": link, "error": str(exc)})
+                return None
+            response.close()
+            if response.status_code < 400 and not _is_google(response.url):
+                return response.url
+        return None
+
+    def resolve_many(self, links: Sequence[str]) -> Dict[str, str]:
+        """Return ``{link: publisher_url}`` for every link that could be resolved."""
+        resolved: Dict[str, str] = {}
+        online: List[str] = []
+        for link in dict.fromkeys(links):
+            target = self.lookup(link)
+            if target:
+                resolved[link] = target
+            elif article_id(link) and not self._failed_recently(article_id(link)):
+                online.append(link)
+        if online:
+            with ThreadPoolExecutor(
+                max_workers=min(self.workers, len(online)), thread_name_prefix="eventscout-gnews"
+            ) as pool:
+                for link, target in zip(online, pool.map(self._follow, online)):
+                    if target:
+                        resolved[link] = target
+                        self._remember(article_id(link), target)
+                    else:
+                        self._remember_failure(article_id(link))
+        _LOGGER.info(
+            "Resolved %s of %s Google News links",
+            len(resolved),
+            len(links),
+            extra={"online": len(online)},
+        )
+        return resolved
+
+    def save(self) -> None:
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            now = time.time()
+            failures = [[key, failed_at] for key, failed_at in self._failures.items() if now - failed_at < FAILURE_TTL]
+            payload = json.dumps({"links": list(self._mapping.items()), "failures": failures})
+            self._dirty = False
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+        os.replace(tmp_path, self.path)
+
+
+def get_resolver() -> GoogleNewsResolver:
+    """Return the shared resolver (mapping path from ``EVENTSCOUT_GNEWS_LINKS``)."""
+    global _RESOLVER
+    if _RESOLVER is None:
+        path = os.getenv("EVENTSCOUT_GNEWS_LINKS", DEFAULT_MAPPING_PATH)
+        _RESOLVER = GoogleNewsResolver(path or None)
+    return _RESOLVER
+
+
+def resolve_items(items: Sequence[dict], resolver: GoogleNewsResolver | None = None) -> List[dict]:
+    """Point items that still link to Google News at the publisher's URL.
+
+    The original link is kept under ``source_link`` so ids recorded for it
+    still count as seen.
+    """
+    resolver = resolver or get_resolver()
+    pending = [item["link"] for item in items if _is_google_news(item.get("link", ""))]
+    if not pending:
+        return list(items)
+    resolved = resolver.resolve_many(pending)
+    resolver.save()
+    return [
+        {**item, "link": resolved[item["link"]], "source_link": item["link"]}
+        if item.get("link") in resolved
+        else item
+        for item in items
+    ]
+
+
+__all__ = ["GoogleNewsResolver", "get_resolver", "resolve_items"]
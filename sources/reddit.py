@@ -1,8 +1,10 @@
 """Minimal Reddit JSON fetcher with lightweight filtering."""
 from __future__ import annotations
 
+import html
 import logging
-from typing import List
+import time
+from typing import Dict, List, Sequence
 
 SCOOP_KEYWORDS = {
     "breaking",
@@ -93,9 +95,18 @@ VIDEO_DOMAINS = {
 
 import requests
 
+from core import http_client
+
 _LOGGER = logging.getLogger(__name__)
 _USER_AGENT = "Mozilla/5.0 (compatible; EventScout/1.0; +https://github.com/)"
 
+# Domains whose links are kept as platform references rather than fetched.
+PLATFORM_DOMAINS = ("tiktok.com", "instagram.com", "facebook.com/reel", "fb.watch", "v.redd.it")
+
+# Subreddits per combined ``r/a+b+c`` listing, and the listing page size Reddit allows.
+BATCH_SIZE = 10
+PAGE_SIZE = 100
+
 
 def fetch_subreddit(subreddit: str, *, limit: int = 10, t: str = "day") -> List[dict]:
     """Fetch top submissions from a subreddit using the public JSON endpoint."""
@@ -104,9 +115,12 @@ def fetch_subreddit(subreddit: str, *, limit: int = 10, t: str = "day") -> List[
     headers = {"User-Agent": _USER_AGENT}
     _LOGGER.debug("Fetching subreddit", extra={"subreddit": subreddit, "url": url, "params": params})
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        response = http_client.get(url, params=params, headers=headers, timeout=15)
         response.raise_for_status()
     except requests.RequestException as exc:
+        if http_client.is_rate_limited(exc):
+            # Let the caller back off instead of treating the subreddit as empty.
+            raise
         _LOGGER.warning("Failed to fetch subreddit", extra={"subreddit": subreddit, "error": str(exc)})
         return []
 
@@ -114,35 +128,144 @@ def fetch_subreddit(subreddit: str, *, limit: int = 10, t: str = "day") -> List[
     children = data.get("data", {}).get("children", [])
     items: List[dict] = []
     for child in children:
-        payload = child.get("data", {})
-        if payload.get("stickied") or payload.get("over_18"):
-            continue
-        title = payload.get("title", "").strip()
-        link = payload.get("url_overridden_by_dest") or payload.get("url")
-        if not link:
-            continue
-        score = payload.get("score", 0)
-        num_comments = payload.get("num_comments", 0)
-        if score < 20 and num_comments < 3:
-            # Filter low-signal posts to reduce noise.
-            continue
-        is_video = _looks_like_video(payload, link)
-        is_eventful = _looks_eventful(title)
-        if not (is_video or is_eventful or _looks_like_scoop(title)):
-            _LOGGER.debug(
-                "Skipping subreddit post without event/video cues",
-                extra={"title": title[:80], "link": link},
-            )
-            continue
-        items.append({
-            "title": title,
-            "link": link,
-            "published": payload.get("created_utc"),
-        })
+        item = _normalize_post(child.get("data", {}))
+        if item is not None:
+            items.append(item)
     _LOGGER.info("Fetched %s subreddit items", len(items), extra={"subreddit": subreddit})
     return items
 
 
+def fetch_subreddits(
+    subreddits: Sequence[str],
+    *,
+    t: str = "day",
+    per_subreddit: int = 8,
+    max_pages: int = 3,
+    time_budget: float = 30.0,
+) -> List[dict]:
+    """Fetch top posts for several subreddits through one combined listing.
+
+    ``r/a+b+c/top.json`` is paged with ``after`` cursors until every subreddit
+    has ``per_subreddit`` kept posts, the listing runs out, ``max_pages`` pages
+    were read or ``time_budget`` seconds have passed. Posts go through the same
+    filters as :func:`fetch_subreddit`.
+    """
+
+    if not subreddits:
+        return []
+    url = f"https://www.reddit.com/r/{'+'.join(subreddits)}/top.json"
+    headers = {"User-Agent": _USER_AGENT}
+    wanted = {name.lower() for name in subreddits}
+    kept: Dict[str, int] = {}
+    items: List[dict] = []
+    deadline = time.monotonic() + time_budget
+    after: str | None = None
+    pages = 0
+    while pages < max_pages and time.monotonic() < deadline:
+        params = {"limit": PAGE_SIZE, "t": t}
+        if after:
+            params["after"] = after
+        _LOGGER.debug("Fetching subreddit batch", extra={"url": url, "params": params})
+        try:
+            response = http_client.get(url, params=params, headers=headers, timeout=15)
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            if http_client.is_rate_limited(exc) and not items:
+                raise
+            _LOGGER.warning("Failed to fetch subreddit batch", extra={"url": url, "error": str(exc)})
+            break
+        pages += 1
+        data = response.json().get("data", {})
+        for child in data.get("children", []):
+            payload = child.get("data", {})
+            name = (payload.get("subreddit") or "").lower()
+            if kept.get(name, 0) >= per_subreddit:
+                continue
+            item = _normalize_post(payload)
+            if item is not None:
+                kept[name] = kept.get(name, 0) + 1
+                items.append(item)
+        after = data.get("after")
+        if not after or all(kept.get(name, 0) >= per_subreddit for name in wanted):
+            break
+    _LOGGER.info(
+        "Fetched %s subreddit items",
+        len(items),
+        extra={"subreddits": len(subreddits), "pages": pages},
+    )
+    return items
+
+
+def batch_subreddits(subreddits: Sequence[str], size: int = BATCH_SIZE) -> List[List[str]]:
+    size = max(1, size)
+    return [list(subreddits[index : index + size]) for index in range(0, len(subreddits), size)]
+
+
+def _normalize_post(payload: dict) -> dict | None:
+    """Return the item for a listing post, or ``None`` if it is filtered out."""
+    if payload.get("stickied") or payload.get("over_18"):
+        return None
+    title = payload.get("title", "").strip()
+    link = payload.get("url_overridden_by_dest") or payload.get("url")
+    if not link:
+        return None
+    score = payload.get("score", 0)
+    num_comments = payload.get("num_comments", 0)
+    if score < 20 and num_comments < 3:
+        # Filter low-signal posts to reduce noise.
+        return None
+    is_video = _looks_like_video(payload, link)
+    is_eventful = _looks_eventful(title)
+    if not (is_video or is_eventful or _looks_like_scoop(title)):
+        _LOGGER.debug(
+            "Skipping subreddit post without event/video cues",
+            extra={"title": title[:80], "link": link},
+        )
+        return None
+    text, videos, platform_links = _embedded_media(payload, link)
+    return {
+        "title": title,
+        "link": link,
+        "published": payload.get("created_utc"),
+        "text": text,
+        "videos": videos,
+        "platform_links": platform_links,
+    }
+
+
+def _embedded_media(payload: dict, link: str) -> tuple[str, List[str], List[str]]:
+    """Pull text, direct video URLs and platform links out of a listing post.
+
+    Reddit already includes the self text, its own transcoded video
+    (``media``/``secure_media``), GIF-to-MP4 previews and oEmbed data in
+    ``top.json``, so these posts rarely need their outbound link fetched.
+    """
+
+    text = (payload.get("selftext") or "").strip()
+    videos: set[str] = set()
+    platform_links: set[str] = set()
+    for key in ("secure_media", "media"):
+        media = payload.get(key) or {}
+        reddit_video = media.get("reddit_video") or {}
+        for field in ("fallback_url", "hls_url"):
+            if reddit_video.get(field):
+                videos.add(html.unescape(reddit_video[field]))
+        oembed = media.get("oembed") or {}
+        if oembed and not text:
+            text = (oembed.get("title") or "").strip()
+    preview = payload.get("preview") or {}
+    preview_video = preview.get("reddit_video_preview") or {}
+    if preview_video.get("fallback_url"):
+        videos.add(html.unescape(preview_video["fallback_url"]))
+    for image in preview.get("images") or []:
+        mp4 = ((image.get("variants") or {}).get("mp4") or {}).get("source") or {}
+        if mp4.get("url"):
+            videos.add(html.unescape(mp4["url"]))
+    if any(domain in link for domain in PLATFORM_DOMAINS):
+        platform_links.add(link)
+    return text, sorted(videos), sorted(platform_links)
+
+
 def _looks_like_video(payload: dict, link: str) -> bool:
     link_lower = link.lower()
     post_hint = (payload.get("post_hint") or "").lower()
@@ -170,4 +293,4 @@ def _looks_eventful(title: str) -> bool:
     return any(token in normalized for token in EVENT_KEYWORDS)
 
 
-__all__ = ["fetch_subreddit", "_looks_eventful"]
+__all__ = ["batch_subreddits", "fetch_subreddit", "fetch_subreddits", "_looks_eventful"]
@@ -6,18 +6,42 @@ from typing import List
 
 import feedparser
 
+from core.feed_state import FeedState, body_digest
+from core.http_cache import get_cache
+
 _LOGGER = logging.getLogger(__name__)
 
 
-def fetch_rss(url: str, *, limit: int = 10) -> List[dict]:
-    """Fetch arbitrary RSS feeds and normalise their entries."""
+def fetch_rss(url: str, *, limit: int = 10, state: FeedState | None = None) -> List[dict]:
+    """Fetch arbitrary RSS feeds and normalise their entries.
+
+    With ``state`` only entries not yielded by an earlier poll are returned,
+    and an unchanged feed returns nothing without being parsed.
+    """
     _LOGGER.debug("Fetching RSS feed", extra={"url": url})
-    feed = feedparser.parse(url)
+    cache = get_cache()
+    response = cache.get(url, kind="rss")
+    derived_key = f"rss:{limit}"
+    digest = body_digest(response.content, limit=limit) if state is not None else None
+    if state is not None and state.unchanged(url, digest):
+        _LOGGER.info("RSS feed unchanged, no new items", extra={"url": url})
+        return []
+    if response.from_cache and state is None:
+        cached_items = cache.load_derived(url, derived_key)
+        if cached_items is not None:
+            _LOGGER.info("RSS feed unchanged, reusing %s cached items", len(cached_items), extra={"url": url})
+            return cached_items
+
+    feed = feedparser.parse(response.content, response_headers=response.headers)
     if feed.bozo:
         _LOGGER.warning("RSS feed had parsing issues", extra={"url": url, "bozo_exception": str(feed.bozo_exception)})
+    # Apply the limit first so only entries actually yielded get marked.
+    entries = feed.entries[:limit]
+    if state is not None:
+        entries = state.new_entries(url, entries)
     items = []
     seen_links: set[str] = set()
-    for entry in feed.entries[:limit]:
+    for entry in entries:
         title = entry.get("title", "").strip()
         link = entry.get("link", "")
         if not link or link in seen_links:
@@ -25,6 +49,10 @@ def fetch_rss(url: str, *, limit: int = 10) -> List[dict]:
         seen_links.add(link)
         published = entry.get("published") or entry.get("updated")
         items.append({"title": title, "link": link, "published": published})
+    if state is None:
+        cache.store_derived(url, derived_key, items)
+    else:
+        state.mark(url, entries, digest=digest)
     _LOGGER.info("Fetched %s RSS items", len(items), extra={"url": url})
     return items
 
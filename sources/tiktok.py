@@ -2,10 +2,14 @@
 from __future__ import annotations
 
 import datetime as dt
+import heapq
 import logging
-from typing import Iterable, List
+import threading
+import time
+from collections import deque
+from typing import Deque, Iterable, List
 
-import requests
+from core import http_client
 
 _LOGGER = logging.getLogger(__name__)
 _API_ENDPOINT = "https://www.tikwm.com/api/search"
@@ -76,68 +80,127 @@ def _normalize_video(video: dict) -> dict | None:
     return normalized
 
 
+class RequestBudget:
+    """Sliding-window request allowance shared by all hashtag searches.
+
+    TikWM's free tier throttles per client, not per keyword, so every search
+    in a run draws from the same pool of ``max_requests`` per ``window``
+    seconds.
+    """
+
+    def __init__(self, max_requests: int = 12, window: float = 600.0, *, clock=time.monotonic) -> None:
+        self.max_requests = max_requests
+        self.window = window
+        self.clock = clock
+        self._sent: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = self.clock()
+            while self._sent and now - self._sent[0] >= self.window:
+                self._sent.popleft()
+            if len(self._sent) >= self.max_requests:
+                return False
+            self._sent.append(now)
+            return True
+
+
+def _rank_key(item: dict) -> tuple:
+    created = item.get("created_at")
+    return (
+        item.get("play_count") or 0,
+        item.get("digg_count") or 0,
+        created.timestamp() if isinstance(created, dt.datetime) else 0.0,
+    )
+
+
+def _page_videos(data: dict) -> List[dict]:
+    if isinstance(data.get("videos"), list):
+        return data["videos"]
+    if isinstance(data.get("list"), list):
+        return data["list"]
+    return []
+
+
 def fetch_hashtag(
     keyword: str,
     *,
     limit: int = 8,
     days: int = 7,
+    max_pages: int = 3,
+    budget: RequestBudget | None = None,
 ) -> List[dict]:
     """Fetch recent TikToks for a hashtag or keyword.
 
     The implementation relies on the free TikWM API which provides search results
-    for TikTok without authentication. Results are filtered to roughly match the
-    requested timeframe, prioritising higher engagement clips first.
+    for TikTok without authentication. Pages are followed through the API's
+    ``cursor`` until ``max_pages`` is reached, the API has no more results,
+    ``budget`` is exhausted, or most of a page falls outside the ``days``
+    window. Only the ``limit`` most engaging clips are kept while paging, in a
+    heap ordered by ``(play_count, digg_count, created_at)``.
     """
 
     cutoff = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=days)
-    params = {
-        "keywords": keyword,
-        "count": max(limit * 3, 24),
-        "page": 1,
-    }
-    _LOGGER.debug("Fetching TikTok search", extra={"keyword": keyword, "params": params})
-    try:
-        response = requests.get(_API_ENDPOINT, params=params, timeout=20)
-        response.raise_for_status()
-        payload = response.json()
-    except Exception:
-        _LOGGER.exception("Failed to fetch TikTok search", extra={"keyword": keyword})
-        return []
-
-    data = payload.get("data") if isinstance(payload, dict) else None
-    if not isinstance(data, dict):
-        _LOGGER.debug("TikTok payload missing data", extra={"keyword": keyword})
-        return []
-
-    videos: Iterable[dict] = []
-    if isinstance(data.get("videos"), list):
-        videos = data["videos"]
-    elif isinstance(data.get("list"), list):
-        videos = data["list"]
-
-    normalized: List[dict] = []
-    for raw in videos:
-        if not isinstance(raw, dict):
-            continue
-        item = _normalize_video(raw)
-        if not item:
-            continue
-        created = item["created_at"]
-        if created and created < cutoff:
-            continue
-        normalized.append(item)
-
-    normalized.sort(
-        key=lambda item: (
-            item.get("play_count") or 0,
-            item.get("digg_count") or 0,
-            item.get("created_at") or dt.datetime.min.replace(tzinfo=dt.timezone.utc),
-        ),
-        reverse=True,
-    )
+    top: List[tuple] = []
+    seen_links: set[str] = set()
+    cursor: object = 0
+    pages = 0
+    while pages < max_pages:
+        if budget is not None and not budget.try_acquire():
+            _LOGGER.info("TikTok request budget exhausted", extra={"keyword": keyword, "pages": pages})
+            break
+        params = {
+            "keywords": keyword,
+            "count": max(limit * 3, 24),
+            "cursor": cursor,
+        }
+        _LOGGER.debug("Fetching TikTok search", extra={"keyword": keyword, "params": params})
+        try:
+            response = http_client.get(_API_ENDPOINT, params=params, timeout=20)
+            response.raise_for_status()
+            payload = response.json()
+        except Exception as exc:
+            if http_client.is_rate_limited(exc) and pages == 0:
+                raise
+            _LOGGER.exception("Failed to fetch TikTok search", extra={"keyword": keyword})
+            break
+        pages += 1
+
+        data = payload.get("data") if isinstance(payload, dict) else None
+        if not isinstance(data, dict):
+            _LOGGER.debug("TikTok payload missing data", extra={"keyword": keyword})
+            break
+
+        videos = _page_videos(data)
+        outside = 0
+        for raw in videos:
+            if not isinstance(raw, dict):
+                continue
+            item = _normalize_video(raw)
+            if not item or item["link"] in seen_links:
+                continue
+            created = item["created_at"]
+            if created and created < cutoff:
+                outside += 1
+                continue
+            seen_links.add(item["link"])
+            # ``len(seen_links)`` breaks ties so dicts are never compared.
+            entry = (_rank_key(item), len(seen_links), item)
+            if len(top) < limit:
+                heapq.heappush(top, entry)
+            else:
+                heapq.heappushpop(top, entry)
+
+        cursor = data.get("cursor")
+        if not videos or not data.get("hasMore") or cursor in (None, ""):
+            break
+        if outside * 2 > len(videos):
+            _LOGGER.debug("TikTok results left the time window", extra={"keyword": keyword, "pages": pages})
+            break
 
     results: List[dict] = []
-    for item in normalized:
+    for _, _, item in sorted(top, key=lambda entry: (entry[0], -entry[1]), reverse=True):
         payload = {
             "title": item["title"],
             "link": item["link"],
@@ -150,11 +213,9 @@ def fetch_hashtag(
         if item.get("digg_count") is not None:
             payload["digg_count"] = item["digg_count"]
         results.append(payload)
-        if len(results) >= limit:
-            break
 
-    _LOGGER.info("Fetched %s TikTok items", len(results), extra={"keyword": keyword})
+    _LOGGER.info("Fetched %s TikTok items", len(results), extra={"keyword": keyword, "pages": pages})
     return results
 
 
-__all__ = ["fetch_hashtag", "_normalize_video", "_parse_timestamp"]
+__all__ = ["RequestBudget", "fetch_hashtag", "_normalize_video", "_parse_timestamp"]
@@ -0,0 +1,85 @@
+import threading
+import time
+
+from core.collect import SourceJob, merge_results, run_source_jobs
+
+
+def test_run_source_jobs_keeps_submission_order():
+    def make_fetch(delay, link):
+        def fetch():
+            time.sleep(delay)
+            return [{"title": link, "link": link}]
+
+        return fetch
+
+    jobs = [
+        SourceJob("rss", "slow", make_fetch(0.05, "https://a.example/1")),
+        SourceJob("rss", "fast", make_fetch(0.0, "https://a.example/2")),
+        SourceJob("reddit", "dupe", make_fetch(0.0, "https://a.example/1")),
+    ]
+
+    merged = merge_results(run_source_jobs(jobs))
+
+    assert [item["link"] for item in merged] == ["https://a.example/1", "https://a.example/2"]
+
+
+def test_run_source_jobs_respects_per_kind_limit():
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def fetch():
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        return []
+
+    jobs = [SourceJob("reddit", str(i), fetch) for i in range(6)]
+    run_source_jobs(jobs, concurrency={"reddit": 2})
+
+    assert active["peak"] <= 2
+
+
+def test_run_source_jobs_does_not_queue_other_kinds_behind_a_backlog():
+    release = threading.Event()
+    started = []
+
+    def blocked():
+        release.wait(2)
+        return []
+
+    def quick(name):
+        def fetch():
+            started.append((name, release.is_set()))
+            return []
+
+        return fetch
+
+    jobs = [SourceJob("google_news", str(i), blocked) for i in range(8)]
+    jobs += [SourceJob("reddit", "r", quick("reddit")), SourceJob("rss", "f", quick("rss"))]
+    runner = threading.Thread(target=run_source_jobs, args=(jobs,), kwargs={"concurrency": {"google_news": 2}})
+    runner.start()
+    deadline = time.monotonic() + 1
+    while len(started) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    runner.join()
+
+    assert sorted(started) == [("reddit", False), ("rss", False)]
+
+
+def test_run_source_jobs_isolates_failures():
+    def boom():
+        raise RuntimeError("feed down")
+
+    jobs = [
+        SourceJob("rss", "broken", boom),
+        SourceJob("rss", "ok", lambda: [{"link": "https://ok.example"}]),
+    ]
+
+    results = run_source_jobs(jobs)
+
+    assert isinstance(results[0].error, RuntimeError)
+    assert results[1].items == [{"link": "https://ok.example"}]
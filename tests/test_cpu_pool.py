@@ -0,0 +1,31 @@
+import core.extract as extract
+from core.cpu_pool import CpuPool, PageRecord
+from core.extract import HtmlFetch
+from core.rank import score_rule_based
+from core.score_cache import TEXT_PREFIX_CHARS
+
+ARTICLE = "<p>Massive techno festival tonight in Tel Aviv, tickets on sale now for the rave.</p>" * 40
+
+
+def test_cpu_pool_parses_and_scores_in_workers(monkeypatch):
+    def fake_fetch(url, timeout=15):
+        if "broken" in url:
+            raise RuntimeError("timeout")
+        html = (
+            '<html><head><meta property="og:video" content="https://cdn.example/a.mp4"></head>'
+            f"<body><article>{ARTICLE}</article></body></html>"
+        )
+        return HtmlFetch(url=url, html=html)
+
+    monkeypatch.setattr(extract, "fetch_html_stream", fake_fetch)
+    urls = ["https://a.example", "https://broken.example"]
+    titles = ["Techno festival", "Broken page"]
+
+    with CpuPool(2) as pool:
+        records = pool.extract_and_score(urls, titles, fetch_workers=2)
+
+    full_text, _, _ = extract.parse_html(fake_fetch(urls[0]).html)
+    assert records[0].videos == ["https://cdn.example/a.mp4"]
+    assert records[0].text == full_text[:TEXT_PREFIX_CHARS]
+    assert records[0].rule_score == score_rule_based(titles[0], full_text)
+    assert records[1] == PageRecord("", [], [], score_rule_based(titles[1], ""))
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+from core.daemon import PipelineDaemon
+from core.feed_state import FeedState
+
+
+def test_daemon_overlaps_rounds_and_never_resends_in_flight_items():
+    enrich_started = threading.Event()
+    release_enrich = threading.Event()
+    collected = []
+    delivered = []
+    overlapped = []
+
+    def collect():
+        round_number = len(collected)
+        items = [{"uid": "shared"}, {"uid": f"r{round_number}"}]
+        collected.append(round_number)
+        if round_number == 1:
+            # The second round is collected while the first is still enriching.
+            overlapped.append(enrich_started.wait(2) and not release_enrich.is_set())
+            release_enrich.set()
+        return items
+
+    def enrich(items):
+        enrich_started.set()
+        release_enrich.wait(2)
+        return [item["uid"] for item in items]
+
+    daemon = PipelineDaemon(collect=collect, enrich=enrich, deliver=delivered.append, interval=0, max_rounds=2)
+    asyncio.run(daemon.run())
+
+    assert overlapped == [True]
+    assert delivered == [["shared", "r0"], ["r1"]]
+    assert daemon.rounds == 2 and daemon.delivered == 2
+
+
+def test_daemon_stop_drains_batches_already_collected():
+    delivered = []
+    daemon = PipelineDaemon(
+        collect=lambda: [{"uid": "a"}],
+        enrich=lambda items: items,
+        deliver=delivered.append,
+        interval=3600,
+    )
+
+    async def main():
+        task = asyncio.create_task(daemon.run())
+        while not daemon.rounds:
+            await asyncio.sleep(0.01)
+        daemon.stop()
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(main())
+    assert delivered == [[{"uid": "a"}]]
+
+
+def test_daemon_commits_round_checkpoint_only_after_delivery():
+    events = []
+    rounds = iter(range(10))
+
+    def deliver(candidates):
+        events.append(("deliver", candidates))
+        if candidates == ["r1"]:
+            raise RuntimeError("telegram down")
+
+    daemon = PipelineDaemon(
+        collect=lambda: [{"uid": f"r{next(rounds)}"}],
+        enrich=lambda items: [item["uid"] for item in items],
+        deliver=deliver,
+        interval=0,
+        max_rounds=3,
+        checkpoint=lambda: len(events),
+        commit=lambda token: events.append(("commit", token)),
+        rollback=lambda token: events.append(("rollback", token)),
+    )
+    asyncio.run(daemon.run())
+
+    delivered = [payload for kind, payload in events if kind == "deliver"]
+    commits = [index for index, (kind, _) in enumerate(events) if kind == "commit"]
+    assert delivered == [["r0"], ["r1"], ["r2"]]
+    assert len(commits) == 2
+    assert all(events[index - 1][0] == "deliver" for index in commits)
+    assert [kind for kind, _ in events].count("rollback") == 1
+    assert events[events.index(("deliver", ["r1"])) + 1][0] == "rollback"
+
+
+def test_daemon_redelivers_feed_entries_of_a_failed_round(tmp_path):
+    state = FeedState(str(tmp_path / "feed_state.json"))
+    feed = [{"id": "a"}, {"id": "b"}]
+    published = iter([["a"], ["a", "b"], ["a", "b"]])
+    attempts = []
+
+    def collect():
+        # Entries appear over time; marks are staged as a fetcher would.
+        visible = [entry for entry in feed if entry["id"] in next(published)]
+        fresh = state.new_entries("f", visible)
+        state.mark("f", fresh)
+        return [{"uid": entry["id"]} for entry in fresh]
+
+    def deliver(candidates):
+        attempts.append(candidates)
+        if len(attempts) == 1:
+            raise RuntimeError("telegram down")
+
+    daemon = PipelineDaemon(
+        collect=collect,
+        enrich=lambda items: [item["uid"] for item in items],
+        deliver=deliver,
+        interval=0,
+        queue_size=1,
+        max_rounds=3,
+        checkpoint=state.checkpoint,
+        commit=state.commit,
+        rollback=state.rollback,
+    )
+    asyncio.run(daemon.run())
+
+    assert attempts[0] == ["a"]
+    assert sorted(uid for batch in attempts[1:] for uid in batch) == ["a", "b"]
+    assert FeedState(str(tmp_path / "feed_state.json")).new_entries("f", feed) == []
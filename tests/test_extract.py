@@ -0,0 +1,164 @@
+import pytest
+
+import core.extract as extract
+from core.extract import HtmlFetch, UnsupportedContentError
+from core.http_cache import HttpCache
+
+
+class StreamedResponse:
+    def __init__(self, chunks, headers=None, status_code=200):
+        self.chunks = chunks
+        self.headers = headers or {"Content-Type": "text/html; charset=utf-8"}
+        self.status_code = status_code
+        self.read = 0
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def iter_content(self, chunk_size=1):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+def test_extract_many_isolates_failures_and_keeps_order(monkeypatch):
+    def fake_fetch(url, timeout=15):
+        if "broken" in url:
+            raise RuntimeError("timeout")
+        if "pdf" in url:
+            raise UnsupportedContentError("application/pdf")
+        return HtmlFetch(url=url, html=f"<p>{url}</p>", head_videos=["https://cdn.example/og.mp4"])
+
+    def fake_parse(html, url=""):
+        return html, [f"{url}/clip.mp4"], []
+
+    monkeypatch.setattr(extract, "fetch_html_stream", fake_fetch)
+    monkeypatch.setattr(extract, "parse_html", fake_parse)
+
+    urls = ["https://a.example", "https://broken.example", "https://pdf.example", "https://c.example"]
+    results = extract.extract_many(urls, fetch_workers=3, parse_workers=2)
+
+    assert results[0] == (
+        "<p>https://a.example</p>",
+        ["https://a.example/clip.mp4", "https://cdn.example/og.mp4"],
+        [],
+    )
+    assert results[1] == ("", [], [])
+    assert results[2] == ("", [], [])
+    assert "https://c.example/clip.mp4" in results[3][1]
+
+
+def test_fetch_html_stream_caps_size_and_sniffs_head(monkeypatch, tmp_path):
+    head = b'<html><head><meta property="og:video" content="https://cdn.example/a.mp4"></head><body>'
+    response = StreamedResponse([head] + [b"x" * 100] * 50)
+    monkeypatch.setattr(extract, "get_cache", lambda: HttpCache(str(tmp_path)))
+    monkeypatch.setattr(extract.http_client, "get", lambda url, **kwargs: response)
+
+    fetched = extract.fetch_html_stream("https://a.example", max_bytes=500)
+
+    assert fetched.truncated
+    assert len(fetched.html) == 500
+    assert fetched.head_videos == ["https://cdn.example/a.mp4"]
+    assert response.read < 10 and response.closed
+
+
+def test_fetch_html_stream_rejects_non_html_and_stops_after_head(monkeypatch, tmp_path):
+    pdf = StreamedResponse([b"%PDF"], headers={"Content-Type": "application/pdf"})
+    page = StreamedResponse([b"<head><title>t</title></head>", b"<body>never read</body>"])
+    responses = [pdf, page]
+    monkeypatch.setattr(extract, "get_cache", lambda: HttpCache(str(tmp_path)))
+    monkeypatch.setattr(extract.http_client, "get", lambda url, **kwargs: responses.pop(0))
+
+    with pytest.raises(UnsupportedContentError):
+        extract.fetch_html_stream("https://a.example/doc.pdf")
+    assert pdf.read == 0
+
+    fetched = extract.fetch_html_stream("https://b.example", head_only=True)
+    assert not fetched.complete and page.read == 1
+
+
+def test_fetch_html_stream_scans_each_chunk_once_for_head_end(monkeypatch, tmp_path):
+    pattern = extract._HEAD_END_RE
+    scanned = []
+
+    class CountingPattern:
+        def search(self, data, pos=0):
+            scanned.append(len(data) - pos)
+            return pattern.search(data, pos)
+
+    chunks = [b"<html><head>"] + [b"<!-- padding -->" * 8] * 40 + [b"</he", b"ad><body>x</body>"]
+    monkeypatch.setattr(extract, "get_cache", lambda: HttpCache(str(tmp_path)))
+    monkeypatch.setattr(extract.http_client, "get", lambda url, **kwargs: StreamedResponse(list(chunks)))
+    monkeypatch.setattr(extract, "_HEAD_END_RE", CountingPattern())
+
+    fetched = extract.fetch_html_stream("https://a.example", head_only=True)
+
+    total = sum(len(chunk) for chunk in chunks)
+    assert not fetched.complete and len(fetched.html) == total
+    assert sum(scanned) < 2 * total
+
+
+def test_parse_html_reads_head_meta_and_article_media():
+    paragraph = "<p>The techno festival returns to Tel Aviv this week with a sunrise set on the beach.</p>"
+    html = (
+        '<html><head><meta property="og:video" content="https://cdn.example/og.mp4"></head><body>'
+        f"<article>{paragraph * 10}"
+        '<video><source src="https://cdn.example/inline.mp4"></video>'
+        '<p>Watch the <a href="https://www.tiktok.com/@dj/video/1">clip</a>.</p></article>'
+        "</body></html>"
+    )
+
+    text, videos, platform_links = extract.parse_html(html, "https://a.example")
+
+    assert "sunrise set on the beach" in text and "<p>" not in text
+    assert videos == ["https://cdn.example/inline.mp4", "https://cdn.example/og.mp4"]
+    assert platform_links == ["https://www.tiktok.com/@dj/video/1"]
+    assert extract.parse_html("   ") == ("", [], [])
+
+
+def test_enrich_skips_fetch_when_source_supplied_content(monkeypatch):
+    import bot
+
+    fetched = []
+
+    def fake_extract_many(urls, **kwargs):
+        fetched.extend(urls)
+        return [("page text", ["https://cdn.example/page.mp4"], []) for _ in urls]
+
+    monkeypatch.setattr(bot, "extract_many", fake_extract_many)
+    items = [
+        {"title": "Clip", "link": "https://v.redd.it/abc", "videos": ["https://v.redd.it/abc/DASH_720.mp4"]},
+        {"title": "Long post", "link": "https://reddit.com/r/edm/1", "text": "festival " * 40},
+        {"title": "Link post", "link": "https://news.example/a", "platform_links": ["https://tiktok.com/@a"]},
+    ]
+
+    candidates = bot.enrich_candidates(items, set(), use_llm=False, ollama_endpoint="", ollama_model="")
+
+    assert fetched == ["https://news.example/a"]
+    assert candidates[0].videos == ["https://v.redd.it/abc/DASH_720.mp4"]
+    assert candidates[2].videos == ["https://cdn.example/page.mp4"]
+    assert candidates[2].platform_links == ["https://tiktok.com/@a"]
+
+
+def test_tree_document_hooks_match_installed_readability(monkeypatch):
+    import inspect
+
+    import readability.readability as readability
+
+    # _TreeDocument overrides these; a readability release that renames them
+    # would silently fall back to re-parsing (or break) without this check.
+    assert list(inspect.signature(readability.Document._parse).parameters) == ["self", "input"]
+    assert list(inspect.signature(readability.Document.get_clean_html).parameters) == ["self"]
+
+    def no_reparse(page):
+        raise AssertionError("readability re-parsed the page")
+
+    monkeypatch.setattr(readability, "build_doc", no_reparse)
+    paragraph = "<p>The techno festival returns to Tel Aviv this week with a sunrise set on the beach.</p>"
+    text, _, _ = extract.parse_html(f"<html><body><article>{paragraph * 5}</article></body></html>")
+    assert text.startswith("The techno festival returns")
@@ -0,0 +1,135 @@
+import time
+
+import core.http_cache as http_cache
+import sources.rss as rss
+from core.feed_state import FeedState
+from core.http_cache import HttpCache
+
+RSS = """<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>"""
+ITEM = "<item><title>{n}</title><link>https://e.example/{n}</link><guid>g{n}</guid><pubDate>{date}</pubDate></item>"
+
+
+def feed(*numbers):
+    items = "".join(ITEM.format(n=n, date=f"Mon, 0{n} Sep 2025 10:00:00 GMT") for n in numbers)
+    return RSS.format(items=items).encode("utf-8")
+
+
+class DummyResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+        self.apparent_encoding = "utf-8"
+
+    def raise_for_status(self):
+        pass
+
+
+def entry(guid, day=None):
+    return {"id": guid, "published_parsed": time.gmtime(day * 86400) if day is not None else None}
+
+
+def test_feed_state_filters_by_guid_and_forgotten_horizon(tmp_path):
+    path = str(tmp_path / "feed_state.json")
+    state = FeedState(path, max_guids=2)
+    assert state.new_entries("f", [entry("a", 5)]) == [entry("a", 5)]
+
+    state.mark("f", [entry("a", 5), entry("b")])
+    state.save()
+    reloaded = FeedState(path, max_guids=2)
+
+    fresh = reloaded.new_entries("f", [entry("a", 5), entry("b"), entry("old", 3), entry("c", 6), entry("d")])
+    assert [item["id"] for item in fresh] == ["old", "c", "d"]
+
+    # "a" drops out of the ring, so entries dated at or before it count as yielded.
+    reloaded.mark("f", [entry("c", 6)])
+    reloaded.save()
+    fresh = reloaded.new_entries("f", [entry("a", 5), entry("old", 3), entry("e", 7)])
+    assert [item["id"] for item in fresh] == ["e"]
+
+
+def test_fetch_rss_yields_only_new_entries_and_skips_unchanged(monkeypatch, tmp_path):
+    responses = [
+        DummyResponse(200, feed(1, 2), {"ETag": '"v1"'}),
+        DummyResponse(304),
+        DummyResponse(200, feed(1, 2, 3), {"ETag": '"v2"'}),
+    ]
+    monkeypatch.setattr(http_cache.http_client, "get", lambda url, headers, timeout: responses.pop(0))
+    cache = HttpCache(str(tmp_path / "http"), ttls={"rss": 0})
+    monkeypatch.setattr(rss, "get_cache", lambda: cache)
+    monkeypatch.setattr(rss.feedparser, "parse", _forbid_on_304(rss.feedparser.parse, responses))
+    state = FeedState(None)
+
+    first = rss.fetch_rss("https://feed.example/rss", state=state)
+    unchanged = rss.fetch_rss("https://feed.example/rss", state=state)
+    updated = rss.fetch_rss("https://feed.example/rss", state=state)
+
+    assert [item["title"] for item in first] == ["1", "2"]
+    assert unchanged == []
+    assert [item["title"] for item in updated] == ["3"]
+
+
+def _forbid_on_304(parse, responses):
+    def guarded(content, **kwargs):
+        assert len(responses) != 1, "unchanged feed must not be parsed"
+        return parse(content, **kwargs)
+
+    return guarded
+
+
+def test_fetch_rss_rereads_cached_feed_after_unsaved_cycle(monkeypatch, tmp_path):
+    responses = [
+        DummyResponse(200, feed(1, 2), {"ETag": '"v1"'}),
+        DummyResponse(200, feed(1, 2, 3), {"ETag": '"v2"'}),
+        DummyResponse(304),
+    ]
+    monkeypatch.setattr(http_cache.http_client, "get", lambda url, headers, timeout: responses.pop(0))
+    cache = HttpCache(str(tmp_path / "http"), ttls={"rss": 0})
+    monkeypatch.setattr(rss, "get_cache", lambda: cache)
+    path = str(tmp_path / "feed_state.json")
+    state = FeedState(path)
+    rss.fetch_rss("https://feed.example/rss", state=state)
+    state.save()
+
+    # The next cycle fetches a new body, then dies before deliver_digest saves.
+    rss.fetch_rss("https://feed.example/rss", state=FeedState(path))
+    items = rss.fetch_rss("https://feed.example/rss", state=FeedState(path))
+
+    assert [item["title"] for item in items] == ["3"]
+
+
+def test_fetch_rss_yields_entries_cut_off_by_limit_later(monkeypatch, tmp_path):
+    responses = [DummyResponse(200, feed(3, 2, 1)), DummyResponse(200, feed(2, 1))]
+    monkeypatch.setattr(http_cache.http_client, "get", lambda url, headers, timeout: responses.pop(0))
+    cache = HttpCache(str(tmp_path / "http"), ttls={"rss": 0})
+    monkeypatch.setattr(rss, "get_cache", lambda: cache)
+    state = FeedState(None)
+
+    first = rss.fetch_rss("https://feed.example/rss", limit=1, state=state)
+    second = rss.fetch_rss("https://feed.example/rss", limit=1, state=state)
+
+    assert [item["title"] for item in first] == ["3"]
+    assert [item["title"] for item in second] == ["2"]
+
+
+def test_feed_state_commits_only_the_delivered_round(tmp_path):
+    path = str(tmp_path / "feed_state.json")
+    state = FeedState(path)
+    state.mark("f", [entry("a", 1)], digest="d1")
+    failed = state.checkpoint()
+    state.mark("f", [entry("b", 2)], digest="d2")
+    delivered = state.checkpoint()
+    state.mark("f", [entry("c", 3)], digest="d3")
+
+    # Staged marks hide entries from later rounds until they are settled.
+    assert state.new_entries("f", [entry("a", 1), entry("b", 2), entry("c", 3)]) == []
+    assert state.unchanged("f", "d3")
+
+    state.rollback(failed)
+    state.commit(delivered)
+
+    saved = FeedState(path)
+    assert [item["id"] for item in saved.new_entries("f", [entry("a", 1), entry("b", 2), entry("c", 3)])] == ["a", "c"]
+    assert saved.unchanged("f", "d2")
+    assert [item["id"] for item in state.new_entries("f", [entry("a", 1), entry("b", 2), entry("c", 3)])] == ["a"]
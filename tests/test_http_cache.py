@@ -0,0 +1,95 @@
+import core.http_cache as http_cache
+from core.http_cache import HttpCache
+
+
+class DummyResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+        self.apparent_encoding = "utf-8"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+def test_cache_revalidates_with_etag_and_keeps_derived(monkeypatch, tmp_path):
+    calls = []
+    responses = [
+        DummyResponse(200, b"<rss/>", {"ETag": '"v1"', "Content-Type": "application/rss+xml"}),
+        DummyResponse(304),
+    ]
+
+    def fake_get(url, headers, timeout):
+        calls.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(http_cache.http_client, "get", fake_get)
+    cache = HttpCache(str(tmp_path), ttls={"rss": 0})
+
+    first = cache.get("https://feed.example/rss", kind="rss")
+    cache.store_derived("https://feed.example/rss", "items", [{"link": "a"}])
+    second = cache.get("https://feed.example/rss", kind="rss")
+
+    assert not first.from_cache
+    assert calls[1]["If-None-Match"] == '"v1"'
+    assert second.not_modified and second.content == b"<rss/>"
+    assert cache.load_derived("https://feed.example/rss", "items") == [{"link": "a"}]
+
+
+def test_cache_serves_fresh_entries_without_network(monkeypatch, tmp_path):
+    responses = [DummyResponse(200, b"hello")]
+    monkeypatch.setattr(http_cache.http_client, "get", lambda url, headers, timeout: responses.pop(0))
+    cache = HttpCache(str(tmp_path), ttls={"html": 3600})
+
+    cache.get("https://a.example", kind="html")
+    cached = cache.get("https://a.example", kind="html")
+
+    assert cached.from_cache and cached.text == "hello"
+
+
+def test_cache_evicts_oldest_entries_over_budget(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        http_cache.http_client, "get", lambda url, headers, timeout: DummyResponse(200, b"x" * 400)
+    )
+    cache = HttpCache(str(tmp_path), max_bytes=1500)
+
+    for index in range(5):
+        cache.get(f"https://a.example/{index}")
+
+    assert cache.lookup("https://a.example/4") is not None
+    assert cache.lookup("https://a.example/0") is None
+
+
+def test_cache_only_scans_directory_when_over_budget(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        http_cache.http_client, "get", lambda url, headers, timeout: DummyResponse(200, b"x" * 100)
+    )
+    cache = HttpCache(str(tmp_path), max_bytes=10_000)
+    scans = []
+    original_evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: scans.append(1) or original_evict())
+
+    for index in range(5):
+        cache.get(f"https://a.example/{index}")
+
+    assert len(scans) == 1
+
+
+def test_derived_values_count_towards_cache_budget(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        http_cache.http_client, "get", lambda url, headers, timeout: DummyResponse(200, b"x" * 100)
+    )
+    cache = HttpCache(str(tmp_path), max_bytes=5_000)
+    cache.get("https://a.example/feed")
+    cache.get("https://a.example/other")
+    scanned = cache._size
+
+    cache.store_derived("https://a.example/feed", "entries", ["y" * 2_000])
+    assert cache._size > scanned + 2_000
+
+    cache.store_derived("https://a.example/other", "entries", ["z" * 4_000])
+    assert cache._size <= cache.max_bytes
+    assert cache.load_derived("https://a.example/feed", "entries") is None
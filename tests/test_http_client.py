@@ -0,0 +1,120 @@
+import requests
+
+from core import http_client
+
+
+def test_get_session_is_shared_and_pooled():
+    session = http_client.get_session()
+    adapter = session.get_adapter("https://www.example.com/")
+    paced = session.get_adapter("https://www.reddit.com/r/festivals.json")
+
+    assert http_client.get_session() is session
+    assert adapter._pool_maxsize == http_client.POOL_MAXSIZE
+    assert adapter.max_retries.total == 2
+    # Retries of paced hosts would bypass their limiter.
+    assert paced._pool_maxsize == http_client.POOL_MAXSIZE
+    assert paced.max_retries.total == 0
+
+
+def test_request_records_host_metrics(monkeypatch):
+    class FakeSession:
+        def request(self, method, url, **kwargs):
+            if "down" in url:
+                raise requests.ConnectionError("refused")
+            response = requests.Response()
+            response.status_code = 429
+            response.headers["Content-Length"] = "12"
+            return response
+
+    monkeypatch.setattr(http_client, "get_session", lambda: FakeSession())
+    monkeypatch.setattr(http_client, "_METRICS", {})
+
+    http_client.get("https://metrics.example/a")
+    try:
+        http_client.get("https://down.example/")
+    except requests.ConnectionError:
+        pass
+
+    metrics = http_client.host_metrics()
+    assert metrics["metrics.example"]["last_status"] == 429
+    assert metrics["metrics.example"]["bytes"] == 12
+    assert metrics["down.example"]["errors"] == 1
+
+
+def _response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return response
+
+
+def test_host_limiter_paces_and_reads_reddit_headers():
+    now = [0.0]
+    limiter = http_client.HostLimiter("www.reddit.com", rate=1.0, burst=2, clock=lambda: now[0])
+
+    assert limiter.reserve() == 0 and limiter.reserve() == 0
+    assert limiter.reserve() == 1.0
+
+    limiter.observe(_response(200, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "8"}))
+    assert limiter.reserve() == 8.0
+
+    now[0] = 20.0
+    limiter.observe(_response(200, {"x-ratelimit-remaining": "10", "x-ratelimit-reset": "100"}))
+    assert limiter.rate == 0.1
+
+
+def test_open_circuit_skips_calls_until_retry_after(monkeypatch):
+    calls = []
+
+    class FakeSession:
+        def request(self, method, url, **kwargs):
+            calls.append(url)
+            return _response(429, {"Retry-After": "120"})
+
+    monkeypatch.setattr(http_client, "get_session", lambda: FakeSession())
+    monkeypatch.setattr(http_client, "_LIMITERS", {})
+    monkeypatch.setitem(http_client.HOST_RATE_LIMITS, "limited.example", (100.0, 10))
+
+    assert http_client.get("https://limited.example/a").status_code == 429
+    for path in ("b", "c"):
+        try:
+            http_client.get(f"https://limited.example/{path}")
+        except http_client.CircuitOpenError as exc:
+            assert exc.retry_after > 100
+            assert http_client.is_rate_limited(exc)
+        else:
+            raise AssertionError("circuit should be open")
+
+    assert calls == ["https://limited.example/a"]
+
+
+def test_half_open_circuit_lets_one_probe_through():
+    now = [0.0]
+    limiter = http_client.HostLimiter("flaky.example", rate=100.0, burst=10, clock=lambda: now[0])
+    for _ in range(http_client.CIRCUIT_FAILURES):
+        limiter.reserve()
+        limiter.observe(_response(503))
+
+    now[0] = http_client.CIRCUIT_COOLDOWN + 1
+    assert limiter.reserve() == 0
+    for _ in range(3):
+        try:
+            limiter.reserve()
+        except http_client.CircuitOpenError:
+            pass
+        else:
+            raise AssertionError("only the probe may reach a half-open host")
+
+    limiter.observe(_response(503))
+    now[0] += 1
+    try:
+        limiter.reserve()
+    except http_client.CircuitOpenError as exc:
+        assert exc.retry_after > 1
+    else:
+        raise AssertionError("a failed probe re-opens the circuit")
+
+    now[0] += 2 * http_client.CIRCUIT_COOLDOWN
+    limiter.reserve()
+    limiter.observe(_response(200))
+    assert limiter.reserve() == 0 and limiter.reserve() == 0
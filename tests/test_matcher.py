@@ -0,0 +1,40 @@
+import pytest
+
+from core.matcher import KeywordMatcher
+
+CATEGORIES = {
+    "en": {"celeb", "celebs", "party", "after party", "edm"},
+    "viral": {"celebs", "viral", "trend"},
+    "he": {"ליין", "ליין-אפ", "סט"},
+}
+TEXTS = [
+    "celebs at the after party went viral",
+    "the celeb trendsetter hosted an edm party",
+    "ליין-אפ חדש וסט מטורף",
+    "",
+]
+
+
+@pytest.mark.parametrize("strategy", ["probe", "scan"])
+@pytest.mark.parametrize("text", TEXTS)
+def test_matcher_counts_match_substring_semantics(strategy, text):
+    matcher = KeywordMatcher(CATEGORIES, strategy=strategy)
+    expected = {name: sum(1 for kw in words if kw in text) for name, words in CATEGORIES.items()}
+    assert matcher.count(text) == expected
+
+
+def test_matcher_auto_strategy_depends_on_keyword_count():
+    assert KeywordMatcher(CATEGORIES).strategy == "probe"
+    many = {"bulk": {f"keyword{i}" for i in range(200)}}
+    assert KeywordMatcher(many).strategy == "scan"
+
+
+@pytest.mark.parametrize("strategy", ["probe", "scan"])
+def test_matcher_batch_counts_match_per_text_counts(strategy):
+    matcher = KeywordMatcher(CATEGORIES, strategy=strategy)
+    texts = TEXTS + ["party", "edm", "after\x00party"]
+
+    counts = matcher.count_batch(texts)
+
+    for row, text in enumerate(texts):
+        assert {name: int(column[row]) for name, column in counts.items()} == matcher.count(text)
@@ -0,0 +1,81 @@
+import bot
+from core.near_dup import NearDuplicateIndex, hamming, item_text, simhash
+
+
+def raw(link, title, **extra):
+    return {"title": title, "link": link, "source": "test", **extra}
+
+
+def test_simhash_ignores_publisher_suffix_and_source_tag():
+    base = simhash(item_text({"title": "Tomorrowland announces 2026 lineup with Martin Garrix"}))
+    assert base == simhash(item_text({"title": "Tomorrowland announces 2026 lineup with Martin Garrix - Billboard"}))
+    assert base == simhash(item_text({"title": "[r/festivals] Tomorrowland announces 2026 lineup with Martin Garrix"}))
+    assert hamming(base, simhash(item_text({"title": "Techno rave tonight in the Tel Aviv port"}))) > 7
+
+
+def test_collapse_keeps_best_representative_in_order():
+    index = NearDuplicateIndex(None)
+    items = bot.prefilter_candidates(
+        [
+            raw("https://news.example/a", "Adam Ten to play sunrise set at Caesarea festival - Haaretz"),
+            raw("https://other.example/b", "Police shut down party in Jerusalem"),
+            raw(
+                "https://reddit.example/c",
+                "Adam Ten to play sunrise set at Caesarea festival",
+                videos=["https://v.redd.it/x.mp4"],
+            ),
+        ],
+        set(),
+        index,
+    )
+
+    assert [item["link"] for item in items] == ["https://reddit.example/c", "https://other.example/b"]
+    assert items[0]["duplicate_links"] == ["https://news.example/a"]
+
+
+def test_sent_signatures_persist_across_cycles(tmp_path):
+    path = tmp_path / "near_dups.json"
+    index = NearDuplicateIndex(str(path))
+    kept = index.collapse(
+        bot.prefilter_candidates([raw("https://news.example/a", "Tomorrowland announces 2026 lineup")], set())
+    )
+    index.record_sent(item["uid"] for item in kept)
+    index.save()
+
+    reloaded = NearDuplicateIndex(str(path))
+    assert len(reloaded) == 1
+    again = bot.prefilter_candidates(
+        [
+            raw("https://blog.example/z", "Tomorrowland announces 2026 lineup - Mixmag"),
+            raw("https://blog.example/y", "Boiler Room comes to Tel Aviv this summer"),
+        ],
+        set(),
+        reloaded,
+    )
+    assert [item["link"] for item in again] == ["https://blog.example/y"]
+
+
+def test_unsent_signatures_are_not_persisted(tmp_path):
+    path = tmp_path / "near_dups.json"
+    index = NearDuplicateIndex(str(path))
+    index.collapse(bot.prefilter_candidates([raw("https://news.example/a", "Some story")], set()))
+    index.save()
+
+    assert not path.exists()
+    assert len(NearDuplicateIndex(str(path))) == 0
+
+
+def test_captionless_clips_are_never_merged_or_suppressed():
+    index = NearDuplicateIndex(None)
+    clips = [
+        raw("https://www.tiktok.com/@a/video/1", "[TikTok] TikTok video", videos=["https://v.example/1.mp4"]),
+        raw("https://www.tiktok.com/@b/video/2", "[TikTok] TikTok video", videos=["https://v.example/2.mp4"]),
+        raw("https://www.tiktok.com/@c/video/3", "🔥🔥🎉"),
+    ]
+
+    kept = index.collapse(bot.prefilter_candidates(clips, set()))
+    assert len(kept) == 3
+    index.record_sent(item["uid"] for item in kept)
+
+    later = [raw("https://www.tiktok.com/@d/video/4", "[TikTok] TikTok video")]
+    assert len(index.collapse(bot.prefilter_candidates(later, set()))) == 1
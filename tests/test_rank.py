@@ -1,3 +1,6 @@
+import threading
+
+import core.rank as rank
 from core.rank import score_rule_based
 
 
@@ -20,3 +23,82 @@ def test_score_rule_based_recognises_viral_artist_mentions():
     text = "הקליפ הויראלי של Adam Ten מתעד לילה מטורף ב-Club de Combat."
     score = score_rule_based(title, text)
     assert score > 4
+
+
+def test_final_score_batch_falls_back_to_rules_after_deadline(monkeypatch):
+    release = threading.Event()
+
+    def fake_judge(title, text, endpoint, model, timeout=rank.JUDGE_TIMEOUT):
+        if title == "slow":
+            release.wait(2)
+        return 10.0
+
+    monkeypatch.setattr(rank, "ollama_judge", fake_judge)
+    items = [("fast", "techno festival tonight in Tel Aviv"), ("slow", "techno festival tonight")]
+
+    scores = rank.final_score_batch(
+        items, True, "http://ollama", "model", concurrency=2, deadline=0.2
+    )
+    release.set()
+
+    assert scores[0] == 0.6 * rank.score_rule_based(*items[0]) + 4.0
+    assert scores[1] == rank.score_rule_based(*items[1])
+
+
+def test_judge_batches_share_a_pool_and_bound_straggler_timeouts(monkeypatch):
+    timeouts = []
+    release = threading.Event()
+
+    def fake_judge(title, text, endpoint, model, timeout=rank.JUDGE_TIMEOUT):
+        timeouts.append(timeout)
+        release.wait(2)
+        return 1.0
+
+    monkeypatch.setattr(rank, "ollama_judge", fake_judge)
+    items = [("a", ""), ("b", ""), ("c", "")]
+
+    first = rank.ollama_judge_batch(items, "http://ollama", "model", concurrency=2, deadline=0.1)
+    executor = rank.get_judge_executor(2)
+    second = rank.ollama_judge_batch(items, "http://ollama", "model", concurrency=2, deadline=0.1)
+    release.set()
+
+    assert first == second == [None, None, None]
+    assert rank.get_judge_executor(2) is executor
+    assert timeouts and all(timeout <= 0.1 for timeout in timeouts)
+
+
+def test_final_score_batch_gate_skips_hopeless_candidates(monkeypatch):
+    judged = []
+
+    def fake_judge(title, text, endpoint, model, timeout=rank.JUDGE_TIMEOUT):
+        judged.append(title)
+        return 10.0
+
+    monkeypatch.setattr(rank, "ollama_judge", fake_judge)
+    items = [
+        ("Massive techno festival tonight", "Tickets on sale for the rave in Tel Aviv this week."),
+        ("Finance news update", "Earnings and politics."),
+        ("Finance news clip", "Earnings and politics."),
+    ]
+
+    scores = rank.final_score_batch(
+        items,
+        True,
+        "http://ollama",
+        "model",
+        gate_threshold=5.0,
+        always_judge=[False, False, True],
+    )
+
+    assert set(judged) == {"Massive techno festival tonight", "Finance news clip"}
+    assert scores[1] == rank.RULE_WEIGHT * score_rule_based(*items[1])
+
+
+def test_score_rule_based_batch_matches_scalar_scores():
+    items = [
+        ("Massive techno festival arrives in Tel Aviv", "This week only: tickets on sale now."),
+        ("Finance news update", "Today we discuss earnings and politics in Jerusalem."),
+        ("אדם טן משחרר טראק חדש בקיסריה", "הקליפ הויראלי של Adam Ten " * 10),
+    ]
+
+    assert rank.score_rule_based_batch(items).tolist() == [score_rule_based(t, x) for t, x in items]
@@ -0,0 +1,86 @@
+import json
+
+import core.rank as rank
+import core.relevance as relevance
+from bot import Candidate
+from core.relevance import RelevanceModel, load_history, record_history, train_from_history
+
+
+def candidate(uid, title, text=""):
+    return Candidate(uid=uid, title=title, link=f"https://e.example/{uid}", score=1.0, videos=[], platform_links=[], text=text)
+
+
+def write_history(path):
+    good = [candidate(f"g{n}", f"techno festival lineup {n}", "rave tickets tel aviv") for n in range(12)]
+    bad = [candidate(f"b{n}", f"stock market report {n}", "earnings politics") for n in range(12)]
+    record_history(str(path), good + bad, [c.uid for c in good])
+
+
+def test_record_and_load_history_keeps_sent_label(tmp_path):
+    path = tmp_path / "history.jsonl"
+    record_history(str(path), [candidate("a", "x"), candidate("b", "y")], ["a"])
+    record_history(str(path), [candidate("a", "x")], [])
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["sent"] for line in lines] == [True, False, False]
+    assert sorted(sent for _, sent in load_history(str(path))) == [False, True]
+
+
+def test_history_rotates_and_loads_both_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(relevance, "MAX_HISTORY_BYTES", 1)
+    path = tmp_path / "history.jsonl"
+    record_history(str(path), [candidate("a", "x")], ["a"])
+    record_history(str(path), [candidate("b", "y")], [])
+
+    assert sorted(sent for _, sent in load_history(str(path))) == [False, True]
+
+    record_history(str(path), [candidate("c", "z")], [])
+    assert [json.loads(line)["uid"] for line in (tmp_path / "history.jsonl.1").read_text(encoding="utf-8").splitlines()] == ["b"]
+    assert sorted(sent for _, sent in load_history(str(path))) == [False, False]
+
+
+def test_bot_does_not_import_relevance_at_startup():
+    import subprocess
+    import sys
+
+    code = "import sys, bot; sys.exit('core.relevance' in sys.modules or 'sklearn' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def test_model_trains_saves_and_scores_batches(tmp_path):
+    history = tmp_path / "history.jsonl"
+    model_path = tmp_path / "model.joblib"
+    write_history(history)
+
+    train_from_history(str(history), str(model_path))
+    model = RelevanceModel.load(str(model_path))
+
+    scores = model.score_batch([("new techno festival lineup", "rave"), ("market report", "earnings")])
+    assert scores.shape == (2,)
+    assert 0 <= scores[1] < scores[0] <= 10
+
+
+def test_missing_model_loads_as_none(tmp_path):
+    assert RelevanceModel.load(str(tmp_path / "missing.joblib")) is None
+
+
+def test_model_scores_stand_in_for_llm_and_gate_it(monkeypatch):
+    judged = []
+
+    def fake_judge(title, text, endpoint, model, timeout=rank.JUDGE_TIMEOUT):
+        judged.append(title)
+        return 10.0
+
+    monkeypatch.setattr(rank, "ollama_judge", fake_judge)
+    items = [("keep", ""), ("skip", "")]
+
+    scores = rank.final_score_batch(
+        items, True, "http://ollama", "model", rule_scores=[1.0, 1.0], model_scores=[8.0, 2.0], model_gate=5.0
+    )
+
+    assert judged == ["keep"]
+    assert scores == [rank.RULE_WEIGHT + rank.LLM_WEIGHT * 10.0, rank.RULE_WEIGHT + rank.LLM_WEIGHT * 2.0]
+    assert rank.final_score_batch(items, False, "", "", rule_scores=[1.0, 1.0], model_scores=[5.0, 0.0]) == [
+        rank.RULE_WEIGHT + rank.LLM_WEIGHT * 5.0,
+        rank.RULE_WEIGHT,
+    ]
@@ -0,0 +1,93 @@
+import requests
+
+import bot
+from core.collect import SourceJob, SourceResult
+from core.scheduler import AdaptiveScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def rate_limited(retry_after):
+    response = requests.Response()
+    response.status_code = 429
+    response.headers["Retry-After"] = str(retry_after)
+    return requests.HTTPError("429", response=response)
+
+
+def test_intervals_adapt_to_new_items_and_rate_limits():
+    clock = FakeClock()
+    busy = SourceJob("reddit", "busy", lambda: [])
+    quiet = SourceJob("rss", "quiet", lambda: [])
+    limited = SourceJob("tiktok", "limited", lambda: [])
+    scheduler = AdaptiveScheduler([busy, quiet, limited], base_interval=600, min_interval=60, clock=clock)
+    assert len(scheduler.due()) == 3
+
+    for poll in range(3):
+        scheduler.record(SourceResult(busy, items=[{"link": f"https://b/{poll}"}]))
+        scheduler.record(SourceResult(quiet, items=[{"link": "https://q/1"}]))
+    scheduler.record(SourceResult(limited, error=rate_limited(5000)))
+
+    sources = scheduler.sources
+    assert sources["reddit:busy"].interval < 600 < sources["rss:quiet"].interval
+    assert sources["tiktok:limited"].next_due == 5000
+    assert sources["tiktok:limited"].interval == 600
+    assert scheduler.due(now=sources["reddit:busy"].next_due) == [busy]
+
+
+def test_digest_due_on_threshold_or_age():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler([], base_interval=600, digest_threshold=3, max_digest_interval=1800, clock=clock)
+
+    assert not scheduler.digest_due(0)
+    assert scheduler.digest_due(3)
+    assert not scheduler.digest_due(1, pending=4)
+    clock.now = 1800
+    assert scheduler.digest_due(0, pending=1)
+
+
+def test_run_scheduled_sends_digest_once_enough_candidates_pile_up(monkeypatch):
+    clock = FakeClock()
+    polls = []
+
+    def fetch():
+        polls.append(clock.now)
+        return [{"title": f"Item {len(polls)}", "link": f"https://e.example/{len(polls)}"}]
+
+    scheduler = AdaptiveScheduler(
+        [SourceJob("rss", "feed", fetch)], base_interval=600, min_interval=60, digest_threshold=3, clock=clock
+    )
+    sent = []
+    monkeypatch.setattr(bot, "send_telegram", lambda token, chat_id, message, preview: sent.append(message))
+
+    def enrich(raw_items):
+        return [
+            bot.Candidate(uid=item["uid"], title=item["title"], link=item["link"], score=5.0, videos=[], platform_links=[])
+            for item in raw_items
+        ]
+
+    seen = set()
+    monkeypatch.setattr(bot, "save_seen", lambda ids: None)
+    bot.run_scheduled(
+        scheduler,
+        enrich=enrich,
+        token="t",
+        chat_id="c",
+        qconf={},
+        seen_ids=seen,
+        limit=6,
+        min_score=4.0,
+        max_digests=1,
+        sleep=clock.sleep,
+    )
+
+    assert len(polls) == 3 and polls[1] - polls[0] == 420
+    assert len(sent) == 1 and len(seen) == 3
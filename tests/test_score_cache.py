@@ -0,0 +1,72 @@
+import json
+import time
+
+import core.rank as rank
+from core.score_cache import ScoreCache
+
+
+def test_score_cache_key_ignores_whitespace_and_case():
+    first = ScoreCache.key("llama", "Techno  Night", "Line-up\nannounced")
+    second = ScoreCache.key("llama", "techno night", "line-up announced")
+    assert first == second
+    assert ScoreCache.key("other", "techno night", "line-up announced") != first
+
+
+def test_score_cache_persists_and_evicts_lru(tmp_path):
+    path = str(tmp_path / "scores.json")
+    cache = ScoreCache(path, max_entries=2)
+    cache.put("a", 1.0)
+    cache.put("b", 2.0)
+    assert cache.get("a") == 1.0
+    cache.put("c", 3.0)
+    cache.save()
+
+    reloaded = ScoreCache(path, max_entries=2)
+    assert reloaded.get("b") is None
+    assert reloaded.get("a") == 1.0
+    assert reloaded.stats() == {"hits": 1, "misses": 1, "size": 2}
+
+
+def test_score_cache_skips_malformed_rows(tmp_path):
+    path = tmp_path / "scores.json"
+    stored_at = time.time()
+    path.write_text(
+        json.dumps([["ok", [4.0, stored_at]], ["short", [1.0]], "junk", ["bad", ["x", stored_at]], [1, 2, 3]]),
+        encoding="utf-8",
+    )
+
+    cache = ScoreCache(str(path))
+    assert len(cache) == 1 and cache.get("ok") == 4.0
+
+    path.write_text(json.dumps({"ok": [4.0, stored_at], "bad": None}), encoding="utf-8")
+    assert ScoreCache(str(path)).get("ok") == 4.0
+    path.write_text("42", encoding="utf-8")
+    assert len(ScoreCache(str(path))) == 0
+
+
+def test_score_cache_expires_entries(tmp_path):
+    cache = ScoreCache(str(tmp_path / "scores.json"), ttl=0)
+    cache.put("a", 5.0)
+    assert cache.get("a") is None
+
+
+def test_ollama_judge_reuses_cached_score(monkeypatch, tmp_path):
+    calls = []
+
+    class DummyResponse:
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return {"response": '{"score": 7, "reasons": "ok"}'}
+
+    def fake_post(url, json, timeout):
+        calls.append(url)
+        return DummyResponse()
+
+    monkeypatch.setattr(rank, "SCORE_CACHE", ScoreCache(str(tmp_path / "scores.json")))
+    monkeypatch.setattr(rank.http_client, "post", fake_post)
+
+    assert rank.ollama_judge("Rave", "Tonight", "http://ollama", "llama") == 7.0
+    assert rank.ollama_judge("rave ", "tonight", "http://ollama", "llama") == 7.0
+    assert len(calls) == 1
@@ -0,0 +1,51 @@
+from core.seen_index import MERGE_THRESHOLD, BloomFilter, CompactSeenIndex
+from core.utils import hash_id
+
+
+def test_compact_index_membership_and_iteration():
+    ids = [hash_id(f"https://example.com/{i}") for i in range(100)]
+    index = CompactSeenIndex(ids[:50])
+    for uid in ids[50:]:
+        index.add(uid)
+
+    assert all(uid in index for uid in ids)
+    assert hash_id("https://example.com/missing") not in index
+    assert sorted(index) == sorted(ids)
+    assert len(index) == 100
+
+
+def test_compact_index_grows_bloom_and_merges_buffer():
+    index = CompactSeenIndex(capacity=16)
+    ids = [hash_id(str(i)) for i in range(MERGE_THRESHOLD + 10)]
+    for uid in ids:
+        index.add(uid)
+
+    assert all(uid in index for uid in ids)
+    assert index.nbytes < len(ids) * 12
+
+
+def test_compact_index_difference_update():
+    ids = [hash_id(str(i)) for i in range(10)]
+    index = CompactSeenIndex(ids)
+    index.difference_update(ids[:5])
+
+    assert not any(uid in index for uid in ids[:5])
+    assert all(uid in index for uid in ids[5:])
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    digests = [int(hash_id(str(i)), 16) for i in range(1000)]
+    for digest in digests:
+        bloom.add(digest)
+    assert all(digest in bloom for digest in digests)
+
+
+def test_non_digest_ids_round_trip_unchanged():
+    index = CompactSeenIndex(["legacy-id", hash_id("a"), "ABCDEF0123456789"])
+    index.add("dddd")
+
+    assert set(index) == {"legacy-id", hash_id("a"), "ABCDEF0123456789", "dddd"}
+    assert "dddd" in index and hash_id("dddd") not in index
+    index.difference_update(["legacy-id"])
+    assert "legacy-id" not in index and len(index) == 3
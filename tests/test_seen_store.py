@@ -0,0 +1,74 @@
+import json
+import sqlite3
+
+import pytest
+
+from core.seen_store import JsonSeenStore, SeenStore, SqliteSeenStore, open_seen_store
+
+
+def test_sqlite_store_imports_legacy_json_once(tmp_path):
+    legacy = tmp_path / "seen.json"
+    legacy.write_text(json.dumps(["aaaa", "bbbb"]), encoding="utf-8")
+    db_path = str(tmp_path / "seen.db")
+
+    store = SqliteSeenStore(db_path, legacy_json_path=str(legacy))
+    assert "aaaa" in store and len(store) == 2
+    store.close()
+
+    legacy.write_text(json.dumps(["aaaa", "bbbb", "cccc"]), encoding="utf-8")
+    reopened = SqliteSeenStore(db_path, legacy_json_path=str(legacy))
+    assert "cccc" not in reopened
+    reopened.close()
+
+
+def test_sqlite_store_flushes_incrementally(tmp_path):
+    db_path = str(tmp_path / "seen.db")
+    store = SqliteSeenStore(db_path, legacy_json_path=None)
+    store.add("dddd")
+    store.flush()
+    store.add("eeee")
+    store.close()
+
+    assert set(SqliteSeenStore(db_path, legacy_json_path=None)) == {"dddd", "eeee"}
+
+
+def test_sqlite_store_expires_old_ids(tmp_path):
+    db_path = str(tmp_path / "seen.db")
+    conn = sqlite3.connect(db_path)
+    SqliteSeenStore(db_path, legacy_json_path=None).close()
+    with conn:
+        conn.execute("INSERT INTO seen (uid, added_at) VALUES ('old', 0), ('new', 9e12)")
+    conn.close()
+
+    store = SqliteSeenStore(db_path, ttl_days=30, legacy_json_path=None)
+
+    assert "old" not in store and "new" in store
+    store.close()
+
+
+def test_json_store_round_trip(tmp_path):
+    path = str(tmp_path / "seen.json")
+    store = open_seen_store("json", path)
+    store.add("ffff")
+    store.flush()
+
+    assert "ffff" in JsonSeenStore(path)
+    assert json.loads((tmp_path / "seen.json").read_text(encoding="utf-8")) == ["ffff"]
+
+
+def test_incomplete_store_fails_at_construction():
+    class NoFlush(SeenStore):
+        def __contains__(self, uid):
+            return False
+
+        def __len__(self):
+            return 0
+
+        def __iter__(self):
+            return iter(())
+
+        def add(self, uid):
+            pass
+
+    with pytest.raises(TypeError):
+        NoFlush()
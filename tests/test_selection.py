@@ -76,3 +76,23 @@ def test_select_top_candidates_tracks_dry_spells():
 
     assert selected[0].uid == "top"
     assert bot.NO_VIDEO_STREAK >= 1
+
+
+def test_candidate_batch_answers_thresholds_by_binary_search():
+    from core.selection import CandidateBatch
+
+    batch = CandidateBatch(
+        [
+            make_candidate("low", 2.0, []),
+            make_candidate("tie-a", 5.0, []),
+            make_candidate("top", 9.0, []),
+            make_candidate("tie-b", 5.0, ["https://video.example/v.mp4"]),
+        ]
+    )
+
+    assert [batch.count_at(t) for t in (10.0, 9.0, 5.0, 0.0)] == [0, 1, 3, 4]
+    assert [c.uid for c in batch.top(5.0, 2)] == ["top", "tie-a"]
+    chosen, promoted = batch.top_with_video(5.0, 2)
+    assert [c.uid for c in chosen] == ["top", "tie-b"]
+    assert promoted
+    assert batch.top_with_video(9.0, 2) is None
@@ -1,8 +1,8 @@
 import datetime as dt
 
 from sources.google_news import _extract_direct_link
-from sources.reddit import _looks_eventful, _looks_like_scoop, _looks_like_video
-from sources.tiktok import _normalize_video, _parse_timestamp, fetch_hashtag
+from sources.reddit import _looks_eventful, _looks_like_scoop, _looks_like_video, batch_subreddits, fetch_subreddits
+from sources.tiktok import RequestBudget, _normalize_video, _parse_timestamp, fetch_hashtag
 
 
 def test_extract_direct_link_returns_original_for_non_google():
@@ -80,8 +80,194 @@ def test_fetch_hashtag_filters_old(monkeypatch):
         assert "keywords" in params
         return DummyResponse(payload)
 
-    monkeypatch.setattr("sources.tiktok.requests.get", fake_get)
+    monkeypatch.setattr("sources.tiktok.http_client.get", fake_get)
 
     results = fetch_hashtag("club", limit=3, days=7)
     assert len(results) == 1
     assert results[0]["link"].endswith("/video/1")
+
+
+def test_fetch_subreddits_pages_combined_listing(monkeypatch):
+    class DummyResponse:
+        def __init__(self, payload):
+            self._payload = payload
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return self._payload
+
+    def post(sub, n, **extra):
+        data = {"subreddit": sub, "title": f"Festival lineup {n}", "url": f"https://e.example/{sub}/{n}", "score": 50}
+        data.update(extra)
+        return {"data": data}
+
+    pages = [
+        {"data": {"after": "t3_b", "children": [post("edm", 1), post("edm", 2), post("edm", 3, score=1)]}},
+        {"data": {"after": "t3_c", "children": [post("edm", 4), post("festivals", 1)]}},
+        {"data": {"after": "t3_d", "children": [post("festivals", 2)]}},
+    ]
+    calls = []
+
+    def fake_get(url, params, headers, timeout):
+        calls.append((url, dict(params)))
+        return DummyResponse(pages[len(calls) - 1])
+
+    monkeypatch.setattr("sources.reddit.http_client.get", fake_get)
+
+    items = fetch_subreddits(["edm", "festivals"], per_subreddit=2, max_pages=5)
+
+    assert calls[0][0] == "https://www.reddit.com/r/edm+festivals/top.json"
+    assert "after" not in calls[0][1] and calls[1][1]["after"] == "t3_b"
+    assert len(calls) == 3
+    assert [item["link"] for item in items] == [
+        "https://e.example/edm/1",
+        "https://e.example/edm/2",
+        "https://e.example/festivals/1",
+        "https://e.example/festivals/2",
+    ]
+    assert batch_subreddits(["a", "b", "c"], 2) == [["a", "b"], ["c"]]
+
+
+def test_reddit_post_carries_embedded_media():
+    from sources.reddit import _normalize_post
+
+    payload = {
+        "title": "Festival aftermovie",
+        "url": "https://v.redd.it/abc",
+        "score": 500,
+        "is_video": True,
+        "secure_media": {"reddit_video": {"fallback_url": "https://v.redd.it/abc/DASH_720.mp4?source=fallback&amp;x=1"}},
+        "preview": {"images": [{"variants": {"mp4": {"source": {"url": "https://preview.redd.it/a.gif?format=mp4"}}}}]},
+        "selftext": "Lineup inside",
+    }
+
+    item = _normalize_post(payload)
+
+    assert item["videos"] == [
+        "https://preview.redd.it/a.gif?format=mp4",
+        "https://v.redd.it/abc/DASH_720.mp4?source=fallback&x=1",
+    ]
+    assert item["platform_links"] == ["https://v.redd.it/abc"]
+    assert item["text"] == "Lineup inside"
+
+
+def test_fetch_hashtag_pages_until_window_and_keeps_top(monkeypatch):
+    class DummyResponse:
+        def __init__(self, payload):
+            self._payload = payload
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return self._payload
+
+    now = int(dt.datetime.now(dt.timezone.utc).timestamp())
+    old = now - 30 * 86400
+
+    def clip(n, plays, created=now):
+        return {"title": f"clip {n}", "share_url": f"https://www.tiktok.com/@a/video/{n}", "create_time": created, "play_count": plays}
+
+    pages = {
+        0: {"data": {"videos": [clip(1, 10), clip(2, 500), clip(3, 30)], "cursor": 3, "hasMore": True}},
+        3: {"data": {"videos": [clip(4, 900), clip(5, 1, old), clip(6, 2, old)], "cursor": 6, "hasMore": True}},
+        6: {"data": {"videos": [clip(7, 10000)], "cursor": 9, "hasMore": False}},
+    }
+    cursors = []
+
+    def fake_get(url, params, timeout):
+        cursors.append(params["cursor"])
+        return DummyResponse(pages[params["cursor"]])
+
+    monkeypatch.setattr("sources.tiktok.http_client.get", fake_get)
+
+    results = fetch_hashtag("club", limit=2, days=7, max_pages=5)
+
+    assert cursors == [0, 3]
+    assert [item["link"][-1] for item in results] == ["4", "2"]
+
+    budget = RequestBudget(max_requests=1)
+    cursors.clear()
+    fetch_hashtag("club", limit=2, max_pages=5, budget=budget)
+    assert fetch_hashtag("rave", limit=2, budget=budget) == []
+    assert cursors == [0]
+
+
+def _article_id(payload):
+    import base64
+
+    raw = b"\x08\x13\x22" + bytes([len(payload)]) + payload + b"\xd2\x01\x00"
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def test_extract_direct_link_decodes_article_id_offline():
+    article = _article_id(b"https://news.example/festival")
+    link = f"https://news.google.com/rss/articles/{article}?oc=5"
+
+    assert _extract_direct_link(link) == "https://news.example/festival"
+
+
+def test_google_news_resolver_follows_opaque_ids_once(monkeypatch, tmp_path):
+    import bot
+    from sources.google_news_resolver import GoogleNewsResolver, resolve_items
+
+    opaque = f"https://news.google.com/rss/articles/{_article_id(b'AU_yqLtoken')}"
+    requests_sent = []
+
+    class Redirected:
+        url = "https://www.publisher.example/story?utm_source=gn"
+        status_code = 200
+
+        def close(self):
+            pass
+
+    def fake_request(method, url, **kwargs):
+        requests_sent.append(method)
+        return Redirected()
+
+    monkeypatch.setattr("sources.google_news_resolver.http_client.request", fake_request)
+    path = str(tmp_path / "links.json")
+
+    items = resolve_items([{"title": "GN", "link": opaque}], GoogleNewsResolver(path))
+    again = GoogleNewsResolver(path).resolve_many([opaque])
+
+    assert requests_sent == ["HEAD"]
+    assert items[0]["source_link"] == opaque
+    assert again == {opaque: "https://www.publisher.example/story?utm_source=gn"}
+
+    kept = bot.prefilter_candidates(items + [{"title": "RSS", "link": "https://publisher.example/story"}], set())
+    assert len(kept) == 1
+
+
+def test_google_news_resolver_rejects_google_and_error_pages(monkeypatch, tmp_path):
+    from sources.google_news_resolver import GoogleNewsResolver
+
+    consent = f"https://news.google.com/rss/articles/{_article_id(b'AU_yqLconsent')}"
+    broken = f"https://news.google.com/rss/articles/{_article_id(b'AU_yqLbroken')}"
+    requests_sent = []
+
+    class Response:
+        def __init__(self, url, status_code):
+            self.url = url
+            self.status_code = status_code
+
+        def close(self):
+            pass
+
+    def fake_request(method, url, **kwargs):
+        requests_sent.append(url)
+        if url == consent:
+            return Response("https://consent.google.com/ml?continue=x", 200)
+        return Response("https://www.publisher.example/gone", 404)
+
+    monkeypatch.setattr("sources.google_news_resolver.http_client.request", fake_request)
+    path = str(tmp_path / "links.json")
+    resolver = GoogleNewsResolver(path)
+
+    assert resolver.resolve_many([consent, broken]) == {}
+    resolver.save()
+    assert GoogleNewsResolver(path).resolve_many([consent, broken]) == {}
+    # HEAD and GET once per id; the failures are remembered across runs.
+    assert len(requests_sent) == 4
@@ -0,0 +1,31 @@
+import bot
+from core.urls import canonical_url
+from core.utils import hash_id
+
+
+def test_canonical_url_strips_tracking_and_normalises_host():
+    url = "HTTP://WWW.Example.com:80/party/?utm_source=x&b=2&a=1&fbclid=abc#top"
+    assert canonical_url(url) == "https://example.com/party?a=1&b=2"
+
+
+def test_canonical_url_unwraps_google_redirect():
+    url = "https://www.google.com/url?q=https%3A%2F%2Fexample.com%2Fnews%3Futm_medium%3Dfeed"
+    assert canonical_url(url) == "https://example.com/news"
+
+
+def test_canonical_url_leaves_non_http_values():
+    assert canonical_url("mailto:team@example.com") == "mailto:team@example.com"
+
+
+def test_prefilter_drops_seen_and_duplicate_links():
+    seen = {hash_id("https://example.com/old")}
+    raw = [
+        {"title": "Old", "link": "https://www.example.com/old/"},
+        {"title": "New", "link": "https://example.com/new?utm_source=rss"},
+        {"title": "New again", "link": "http://example.com/new"},
+    ]
+
+    kept = bot.prefilter_candidates(raw, seen)
+
+    assert [item["title"] for item in kept] == ["New"]
+    assert kept[0]["uid"] == hash_id("https://example.com/new")